@@ -0,0 +1,36 @@
+"""Agent asking a human on the console."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.model.move import Move
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class ConsolePlayer:
+    """Player choosing moves via input."""
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move via input until it is valid."""
+        board = game.boards[player]
+        print(game.dice)
+        print(f'Player: {player}')
+        print(board)
+        while True:
+            move = game.dice.get_move(only_white=not active)
+            if move.is_skip or board.is_select_possible(move.dice):
+                return move
+            print('Selection can not applied to board, try again.')
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Ask to switch to closing white dice."""
+        while True:
+            switch = input(
+                f'Player {player}: Do you want to switch to the white dice? Current selection: {move.dice}[Y]/N')
+            if switch == 'Y':
+                return True
+            elif switch == 'N':
+                return False
+            print(f'Invalid input: {switch} Try again.')
@@ -0,0 +1,75 @@
+"""Agent choosing moves by a weighted heuristic of the own board."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from games_best_approach.games.qwixx.model.board import _MAX_SKIPS, _SKIP_PENALTY
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, NUMBERS_MASK, TRIANGLE
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.move_generator import successors
+from games_best_approach.games.qwixx.model.state import LANE_MASK, SKIPS_SHIFT, BoardState, lane_masks
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+_SKIP = 1 << SKIPS_SHIFT
+
+
+class Weights(NamedTuple):
+    """Weights of the heuristic."""
+    gap: float = 1.5
+    """Penalty per number left out in a lane."""
+    skip: float = _SKIP_PENALTY
+    """Penalty per skip."""
+    risk: float = 0.0
+    """Penalty per skip squared, for ending the game by skips."""
+    close: float = 0.0
+    """Bonus per closed lane."""
+    progress: float = 0.0
+    """Bonus per crossed number."""
+
+
+class HeuristicPlayer:
+    """Player maximizing the weighted value of the own board after the move."""
+
+    def __init__(self, weights: Weights | None = None):
+        """Initialize player, values per lane mask are computed once."""
+        self.weights = weights or Weights()
+        skip, risk = self.weights.skip, self.weights.risk
+        self._lane_value = tuple(self._lane(mask) for mask in range(LANE_MASK + 1))
+        self._skip_value = tuple(-skip * s - risk * s * s for s in range(_MAX_SKIPS + 1))
+
+    def _lane(self, mask: int) -> float:
+        """Weighted value of a lane mask."""
+        numbers = mask & NUMBERS_MASK
+        gaps = numbers.bit_length() - numbers.bit_count()
+        return (
+            TRIANGLE[mask.bit_count()]
+            - self.weights.gap * gaps
+            + self.weights.progress * numbers.bit_count()
+            + self.weights.close * bool(mask & CLOSE_BIT)
+        )
+
+    def value(self, state: int) -> float:
+        """Weighted value of a packed board."""
+        lane_value = self._lane_value
+        r, y, g, b = lane_masks(state)
+        return (
+            lane_value[r] + lane_value[y] + lane_value[g] + lane_value[b]
+            + self._skip_value[state >> SKIPS_SHIFT]
+        )
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move with the best value of the resulting board."""
+        state = BoardState.from_board(game.boards[player])
+        options = successors(state, game.dice.index, active)
+        if active:
+            options[0] = (options[0][0], state + _SKIP)
+        return max(options, key=lambda option: self.value(option[1]))[0]
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch if closing is worth more."""
+        state = BoardState.from_board(game.boards[player])
+        active = player == game.active_player
+        return self.value(state.apply(closing, active)) >= self.value(state.apply(move, active))
+
@@ -0,0 +1,35 @@
+"""Agent using Monte Carlo tree search over all boards."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.mcts import MCTS
+from games_best_approach.games.qwixx.solver.multiplayer import board_value
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class MCTSPlayer:
+    """Player choosing the most visited move of a tree search, reusing the tree between turns."""
+
+    def __init__(self, search: MCTS | None = None, seed: int | None = None):
+        """Initialize player."""
+        self.search = search or MCTS(seed=seed)
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move by tree search over all boards."""
+        states = [BoardState.from_board(board) for board in game.boards.values()]
+        return self.search.best_move(states, player - 1, game.active_player - 1, game.dice.index)
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch if closing is worth more for own board."""
+        state = BoardState.from_board(game.boards[player])
+        active = player == game.active_player
+        return board_value(state.apply(closing, active)) >= board_value(state.apply(move, active))
+
+    def close(self) -> None:
+        """Shut down the worker processes of the search."""
+        self.search.close()
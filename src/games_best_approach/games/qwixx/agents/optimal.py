@@ -0,0 +1,80 @@
+"""Agent playing the moves of the expectimax solver."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.expectimax import DEFAULT_HORIZON, Expectimax, ValueTable
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class OptimalPlayer:
+    """Player maximizing the expected score of its own board."""
+
+    def __init__(
+        self,
+        solver: Expectimax | None = None,
+        path: str | Path | None = None,
+        horizon: int | None = None,
+    ):
+        """
+        Initialize player, the value table is loaded from path if it exists.
+
+        Without horizon the horizon of the solver or loaded table is used, otherwise
+        DEFAULT_HORIZON. A horizon different from theirs is rejected.
+        """
+        if solver is None and path is not None and Path(path).exists():
+            table = ValueTable.load(path)
+            solver = Expectimax(table.players, table.horizon, table)
+        if solver is not None:
+            if horizon is not None and horizon != solver.horizon:
+                raise ValueError(f'value table is built for horizon {solver.horizon}, not {horizon}')
+            horizon = solver.horizon
+        self.solvers: dict[int, Expectimax] = {} if solver is None else {solver.players: solver}
+        self.path = path
+        self.horizon = DEFAULT_HORIZON if horizon is None else horizon
+
+    @property
+    def solver(self) -> Expectimax | None:
+        """Solver saved to path, the one given, loaded or created first."""
+        return next(iter(self.solvers.values()), None)
+
+    def _solver(self, game: Qwuixx) -> Expectimax:
+        """Solver for number of players in game, kept for games of other player counts."""
+        players = len(game.boards)
+        solver = self.solvers.get(players)
+        if solver is None:
+            solver = self.solvers[players] = Expectimax(players, self.horizon)
+        return solver
+
+    def _phase(self, game: Qwuixx, player: int) -> int:
+        """Turns until player is active."""
+        return (player - game.active_player) % len(game.boards)
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move with highest expected score."""
+        state = BoardState.from_board(game.boards[player])
+        return self._solver(game).best_move(state, game.dice.index, self._phase(game, player))
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch if closing has higher expected score."""
+        solver = self._solver(game)
+        state = BoardState.from_board(game.boards[player])
+        phase = self._phase(game, player)
+        turns = solver.horizon - 1
+        values = [
+            solver.value(state.apply(m, active=not phase), turns, solver.next_phase(phase))
+            for m in (move, closing)
+        ]
+        return values[1] > values[0]
+
+    def save(self) -> None:
+        """Persist value table of solver."""
+        if self.path is None:
+            raise ValueError('path must be given to save value table')
+        if self.solver is not None:
+            self.solver.table.save(self.path)
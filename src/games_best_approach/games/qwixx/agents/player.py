@@ -0,0 +1,25 @@
+"""Player protocol for agents playing Qwuixx."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+from games_best_approach.games.qwixx.model.move import Move
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class Player(Protocol):
+    """Agent deciding moves of one player."""
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """
+        Choose move for current dice of game.
+
+        The active player may use white and color, other players only white.
+        """
+        ...
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Decide to switch to the white dice closing a lane instead of chosen move."""
+        ...
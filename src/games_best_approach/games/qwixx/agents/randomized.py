@@ -0,0 +1,28 @@
+"""Agent choosing random legal moves."""
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.state import BoardState
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class RandomPlayer:
+    """Player choosing uniformly between legal moves."""
+
+    def __init__(self, seed: int | None = None):
+        """Initialize random player."""
+        self._random = random.Random(seed)
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose random legal move."""
+        state = BoardState.from_board(game.boards[player])
+        return self._random.choice(state.legal_moves(game.dice, active))
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Always close with the others."""
+        return True
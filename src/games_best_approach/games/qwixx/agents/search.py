@@ -0,0 +1,31 @@
+"""Agent searching the joint state of all boards."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.multiplayer import MultiplayerSearch
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class SearchPlayer:
+    """Player maximizing the expected margin to the best opponent."""
+
+    def __init__(self, search: MultiplayerSearch | None = None, seed: int | None = None):
+        """Initialize player."""
+        self.search = search or MultiplayerSearch(seed=seed)
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move by search over all boards."""
+        states = [BoardState.from_board(board) for board in game.boards.values()]
+        return self.search.best_move(states, player - 1, game.active_player - 1, game.dice.index)
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch if closing is worth more for own board."""
+        state = BoardState.from_board(game.boards[player])
+        active = player == game.active_player
+        evaluate = self.search.evaluate
+        return evaluate(state.apply(closing, active)) >= evaluate(state.apply(move, active))
@@ -0,0 +1,53 @@
+"""Agent playing endgame boards from a tablebase and deferring to another agent otherwise."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from games_best_approach.games.qwixx.agents.player import Player
+from games_best_approach.games.qwixx.game import next_phase
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.tablebase import Tablebase
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.game import Qwuixx
+
+
+class TablebasePlayer:
+    """Player looking up endgame moves instead of searching."""
+
+    def __init__(self, tablebase: Tablebase, fallback: Player):
+        """Initialize player, fallback decides outside of the endgame."""
+        self.tablebase = tablebase
+        self.fallback = fallback
+
+    def _phase(self, game: Qwuixx, player: int) -> int | None:
+        """Turns until player is active, None if the tablebase is for other players."""
+        players = len(game.boards)
+        if players != self.tablebase.players:
+            return None
+        return (player - game.active_player) % players
+
+    def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose best endgame move or move of fallback."""
+        phase = self._phase(game, player)
+        if phase is not None:
+            state = BoardState.from_board(game.boards[player])
+            move = self.tablebase.best_move(state, game.dice.index, phase)
+            if move is not None:
+                return move
+        return self.fallback.choose(game, player, active)
+
+    def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch if closing has a higher endgame value, else ask fallback."""
+        phase = self._phase(game, player)
+        if phase is not None:
+            state = BoardState.from_board(game.boards[player])
+            after = next_phase(phase, self.tablebase.players)
+            values = [
+                self.tablebase.value(state.apply(m, active=not phase), after)
+                for m in (move, closing)
+            ]
+            if None not in values:
+                return values[1] > values[0]
+        return self.fallback.switch(game, player, move, closing)
@@ -0,0 +1,198 @@
+"""
+Replay and analytics of recorded games.
+
+Replaying a record applies its turns to fresh boards like the game does. Analytics
+aggregate records in a single streaming pass: scores and wins per strategy, lanes closed
+per color, skips per player and game lengths. Record files are split into chunks of
+games which are analysed in a process pool and merged, memory is bounded by the chunk
+results only.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from games_best_approach.games.qwixx.game import Turn, apply_moves
+from games_best_approach.games.qwixx.model.board import Board
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.records import GameRecord, RecordReader
+from games_best_approach.games.qwixx.tournament import Stats
+
+DEFAULT_CHUNK_SIZE = 10_000
+"""Games analysed per task."""
+
+
+def _new_boards(players: int) -> dict[int, Board]:
+    """Empty board per player."""
+    return {p: Board() for p in range(1, players + 1)}
+
+
+def replay(record: GameRecord) -> Iterator[tuple[Turn, dict[int, Board]]]:
+    """Turns of a record with the boards after each turn, boards are updated in place."""
+    boards = _new_boards(record.players)
+    for turn in record.turns:
+        apply_moves(boards, turn.active, turn.moves)
+        yield turn, boards
+
+
+def final_boards(record: GameRecord) -> dict[int, Board]:
+    """Boards at the end of a recorded game, checked against the recorded scores."""
+    final = _new_boards(record.players)
+    for _, boards in replay(record):
+        final = boards
+    scores = [board.score for board in final.values()]
+    if scores != record.scores:
+        raise ValueError(f'replayed scores {scores} differ from recorded {record.scores}')
+    return final
+
+
+class Analytics:
+    """Aggregated statistics of recorded games, mergeable between workers."""
+
+    def __init__(self, names: Sequence[str] | None = None):
+        """Initialize empty statistics, names of strategies by agent code minus one."""
+        self.names = list(names or [])
+        self.games = 0
+        self.scores: dict[str, Stats] = {}
+        self.wins: Counter[str] = Counter()
+        self.closed: Counter[Color] = Counter()
+        self.skips: Counter[int] = Counter()
+        self.lengths: Counter[int] = Counter()
+
+    def strategy(self, code: int) -> str:
+        """Name of strategy with agent code."""
+        if 0 < code <= len(self.names):
+            return self.names[code - 1]
+        return f'agent {code}'
+
+    def add(self, record: GameRecord) -> None:
+        """Add a recorded game."""
+        self.games += 1
+        self.lengths[len(record.turns)] += 1
+        self.skips.update(record.skips)
+
+        best = max(record.scores)
+        winners = record.scores.count(best)
+        for code, score in zip(record.agents, record.scores):
+            name = self.strategy(code)
+            self.scores.setdefault(name, Stats()).add(score)
+            if score == best:
+                self.wins[name] += 1 / winners
+
+        for board in final_boards(record).values():
+            self.closed.update(board.closed_colors)
+
+    def merge(self, other: Analytics) -> None:
+        """Merge statistics of other games."""
+        self.games += other.games
+        for name, stats in other.scores.items():
+            self.scores.setdefault(name, Stats()).merge(stats)
+        self.wins.update(other.wins)
+        self.closed.update(other.closed)
+        self.skips.update(other.skips)
+        self.lengths.update(other.lengths)
+
+    def closing_frequency(self, color: Color) -> float:
+        """Lanes of color closed per game."""
+        return self.closed[color] / self.games if self.games else 0.0
+
+    def win_rate(self, name: str) -> float:
+        """Wins of strategy per game played."""
+        games = self.scores[name].count if name in self.scores else 0
+        return self.wins[name] / games if games else 0.0
+
+    @property
+    def mean_length(self) -> float:
+        """Average number of turns per game."""
+        turns = sum(length * count for length, count in self.lengths.items())
+        return turns / self.games if self.games else 0.0
+
+    def __str__(self):
+        """String variant of statistics."""
+        lines = [f'{self.games} games, {self.mean_length:.1f} turns on average']
+        for name, stats in sorted(self.scores.items()):
+            lines.append(
+                f'{name}: score {stats.mean:.2f} sd {stats.variance ** 0.5:.2f}'
+                f', win rate {self.win_rate(name):.3f}'
+            )
+        closed = ', '.join(f'{c.name} {self.closing_frequency(c):.3f}' for c in Color)
+        lines.append(f'closed lanes per game: {closed}')
+        skips = ', '.join(f'{s}: {n}' for s, n in sorted(self.skips.items()))
+        lines.append(f'skips per player: {skips}')
+        return '\n'.join(lines)
+
+
+def chunks(
+    paths: Sequence[str | Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[Path, int, int]]:
+    """Path, offset of the first game and number of games of every chunk of the files."""
+    for path in paths:
+        with RecordReader(path) as reader:
+            start, count = None, 0
+            for offset in reader.offsets():
+                if start is None:
+                    start = offset
+                count += 1
+                if count == chunk_size:
+                    yield Path(path), start, count
+                    start, count = None, 0
+            if count:
+                yield Path(path), start, count
+
+
+def analyze_chunk(
+    path: str | Path, offset: int, count: int, names: Sequence[str] | None = None
+) -> Analytics:
+    """Analytics of count games at offset of a record file."""
+    analytics = Analytics(names)
+    with RecordReader(path) as reader:
+        for record in reader.records(offset, count):
+            analytics.add(record)
+    return analytics
+
+
+def analyze(
+    paths: Sequence[str | Path],
+    names: Sequence[str] | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Analytics:
+    """Analytics of all games in record files."""
+    result = Analytics(names)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks(paths, chunk_size):
+            result.merge(analyze_chunk(*chunk, names))
+        return result
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(analyze_chunk, *chunk, names)
+            for chunk in chunks(paths, chunk_size)
+        ]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Analyse recorded Qwuixx games.')
+    parser.add_argument('paths', nargs='+', help='record files or directories of them')
+    parser.add_argument('-n', '--names', nargs='*', help='strategy names by agent code')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='games per task')
+    options = parser.parse_args(args)
+
+    paths = []
+    for path in map(Path, options.paths):
+        paths += sorted(path.glob('*.qwx')) if path.is_dir() else [path]
+    print(analyze(paths, options.names, options.workers, options.chunk_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Benchmarks of the Qwuixx model hot paths.
+
+Every benchmark is timed several times and the fastest repeat is reported, results are
+written as JSON. Comparing against a stored baseline flags benchmarks which got slower
+than the threshold allows.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.board import Board
+from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.model.lane import Color, Lane
+from games_best_approach.games.qwixx.model.move_generator import successors
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.multiplayer import MultiplayerSearch
+
+DEFAULT_THRESHOLD = 0.1
+"""Relative slowdown which counts as regression."""
+
+DEFAULT_REPEAT = 5
+
+
+def _lane() -> Lane:
+    """Lane in the middle of a game."""
+    return Lane(Color.R).select(3).select(5).select(6)
+
+
+def _board() -> Board:
+    """Board in the middle of a game."""
+    board = Board()
+    board.select(Color.R, 4)
+    board.select(Color.Y, 6)
+    board.select(Color.G, 9)
+    board.select(Color.B, 11)
+    board.select(Color.B, 8)
+    return board
+
+
+def _dice() -> Dice:
+    """Rolled dice."""
+    random.seed(0)
+    dice = Dice()
+    dice.roll()
+    return dice
+
+
+def bench_lane_possible(number: int) -> None:
+    """Benchmark Lane.possible."""
+    lane = _lane()
+    for _ in range(number):
+        lane.possible
+
+
+def bench_lane_select(number: int) -> None:
+    """Benchmark Lane.select on a fresh lane."""
+    for _ in range(number):
+        Lane(Color.G).select(11).select(9).select(8).select(5).select(4).select(3)
+
+
+def bench_lane_is_select_possible(number: int) -> None:
+    """Benchmark Lane.is_select_possible."""
+    lane = _lane()
+    for _ in range(number):
+        lane.is_select_possible([7, 9])
+        lane.is_select_possible([4])
+
+
+def bench_board_is_dice_possible(number: int) -> None:
+    """Benchmark Board.is_dice_possible."""
+    board = _board()
+    options = _dice().options
+    for _ in range(number):
+        board.is_dice_possible(options)
+
+
+def bench_board_would_close(number: int) -> None:
+    """Benchmark Board.would_close."""
+    board = _board()
+    for _ in range(number):
+        board.would_close([(Color.R, 12)])
+        board.would_close([(Color.B, 3), (Color.B, 2)])
+
+
+def bench_successors(number: int) -> None:
+    """Benchmark move generation of a board state."""
+    state = BoardState.from_board(_board())
+    roll = _dice().index
+    for _ in range(number):
+        successors(state, roll)
+
+
+def bench_multiplayer_search(number: int) -> None:
+    """Benchmark decisions of the multiplayer search with its default time budget."""
+    search = MultiplayerSearch(seed=0)
+    states = [BoardState.from_board(_board()), BoardState()]
+    roll = _dice().index
+    for _ in range(number):
+        search.best_move(states, 0, 0, roll)
+
+
+def bench_game(number: int) -> None:
+    """Benchmark full games of two random players."""
+    random.seed(0)
+    for seed in range(number):
+        Qwuixx(2, [RandomPlayer(seed), RandomPlayer(seed + 1)]).play()
+
+
+BENCHMARKS: dict[str, tuple[Callable[[int], None], int]] = {
+    'lane_possible': (bench_lane_possible, 100_000),
+    'lane_select': (bench_lane_select, 10_000),
+    'lane_is_select_possible': (bench_lane_is_select_possible, 50_000),
+    'board_is_dice_possible': (bench_board_is_dice_possible, 10_000),
+    'board_would_close': (bench_board_would_close, 50_000),
+    'successors': (bench_successors, 20_000),
+    'multiplayer_search': (bench_multiplayer_search, 20),
+    'game': (bench_game, 50),
+}
+"""Benchmark functions by name with operations per run."""
+
+
+def run(
+    names: Sequence[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    scale: float = 1.0,
+) -> dict[str, dict[str, float]]:
+    """Run benchmarks and return seconds and operations per second by name."""
+    results = {}
+    for name in names or BENCHMARKS:
+        function, number = BENCHMARKS[name]
+        number = max(int(number * scale), 1)
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(number)
+            best = min(best, time.perf_counter() - start)
+        results[name] = {
+            'seconds_per_op': best / number,
+            'ops_per_sec': number / best if best else float('inf'),
+        }
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict[str, float]:
+    """Ratio of current to baseline time per benchmark which regressed above threshold."""
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['seconds_per_op'] / baseline[name]['seconds_per_op']
+        if ratio > 1 + threshold:
+            regressions[name] = ratio
+    return regressions
+
+
+def save(results: dict[str, dict[str, float]], path: str | Path) -> None:
+    """Save results with environment as JSON."""
+    data = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': results,
+    }
+    Path(path).write_text(json.dumps(data, indent=2))
+
+
+def load(path: str | Path) -> dict[str, dict[str, float]]:
+    """Load results saved before."""
+    return json.loads(Path(path).read_text())['benchmarks']
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Command line entry point, returns 1 on regressions."""
+    parser = argparse.ArgumentParser(description='Benchmark the Qwuixx model hot paths.')
+    parser.add_argument('names', nargs='*', help=f'benchmarks to run of {", ".join(BENCHMARKS)}')
+    parser.add_argument('-o', '--output', help='write results as JSON')
+    parser.add_argument('-c', '--compare', help='baseline JSON to compare against')
+    parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--scale', type=float, default=1.0, help='factor of operations per run')
+    options = parser.parse_args(args)
+    unknown = [name for name in options.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f'unknown benchmarks: {unknown}')
+
+    results = run(options.names, options.repeat, options.scale)
+    for name, result in results.items():
+        print(f'{name:<25} {result["ops_per_sec"]:>14,.0f} ops/s')
+
+    if options.output:
+        save(results, options.output)
+
+    if options.compare:
+        regressions = compare(results, load(options.compare), options.threshold)
+        for name, ratio in regressions.items():
+            print(f'REGRESSION {name}: {ratio:.2f}x slower than baseline')
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,27 +14,88 @@ Qwuixx game instance.
 6. if 2 lanes closed -> game end
 7. evaluate boards (print leader board)
 
+The game itself is headless, every decision is delegated to a player agent. Drivers
+collecting decisions on their own, like the game server, play a turn in steps instead:
+roll the dice, ask the deciding_players, check_move their moves, ask players with
+closing_options and finish_turn.
 """
+from __future__ import annotations
 
-from games_best_approach.games.qwixx.model.board import Board
-from games_best_approach.games.qwixx.model.dice import Dice
+from random import Random
+from typing import NamedTuple, Sequence
+
+from games_best_approach.games.qwixx.agents.player import Player
+from games_best_approach.games.qwixx.model.board import Board, GAME_END_LANES_CLOSED
+from games_best_approach.games.qwixx.model.dice import Dice, DiceRoller
 from games_best_approach.games.qwixx.model.lane import Color, LANE_MAX, LANE_MIN
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.move_generator import has_legal_move
+from games_best_approach.games.qwixx.model.state import BoardState
 
 MIN_PLAYER = 2
 MAX_PLAYER = 4
 
-GAME_END_LANES_CLOSED = 2
+ROLL_BATCH_SIZE = 64
+"""Rolls generated at once for a seeded game, enough for most games."""
+
+
+def next_phase(phase: int, players: int) -> int:
+    """Turns until a player is active after a turn, given the turns until active before."""
+    return phase - 1 if phase else players - 1
+
+
+def apply_moves(boards: dict[int, Board], active: int, moves: dict[int, Move]) -> None:
+    """Apply moves of a turn to boards by player, the active player misses without selection."""
+    active_move = moves.get(active)
+    if active_move is None or active_move.is_skip:
+        boards[active].skip()
+
+    for player, move in moves.items():
+        board = boards[player]
+        for color, number in move.dice:
+            board.select(color, number)
+
+
+class Turn(NamedTuple):
+    """Roll of a turn with the applied moves and the players switching to close a lane."""
+    roll: int
+    active: int
+    moves: dict[int, Move]
+    switched: frozenset[int]
 
 
 class Qwuixx:
 
-    def __init__(self, player: int):
-        """Initialize Qwuixx."""
+    def __init__(
+        self,
+        player: int,
+        agents: Sequence[Player] | None = None,
+        seed: int | None = None,
+    ):
+        """
+        Initialize Qwuixx, players are asked on the console if no agents are given.
+
+        With an empty sequence of agents the game is only played in steps by a driver.
+
+        With a seed the dice are rolled from an own generator, independent of the global
+        random state and of the agents, so a seed replays the same rolls for any lineup.
+        """
         if not (MIN_PLAYER <= player <= MAX_PLAYER):
             raise ValueError(f'player must be between {MIN_PLAYER} and {MAX_PLAYER}')
+        if agents is None:
+            from games_best_approach.games.qwixx.agents.console import ConsolePlayer
+            agents = [ConsolePlayer() for _ in range(player)]
+        if agents and len(agents) != player:
+            raise ValueError(f'expected {player} agents, got {len(agents)}')
+
         self.boards = {p: Board() for p in range(1, player + 1)}
+        self.agents = dict(zip(self.boards, agents))
         self._active_player = 1
         self.dice = Dice()
+        if seed is not None:
+            self.dice = Dice(DiceRoller(Random(seed), ROLL_BATCH_SIZE, use_numpy=False))
+        self.seed = seed
+        self.history: list[Turn] = []
 
     def _current_board(self, player: int = 0) -> Board:
         """Get board for current player."""
@@ -52,69 +113,93 @@ class Qwuixx:
 
         return other_player
 
-    def play(self):
-        """Play Qwuixx game."""
+    @property
+    def active_player(self) -> int:
+        """Player whose turn it is."""
+        return self._active_player
+
+    @property
+    def is_finished(self) -> bool:
+        """True if the game ended."""
+        return not self._is_not_finished()
+
+    @property
+    def scores(self) -> dict[int, int]:
+        """Score per player."""
+        return {player: board.score for player, board in self.boards.items()}
+
+    def play(self) -> dict[int, int]:
+        """Play Qwuixx game and return scores."""
         while self._is_not_finished():
-            self.dice.roll()
-            dice_per_player = {}
-            # play active player
-            if self._is_dice_possible():
-                print(self.dice)
-                self._print_current_player()
-                dice_per_player[self._active_player] = self._get_valid_selection()
-            else:
-                print(f"No dice options for player {self._active_player}, that's a miss.")
-                self._current_board().skip()
-
-            # play other players
-            for player in self._other_player:
-                if self._is_dice_possible():
-                    print(self.dice)
-                    self._print_current_player(player)
-                    dice_per_player[player] = self._get_valid_selection(player)
-                else:
-                    print(f'No dice options for player {player}')
-
-            # if white can close lane, check if anyone does
-            self._care_for_closing(dice_per_player)
-
-            self._active_player = self._next_player()
-
-        # evaluate boards
-        scores = [(player, board.score) for player, board in self.boards.items()]
-        scores.sort(key=lambda x: x[1])
-        for player, score in scores:
-            print(f'Player {player}: {score}')
-
-    def _care_for_closing(self, dice_per_player: dict[int, list[tuple[Color, int]]]) -> None:
-        """Care for closing if applicable."""
-        if self._is_player_closing_lane(dice_per_player):
-            closing_color = self._get_closing_color(dice_per_player)
-
-            for player, dice in dice_per_player.items():
-                if (closing_color, self.dice.white) in dice:
+            self.play_turn()
+
+        return self.scores
+
+    def play_turn(self) -> dict[int, Move]:
+        """Play one dice roll and return applied moves per player."""
+        if not self.agents:
+            raise ValueError('game without agents is played in steps')
+        self.dice.roll()
+        moves = {player: self._get_valid_move(player) for player in self.deciding_players()}
+
+        # if white can close lane, check if anyone does
+        switched = self._care_for_closing(moves)
+        self.finish_turn(moves, switched)
+        return moves
+
+    def deciding_players(self) -> list[int]:
+        """Players who can use the rolled dice, the active player first."""
+        return [p for p in (self._active_player, *self._other_player) if self._is_dice_possible(p)]
+
+    def check_move(self, move: Move, player: int) -> None:
+        """Raise ValueError if move is not possible for player."""
+        if not self._is_move_possible(move, player):
+            raise ValueError(f'Invalid move of player {player}: {move}')
+
+    def finish_turn(self, moves: dict[int, Move], switched: frozenset[int]) -> None:
+        """Apply moves, log turn and pass dice to next player."""
+        apply_moves(self.boards, self._active_player, moves)
+        self.history.append(Turn(self.dice.index, self._active_player, dict(moves), switched))
+        self._active_player = self._next_player()
+
+    def _care_for_closing(self, moves: dict[int, Move]) -> frozenset[int]:
+        """Care for closing if applicable and return switching players."""
+        switched = set()
+        for player, (move, new_move) in self.closing_options(moves).items():
+            if self.agents[player].switch(self, player, move, new_move):
+                moves[player] = new_move
+                switched.add(player)
+        return frozenset(switched)
+
+    def closing_options(self, moves: dict[int, Move]) -> dict[int, tuple[Move, Move]]:
+        """Chosen and possible closing move per player who can switch to the closing white dice."""
+        options = {}
+        if self._is_player_closing_lane(moves):
+            closing = Move((self._get_closing_color(moves), self.dice.white))
+
+            for player in self.boards:
+                move = moves.get(player, Move())
+                if move.white == closing.white:
                     # player already want's to use white dice to close
                     continue
-                self._request_dice_switch(player, dice, closing_color, dice_per_player)
+                new_move = self._switch_move(player, move, closing)
+                if new_move is not None:
+                    options[player] = (move, new_move)
+        return options
 
-
-    def _get_closing_color(self, dice_per_player: dict[int, list[tuple[Color, int]]]) -> Color:
+    def _get_closing_color(self, moves: dict[int, Move]) -> Color:
         """Get closing color of closing player."""
         closing_color = None
-        for player, dice in dice_per_player.items():
-            for c, n in dice:
-                if (
-                    n == self.dice.white
-                    and self._current_board(player).would_close([(c, n)])
-                ):
-                    closing_color = c
-                    
+        for player, move in moves.items():
+            if move.white and self._would_close([move.white], player):
+                closing_color = move.white[0]
+
         if closing_color is None:
             raise ValueError('Impossible state: no closing color found')
-        
+
         return closing_color
 
-    def _is_player_closing_lane(self, dice_per_player: dict[int, list[tuple[Color, int]]]) -> bool:
+    def _is_player_closing_lane(self, moves: dict[int, Move]) -> bool:
         """Check if one player is closing lane with white dice."""
         return (
             (
@@ -122,23 +207,29 @@ class Qwuixx:
                 or self.dice.white == LANE_MAX
             )
             and any(
-                self._current_board(player).would_close(
-                    [(c, n) for c, n in dice if n == self.dice.white]
-                )
-                for player, dice in dice_per_player.items()
+                move.white and self._would_close([move.white], player)
+                for player, move in moves.items()
             )
         )
 
-    def _get_valid_selection(self, player: int = 0) -> list[tuple[Color, int]]:
-        """Get valid selection."""
-        while True:
-            chosen_dice = self.dice.get_chosen(only_white=bool(player))
-            if not chosen_dice and bool(player):
-                return chosen_dice
-            valid_selection = self._current_board(player).is_select_possible(chosen_dice)
-            if valid_selection:
-                return chosen_dice
-            print('Selection can not applied to board, try again.')
+    def _get_valid_move(self, player: int = 0) -> Move:
+        """Get valid move from agent of player."""
+        current_player = player or self._active_player
+        active = current_player == self._active_player
+        move = self.agents[current_player].choose(self, current_player, active)
+        self.check_move(move, current_player)
+        return move
+
+    def _is_move_possible(self, move: Move, player: int = 0) -> bool:
+        """Check if move is possible for player."""
+        current_player = player or self._active_player
+        if current_player != self._active_player and move.color is not None:
+            return False
+        if move.white is not None and move.white[1] != self.dice.white:
+            return False
+        if move.color is not None and move.color[1] not in self.dice.options[move.color[0]]:
+            return False
+        return move.is_skip or self._current_board(player).is_select_possible(move.dice)
 
     def _next_player(self, player: int = 0) -> int:
         """Get next player."""
@@ -151,54 +242,34 @@ class Qwuixx:
 
     def _is_dice_possible(self, player: int = 0) -> bool:
         """Check if dice is possible for current player."""
-        return self._current_board(player).is_dice_possible(self.dice.options)
-
-    def _print_current_player(self, player: int = 0) -> None:
-        """Print current player and board."""
         current_player = player or self._active_player
-        print(f'Player: {current_player}')
-        print(self._current_board(player))
-
-    def _request_dice_switch(
-        self,
-        player: int,
-        dice: list[tuple[Color, int]],
-        closing_color: Color,
-        dice_per_player: dict[int, list[tuple[Color, int]]],
-    ) -> None:
-        """Request dice switch."""
-        while True:
-            switch = input(
-                f'Player {player}: Do you want to switch to the white dice? Current selection: {dice}[Y]/N')
-            if switch == 'Y':
-                if player == self._active_player:
-                    new_dice = (
-                            [(c, n) for c, n in dice if n != self.dice.white]
-                            + [(closing_color, self.dice.white)]
-                    )
-                else:
-                    new_dice = [(closing_color, self.dice.white)]
-                dice_per_player[player] = new_dice
-                return
-            elif switch == 'N':
-                return
-            else:
-                print(f'Invalid input: {switch} Try again.')
+        state = BoardState.from_board(self._current_board(player))
+        return has_legal_move(state, self.dice.index, current_player == self._active_player)
+
+    def _switch_move(self, player: int, move: Move, closing: Move) -> Move | None:
+        """Move of player using the closing white dice, keeping color if possible."""
+        new_move = Move(closing.white, move.color)
+        if not self._is_move_possible(new_move, player):
+            new_move = closing
+        if not self._is_move_possible(new_move, player):
+            return None
+        return new_move
 
     def _is_not_finished(self) -> bool:
         """Check if no one finished."""
-        closed_colors = []
-        for player, board in self.boards:
+        closed_colors = set()
+        for board in self.boards.values():
             if board.closed_by_skips:
-                return True
-            closed_colors += board.closed_colors
-
-        if len(set(closed_colors)) >= GAME_END_LANES_CLOSED:
-            return True
+                return False
+            closed_colors.update(board.closed_colors)
 
-        return False
+        if len(closed_colors) >= GAME_END_LANES_CLOSED:
+            return False
 
+        return True
 
 
 if __name__ == '__main__':
-    Qwuixx(MIN_PLAYER).play()
\ No newline at end of file
+    scores = sorted(Qwuixx(MIN_PLAYER).play().items(), key=lambda x: x[1])
+    for player, score in scores:
+        print(f'Player {player}: {score}')
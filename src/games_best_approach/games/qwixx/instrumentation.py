@@ -0,0 +1,268 @@
+"""
+Opt-in instrumentation of the game loop.
+
+While instrument is active, the phases of Qwuixx and the decisions of agents are wrapped
+with timers. Disabled there is no overhead at all, as the original methods are restored.
+
+Timings are recorded per stack of nested spans, e.g. turn;active;agent.MCTSPlayer.choose,
+with count, total and a histogram of power-of-two nanosecond buckets. Self time of a span
+is its total minus the total of its direct children, so slow runs can be attributed to
+move generation, agent search or bookkeeping. Profiles export as JSON or as collapsed
+stacks with self time, the input format of flamegraph.pl and speedscope.
+
+Spans:
+    game           Qwuixx.play
+    turn           Qwuixx.play_turn
+    roll           Dice.roll
+    legal_check    Qwuixx._is_dice_possible
+    active         decision of the active player, including validation
+    passive        decision of another player, including validation
+    closing        Qwuixx._care_for_closing
+    apply          Qwuixx.finish_turn
+    end_check      Qwuixx._is_not_finished
+    agent.<Class>.<method>   choose and switch of agents
+"""
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.dice import Dice
+
+SEPARATOR = ';'
+
+AGENT_CLASSES = (
+    'console.ConsolePlayer',
+    'heuristic.HeuristicPlayer',
+    'mcts.MCTSPlayer',
+    'optimal.OptimalPlayer',
+    'randomized.RandomPlayer',
+    'search.SearchPlayer',
+    'tablebase.TablebasePlayer',
+)
+"""Agents whose decisions are timed by default, as module.class in the agents package."""
+
+_PHASES = (
+    (Qwuixx, 'play', 'game'),
+    (Qwuixx, 'play_turn', 'turn'),
+    (Dice, 'roll', 'roll'),
+    (Qwuixx, '_is_dice_possible', 'legal_check'),
+    (Qwuixx, '_care_for_closing', 'closing'),
+    (Qwuixx, 'finish_turn', 'apply'),
+    (Qwuixx, '_is_not_finished', 'end_check'),
+)
+"""Class, method and span name of timed game phases."""
+
+_enabled = False
+
+
+class SpanStats:
+    """Count, total and histogram of durations of one span stack."""
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self.histogram: dict[int, int] = {}
+
+    def add(self, duration: int) -> None:
+        """Add a duration in nanoseconds."""
+        self.min = min(self.min, duration) if self.count else duration
+        self.max = max(self.max, duration)
+        self.count += 1
+        self.total += duration
+        bucket = duration.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def merge(self, other: SpanStats) -> None:
+        """Merge stats of other durations."""
+        if not other.count:
+            return
+        self.min = min(self.min, other.min) if self.count else other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        for bucket, count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + count
+
+
+class Profile:
+    """Recorded spans and counters, mergeable between workers."""
+
+    def __init__(self):
+        """Initialize empty profile."""
+        self.spans: dict[tuple[str, ...], SpanStats] = {}
+        self.counters: dict[str, int] = {}
+        self._local = threading.local()
+
+    def __getstate__(self):
+        """State without the thread local span stacks."""
+        return {'spans': self.spans, 'counters': self.counters}
+
+    def __setstate__(self, state):
+        """Restore state with fresh span stacks."""
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _stack(self) -> list[str]:
+        """Open spans of current thread."""
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def record(self, stack: tuple[str, ...], duration: int) -> None:
+        """Add duration in nanoseconds of span stack."""
+        stats = self.spans.get(stack)
+        if stats is None:
+            stats = self.spans[stack] = SpanStats()
+        stats.add(duration)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: Profile) -> None:
+        """Merge profile of another run."""
+        for stack, stats in other.spans.items():
+            self.spans.setdefault(stack, SpanStats()).merge(stats)
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def self_time(self, stack: tuple[str, ...]) -> int:
+        """Total of span stack without its direct children."""
+        children = sum(
+            stats.total for child, stats in self.spans.items()
+            if len(child) == len(stack) + 1 and child[:-1] == stack
+        )
+        return max(self.spans[stack].total - children, 0)
+
+    def to_dict(self) -> dict:
+        """Profile as JSON compatible dict."""
+        spans = {}
+        for stack in sorted(self.spans):
+            stats = self.spans[stack]
+            spans[SEPARATOR.join(stack)] = {
+                'count': stats.count,
+                'total_ns': stats.total,
+                'self_ns': self.self_time(stack),
+                'mean_ns': stats.total / stats.count,
+                'min_ns': stats.min,
+                'max_ns': stats.max,
+                'histogram': {str(1 << b): n for b, n in sorted(stats.histogram.items())},
+            }
+        return {'spans': spans, 'counters': dict(sorted(self.counters.items()))}
+
+    def collapsed(self) -> str:
+        """Collapsed stacks with self time in nanoseconds, one stack per line."""
+        return ''.join(
+            f'{SEPARATOR.join(stack)} {self.self_time(stack)}\n' for stack in sorted(self.spans)
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Save as JSON if the path ends with .json, otherwise as collapsed stacks."""
+        path = Path(path)
+        if path.suffix == '.json':
+            path.write_text(json.dumps(self.to_dict(), indent=2))
+        else:
+            path.write_text(self.collapsed())
+
+    def __str__(self):
+        """Spans by self time."""
+        stacks = sorted(self.spans, key=self.self_time, reverse=True)
+        total = sum(self.self_time(stack) for stack in stacks) or 1
+        lines = [
+            f'{self.self_time(stack) / total:6.1%} {self.spans[stack].count:>9} {SEPARATOR.join(stack)}'
+            for stack in stacks
+        ]
+        lines += [f'{name}: {value}' for name, value in sorted(self.counters.items())]
+        return '\n'.join(lines)
+
+
+def _agent_class(agent: type | str) -> type:
+    """Agent class, imported if given as module.class in the agents package."""
+    if isinstance(agent, type):
+        return agent
+    module, name = agent.rsplit('.', 1)
+    return getattr(importlib.import_module(f'games_best_approach.games.qwixx.agents.{module}'), name)
+
+
+def _timed(profile: Profile, name: str, method):
+    """Method recording its duration as span name."""
+    clock = time.perf_counter_ns
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        stack = profile._stack()
+        stack.append(name)
+        start = clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profile.record(tuple(stack), clock() - start)
+            stack.pop()
+
+    return timed
+
+
+def _timed_decision(profile: Profile, method):
+    """Decision of a player recorded as active or passive span and counted by kind."""
+    clock = time.perf_counter_ns
+
+    @functools.wraps(method)
+    def timed(game: Qwuixx, player: int = 0):
+        stack = profile._stack()
+        stack.append('active' if player in (0, game.active_player) else 'passive')
+        start = clock()
+        try:
+            move = method(game, player)
+        finally:
+            profile.record(tuple(stack), clock() - start)
+            stack.pop()
+        profile.count('moves.skip' if move.is_skip else 'moves.cross')
+        return move
+
+    return timed
+
+
+@contextmanager
+def instrument(
+    profile: Profile | None = None,
+    agents: Iterable[type | str] = AGENT_CLASSES,
+) -> Iterator[Profile]:
+    """Record game phases and decisions of agents while active, yields the profile."""
+    global _enabled
+    if _enabled:
+        raise RuntimeError('instrumentation is already enabled')
+    profile = profile or Profile()
+
+    patches = [(cls, method, _timed(profile, name, getattr(cls, method))) for cls, method, name in _PHASES]
+    patches.append((Qwuixx, '_get_valid_move', _timed_decision(profile, Qwuixx._get_valid_move)))
+    for cls in map(_agent_class, agents):
+        for method in ('choose', 'switch'):
+            name = f'agent.{cls.__name__}.{method}'
+            patches.append((cls, method, _timed(profile, name, getattr(cls, method))))
+
+    originals = [(cls, method, cls.__dict__.get(method)) for cls, method, _ in patches]
+    _enabled = True
+    try:
+        for cls, method, wrapper in patches:
+            setattr(cls, method, wrapper)
+        yield profile
+    finally:
+        for cls, method, original in reversed(originals):
+            if original is None:
+                delattr(cls, method)
+            else:
+                setattr(cls, method, original)
+        _enabled = False
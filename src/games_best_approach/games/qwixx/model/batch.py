@@ -0,0 +1,322 @@
+"""
+Batch of boards as structure of arrays.
+
+The lane masks of N boards are stored in one contiguous array with four masks per board
+in order of Color, the skips in another. Operations work on all boards at once with
+NumPy if it is installed, otherwise with loops over arrays of the standard library.
+
+Rolls are given as DiceBatch, one roll per board. Legal single crosses of a roll are
+reported as bit masks per board: bit i for the white sum on lane i and bit 4 + 2 * i + j
+for the sum of white die j and the color die on lane i. Moves are given in the same
+layout, one white and one color bit at most, so agents can pick them from the legal
+masks. greedy_moves is a fast default policy choosing such moves.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+
+from games_best_approach.games.qwixx.model.board import GAME_END_LANES_CLOSED, _MAX_SKIPS, _SKIP_PENALTY
+from games_best_approach.games.qwixx.model.dice import DiceBatch, numpy_module
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, LANE_SIZE, TRIANGLE, last_index
+from games_best_approach.games.qwixx.model.move_generator import COLORS, LANE_NEXT
+from games_best_approach.games.qwixx.model.state import LANE_MASK, SKIPS_SHIFT
+
+LANES = len(COLORS)
+
+DEFAULT_MAX_GAP = 1
+"""Numbers a greedy cross may leave out."""
+
+_NUMBER_BITS = 4
+_NO_CROSS = LANE_SIZE + 1
+"""Gap of crosses which are not possible."""
+
+_LANE_SCORE = tuple(TRIANGLE[mask.bit_count()] for mask in range(LANE_MASK + 1))
+_LAST = tuple(last_index(mask) for mask in range(LANE_MASK + 1))
+_NEXT = tuple(LANE_NEXT[color.asc] for color in COLORS)
+
+_numpy_tables = None
+
+
+def _tables():
+    """Lookup tables as NumPy arrays, created on first use."""
+    global _numpy_tables
+    if _numpy_tables is None:
+        np = numpy_module()
+        _numpy_tables = (
+            np.array(_LANE_SCORE, dtype=np.int16),
+            np.array(_LAST, dtype=np.int16),
+            np.stack([np.frombuffer(table, dtype=np.int16) for table in _NEXT]),
+        )
+    return _numpy_tables
+
+
+class BoardBatch:
+    """Lane masks and skips of many boards in contiguous arrays."""
+
+    def __init__(self, size: int, use_numpy: bool | None = None):
+        """Initialize empty boards, NumPy is used if installed unless use_numpy is False."""
+        np = numpy_module() if use_numpy is not False else None
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ImportError('numpy is required for use_numpy')
+
+        self._numpy = use_numpy
+        if use_numpy:
+            self.lanes = np.zeros((size, LANES), dtype=np.uint16)
+            self.skips = np.zeros(size, dtype=np.uint8)
+        else:
+            self.lanes = array('H', bytes(2 * size * LANES))
+            self.skips = array('B', bytes(size))
+
+    @classmethod
+    def from_states(cls, states: Iterable[int], use_numpy: bool | None = None) -> BoardBatch:
+        """Batch of packed board states."""
+        states = list(states)
+        batch = cls(len(states), use_numpy)
+        for i, state in enumerate(states):
+            batch[i] = state
+        return batch
+
+    def __len__(self):
+        """Number of boards."""
+        return len(self.skips)
+
+    def __getitem__(self, i: int) -> int:
+        """Packed state of board i."""
+        state = int(self.skips[i]) << SKIPS_SHIFT
+        for lane in range(LANES):
+            mask = self.lanes[i, lane] if self._numpy else self.lanes[i * LANES + lane]
+            state |= int(mask) << lane * LANE_SIZE
+        return state
+
+    def __setitem__(self, i: int, state: int) -> None:
+        """Set board i to packed state."""
+        self.skips[i] = state >> SKIPS_SHIFT
+        for lane in range(LANES):
+            mask = state >> lane * LANE_SIZE & LANE_MASK
+            if self._numpy:
+                self.lanes[i, lane] = mask
+            else:
+                self.lanes[i * LANES + lane] = mask
+
+    def states(self) -> list[int]:
+        """Packed states of all boards."""
+        return [self[i] for i in range(len(self))]
+
+    def scores(self):
+        """Score per board."""
+        if self._numpy:
+            np = numpy_module()
+            lane_score, _, _ = _tables()
+            skips = self.skips.astype(np.int16) * _SKIP_PENALTY
+            return lane_score[self.lanes].sum(axis=1, dtype=np.int16) - skips
+        lanes = self.lanes
+        return array('h', (
+            sum(_LANE_SCORE[m] for m in lanes[i * LANES:(i + 1) * LANES]) - s * _SKIP_PENALTY
+            for i, s in enumerate(self.skips)
+        ))
+
+    def is_terminal(self):
+        """True per board if it alone ends the game."""
+        if self._numpy:
+            closed = (self.lanes & CLOSE_BIT).astype(bool).sum(axis=1)
+            return (self.skips >= _MAX_SKIPS) | (closed >= GAME_END_LANES_CLOSED)
+        lanes = self.lanes
+        return [
+            s >= _MAX_SKIPS
+            or sum(bool(m & CLOSE_BIT) for m in lanes[i * LANES:(i + 1) * LANES]) >= GAME_END_LANES_CLOSED
+            for i, s in enumerate(self.skips)
+        ]
+
+    def legal_move_masks(self, dice: DiceBatch, active: bool | Sequence[bool] = True):
+        """Bit mask of legal single crosses per board, color sums only for active boards."""
+        if self._numpy:
+            np = numpy_module()
+            _, _, next_table = _tables()
+            white = np.asarray(dice.white[:len(self)], dtype=np.int32)
+            sums = np.asarray(dice.colors, dtype=np.int32).reshape(-1, 2 * LANES)[:len(self)]
+            lanes = self.lanes.astype(np.int32) << _NUMBER_BITS
+            result = np.zeros(len(self), dtype=np.int32)
+            color_bits = np.zeros(len(self), dtype=np.int32)
+            for lane in range(LANES):
+                table = next_table[lane]
+                result |= (table[lanes[:, lane] | white] >= 0).astype(np.int32) << lane
+                for j in range(2):
+                    legal = table[lanes[:, lane] | sums[:, 2 * lane + j]] >= 0
+                    color_bits |= legal.astype(np.int32) << LANES + 2 * lane + j
+            return result | np.where(np.asarray(active), color_bits, 0)
+
+        result = array('H')
+        for i in range(len(self)):
+            lanes = self.lanes[i * LANES:(i + 1) * LANES]
+            white = int(dice.white[i])
+            sums = dice.sums(i)
+            bits = 0
+            for lane, mask in enumerate(lanes):
+                table = _NEXT[lane]
+                if table[mask << _NUMBER_BITS | white] >= 0:
+                    bits |= 1 << lane
+                if active if isinstance(active, bool) else active[i]:
+                    for j in range(2):
+                        if table[mask << _NUMBER_BITS | int(sums[2 * lane + j])] >= 0:
+                            bits |= 1 << LANES + 2 * lane + j
+            result.append(bits)
+        return result
+
+    def apply_moves(self, dice: DiceBatch, moves, active: bool | Sequence[bool] = True) -> None:
+        """
+        Apply move i for roll i to every board i which is not terminal.
+
+        Moves are masks in the layout of legal_move_masks with at most one white and one
+        color bit, e.g. chosen from the legal masks by an agent or by greedy_moves. The white
+        sum is crossed first. Active boards with an empty move skip. Raises ValueError
+        without changing any board if a move has more bits, uses a color sum on a passive
+        board or is not possible.
+        """
+        if self._numpy:
+            self._apply_numpy(dice, moves, active)
+            return
+
+        terminal = self.is_terminal()
+        changes = []
+        for i in range(len(self)):
+            if terminal[i]:
+                continue
+            move = int(moves[i])
+            is_active = active if isinstance(active, bool) else active[i]
+            white_bits, color_bits = move & _WHITE_BITS, move >> LANES
+            if white_bits & white_bits - 1 or color_bits & color_bits - 1 or color_bits and not is_active:
+                raise ValueError(f'move {move:#x} of board {i} is no single white and color cross')
+            lanes = list(self.lanes[i * LANES:(i + 1) * LANES])
+            crosses = []
+            if white_bits:
+                crosses.append((white_bits.bit_length() - 1, int(dice.white[i])))
+            if color_bits:
+                k = color_bits.bit_length() - 1
+                crosses.append((k // 2, int(dice.sums(i)[k])))
+            for lane, number in crosses:
+                new = _NEXT[lane][lanes[lane] << _NUMBER_BITS | number]
+                if new < 0:
+                    raise ValueError(f'move {move:#x} of board {i} is not possible')
+                lanes[lane] = new
+            changes.append((i, lanes, is_active and not move))
+
+        for i, lanes, skip in changes:
+            self.lanes[i * LANES:(i + 1) * LANES] = array('H', lanes)
+            self.skips[i] += skip
+
+    def _apply_numpy(self, dice: DiceBatch, moves, active) -> None:
+        """Vectorized apply_moves."""
+        np = numpy_module()
+        _, _, next_table = _tables()
+        size = len(self)
+        rows = np.arange(size)
+        alive = ~self.is_terminal()
+        is_active = np.broadcast_to(np.asarray(active, dtype=bool), size)
+        moves = np.where(alive, np.asarray(moves, dtype=np.int32)[:size], 0)
+        white_bits, color_bits = moves & _WHITE_BITS, moves >> LANES
+        invalid = (white_bits & white_bits - 1) | (color_bits & color_bits - 1)
+        if invalid.any() or ((color_bits > 0) & ~is_active).any():
+            raise ValueError('moves must be single white and color crosses')
+
+        lanes = self.lanes.astype(np.int32)
+        bit_index = np.array(_BIT_INDEX, dtype=np.int32)
+        white = np.asarray(dice.white[:size], dtype=np.int32)
+        sums = np.asarray(dice.colors, dtype=np.int32).reshape(-1, 2 * LANES)[:size]
+        for bits, numbers_of in ((white_bits, None), (color_bits, sums)):
+            target = rows[bits > 0]
+            index = bit_index[bits[target]]
+            if numbers_of is None:
+                lane, numbers = index, white[target]
+            else:
+                lane, numbers = index // 2, numbers_of[target, index]
+            new = next_table[lane, lanes[target, lane] << _NUMBER_BITS | numbers]
+            if (new < 0).any():
+                raise ValueError('moves must be possible')
+            lanes[target, lane] = new
+
+        self.lanes[:] = lanes
+        self.skips[is_active & alive & (moves == 0)] += 1
+
+
+_WHITE_BITS = (1 << LANES) - 1
+_BIT_INDEX = tuple(bits.bit_length() - 1 for bits in range(1 << 2 * LANES))
+"""Position of the highest bit of a move mask part."""
+
+
+def greedy_moves(
+    batch: BoardBatch,
+    dice: DiceBatch,
+    active: bool | Sequence[bool] = True,
+    max_gap: int = DEFAULT_MAX_GAP,
+):
+    """
+    Greedy move mask per board for apply_moves, zero for terminal boards.
+
+    The white sum is crossed on the lane leaving out the fewest numbers, then for active
+    boards a color sum likewise, if at most max_gap numbers are left out.
+    """
+    if batch._numpy:
+        return _greedy_numpy(batch, dice, active, max_gap)
+
+    terminal = batch.is_terminal()
+    moves = array('H', bytes(2 * len(batch)))
+    for i in range(len(batch)):
+        if terminal[i]:
+            continue
+        lanes = list(batch.lanes[i * LANES:(i + 1) * LANES])
+        white = int(dice.white[i])
+        best = _best_option(lanes, [(lane, white) for lane in range(LANES)], max_gap)
+        if best >= 0:
+            moves[i] = 1 << best
+            lanes[best] = _NEXT[best][lanes[best] << _NUMBER_BITS | white]
+        if active if isinstance(active, bool) else active[i]:
+            sums = dice.sums(i)
+            best = _best_option(lanes, [(k // 2, int(sums[k])) for k in range(2 * LANES)], max_gap)
+            if best >= 0:
+                moves[i] |= 1 << LANES + best
+    return moves
+
+
+def _greedy_numpy(batch: BoardBatch, dice: DiceBatch, active, max_gap: int):
+    """Vectorized greedy_moves."""
+    np = numpy_module()
+    _, last, next_table = _tables()
+    size = len(batch)
+    rows = np.arange(size)
+    alive = ~batch.is_terminal()
+    lanes = batch.lanes.astype(np.int32)
+    white = np.asarray(dice.white[:size], dtype=np.int32)
+    sums = np.asarray(dice.colors, dtype=np.int32).reshape(-1, 2 * LANES)[:size]
+
+    def best(numbers, lane_of, where):
+        """Option with the smallest gap per row and rows where it is taken."""
+        masks = lanes[:, lane_of]
+        new = next_table[lane_of, masks << _NUMBER_BITS | numbers].astype(np.int32)
+        gaps = np.where(new >= 0, last[np.maximum(new, 0)] - last[masks] - 1, _NO_CROSS)
+        option = gaps.argmin(axis=1)
+        taken = where & (gaps[rows, option] <= max_gap)
+        target = rows[taken]
+        lanes[target, lane_of[option[taken]]] = new[target, option[taken]]
+        return option, taken
+
+    white_lane, white_taken = best(white[:, np.newaxis].repeat(LANES, axis=1), np.arange(LANES), alive)
+    is_active = np.broadcast_to(np.asarray(active, dtype=bool), size) & alive
+    color, color_taken = best(sums, np.arange(2 * LANES) // 2, is_active)
+    moves = np.where(white_taken, 1 << white_lane, 0)
+    return moves | np.where(color_taken, 1 << LANES + color, 0)
+
+
+def _best_option(lanes, options: Sequence[tuple[int, int]], max_gap: int) -> int:
+    """Position of the option of lane and number with the smallest gap, -1 if none fits."""
+    best_gap, best = _NO_CROSS, -1
+    for position, (lane, number) in enumerate(options):
+        mask = lanes[lane]
+        new = _NEXT[lane][mask << _NUMBER_BITS | number]
+        if new >= 0:
+            gap = _LAST[new] - _LAST[mask] - 1
+            if gap < best_gap:
+                best_gap, best = gap, position
+    return best if best_gap <= max_gap else -1
@@ -1,23 +1,87 @@
 """Model for board."""
-from games_best_approach.games.qwixx.model.lane import Color, Lane
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping
+
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, INDEX, LANE_SIZE, Color, Lane, select_mask
+
+if TYPE_CHECKING:
+    from games_best_approach.games.qwixx.model.move import Move
 
 _MAX_SKIPS = 4
 
+_SKIP_PENALTY = 5
+
+GAME_END_LANES_CLOSED = 2
+
+_COLORS = tuple(Color)
+
+_LANE_ENTRY_BITS = 3 + LANE_SIZE
+"""Undo entry of a lane: color position + 1 and previous mask."""
+
+_LANE_ENTRY_MASK = (1 << LANE_SIZE) - 1
+
+
+class _Trial:
+    """Context applying dice to a board and reverting them on exit."""
+
+    __slots__ = ('_board', '_dice', '_applied', '_possible')
+
+    def __init__(self, board: Board, dice: list[tuple[Color, int]]):
+        """Initialize trial of dice."""
+        self._board = board
+        self._dice = dice
+        self._applied = False
+        self._possible = None
+
+    def __enter__(self) -> bool:
+        """Apply dice if possible, returns if they were applied."""
+        board = self._board
+        self._possible = board._possible
+        self._applied = board._push(self._dice, False)
+        if self._applied:
+            board._possible = None
+        return self._applied
+
+    def __exit__(self, *exc_info) -> None:
+        """Revert applied dice and restore the view of possible numbers before."""
+        if self._applied:
+            board = self._board
+            board._revert(board._undo.pop(), -1)
+            board._possible = self._possible
+
+
 class Board:
 
+    __slots__ = (
+        '_lanes', '_skips', '_lane_score', '_closed', '_closable', '_possible', '_undo', '_redo'
+    )
+
     def __init__(self):
         """Initialize board."""
         self._lanes = {color: Lane(color) for color in Color}
         self._skips = 0
+        self._lane_score = 0
+        self._closed: tuple[Color, ...] = ()
+        self._closable: tuple[Color, ...] = ()
+        self._possible: Mapping[Color, tuple[int, ...]] | None = None
+        self._undo: list[int] = []
+        self._redo: list[int] = []
 
     def __str__(self):
         """String variant of board."""
         return '\n'.join(str(l) for l in self._lanes.values())
 
     @property
-    def closed_colors(self) -> list[Color]:
+    def closed_colors(self) -> tuple[Color, ...]:
         """Colors of closed lanes."""
-        return [c for c, l in self._lanes.items() if l.is_closed]
+        return self._closed
+
+    @property
+    def closable_colors(self) -> tuple[Color, ...]:
+        """Colors of open lanes with enough crosses to be closed."""
+        return self._closable
 
     @property
     def closed_by_skips(self) -> bool:
@@ -25,13 +89,47 @@ class Board:
         return self._skips >= _MAX_SKIPS
 
     @property
-    def possible(self) -> dict[Color, list[int]]:
-        """Possible lane numbers per color."""
-        return {c: l.possible for c, l in self._lanes.items()}
+    def possible(self) -> Mapping[Color, tuple[int, ...]]:
+        """Read-only possible lane numbers per color, recomputed after lanes changed."""
+        if self._possible is None:
+            self._possible = MappingProxyType({c: l.possible for c, l in self._lanes.items()})
+        return self._possible
 
     def select(self, color: Color, number: int) -> None:
         """Select number on lane."""
-        self._lanes[color].select(number)
+        lane = self._lanes[color]
+        self._set_lane(lane, lane._selected(number))
+        self._possible = None
+
+    def _set_lane(self, lane: Lane, mask: int) -> None:
+        """
+        Set crosses of lane and update derived state.
+
+        The view of possible numbers is invalidated by the committing callers only, so
+        reverted trials keep it.
+        """
+        score = lane.score
+        closed = lane.is_closed
+        can_close = lane.can_close
+        lane._load(mask)
+        self._lane_score += lane.score - score
+
+        if lane.is_closed != closed or lane.can_close != can_close:
+            self._update_closed()
+
+    def _update_closed(self) -> None:
+        """Recompute colors of closed and closable lanes."""
+        self._closed = tuple(c for c, l in self._lanes.items() if l.is_closed)
+        self._closable = tuple(c for c, l in self._lanes.items() if l.can_close and not l.is_closed)
+
+    def _load(self, masks: dict[Color, int], skips: int) -> None:
+        """Load crosses per lane and skips, derived state is recomputed."""
+        for color, mask in masks.items():
+            self._lanes[color]._load(mask)
+        self._skips = skips
+        self._lane_score = sum(lane.score for lane in self._lanes.values())
+        self._possible = None
+        self._update_closed()
 
     def skip(self) -> None:
         """Skip dice roll."""
@@ -40,25 +138,96 @@ class Board:
 
         self._skips += 1
 
-    def would_close(self, dice: list[tuple[Color, int]]) -> bool:
-        """True if a select would close lane."""
-        if all(dice[0][0] == d[0] for d in dice):
-            # all colors are same
-            numbers = [n for _, n in dice]
-            return self._lanes[dice[0][0]].would_close(numbers)
+    def _push(self, dice: list[tuple[Color, int]], active: bool) -> bool:
+        """Apply dice and log undo entry, False without change if not possible."""
+        entry = 0
+        for i, (color, number) in enumerate(dice):
+            lane = self._lanes[color]
+            mask = lane._select_mask([number])
+            if mask < 0:
+                self._revert(entry, -1)
+                return False
+            entry |= (_COLORS.index(color) + 1 | lane._mask << 3) << (1 + i * _LANE_ENTRY_BITS)
+            self._set_lane(lane, mask)
+
+        if active and not dice:
+            if self.closed_by_skips:
+                raise RuntimeError('Too many skips')
+            self._skips += 1
+            entry = 1
+
+        self._undo.append(entry)
+        return True
+
+    def _revert(self, entry: int, skip: int) -> int:
+        """
+        Restore lane masks of log entry in reverse order and add skip if flagged.
+
+        Returns the entry reverting this again.
+        """
+        inverse = entry & 1
+        if inverse:
+            self._skips += skip
+        entry >>= 1
+        lanes = []
+        while entry:
+            lanes.append(entry & ((1 << _LANE_ENTRY_BITS) - 1))
+            entry >>= _LANE_ENTRY_BITS
+        for i, lane_entry in enumerate(reversed(lanes)):
+            lane = self._lanes[_COLORS[(lane_entry & 7) - 1]]
+            inverse |= (lane_entry & 7 | lane._mask << 3) << (1 + i * _LANE_ENTRY_BITS)
+            self._set_lane(lane, lane_entry >> 3 & _LANE_ENTRY_MASK)
+        return inverse
+
+    def push(self, move: Move | list[tuple[Color, int]], active: bool = False) -> None:
+        """Apply move so it can be undone, an empty move of the active player is a skip."""
+        dice = move if isinstance(move, list) else move.dice
+        if not self._push(dice, active):
+            raise ValueError(f'selection {dice} not possible')
+        self._redo.clear()
+        self._possible = None
+
+    def pop(self) -> None:
+        """Undo last pushed move, it can be redone until the next push."""
+        if not self._undo:
+            raise IndexError('no move to undo')
+        self._redo.append(self._revert(self._undo.pop(), -1))
+        self._possible = None
+
+    def redo(self) -> None:
+        """Apply last undone move again."""
+        if not self._redo:
+            raise IndexError('no move to redo')
+        self._undo.append(self._revert(self._redo.pop(), 1))
+        self._possible = None
+
+    def trying(self, dice: list[tuple[Color, int]]) -> _Trial:
+        """Context applying dice if possible, entering returns if they were applied."""
+        return _Trial(self, dice)
+
+    def _probe(self, dice: list[tuple[Color, int]]) -> dict[Color, int] | None:
+        """Lane masks after dice by color without changing the board, None if not possible."""
+        masks = {}
+        lanes = self._lanes
+        for color, number in dice:
+            lane = lanes[color]
+            index = INDEX[lane._asc].get(number)
+            if index is None:
+                return None
+            mask = select_mask(masks.get(color, lane._mask), index)
+            if mask < 0:
+                return None
+            masks[color] = mask
+        return masks
 
-        # all different colors are possible
-        return all(self._lanes[c].would_close([n]) for c, n in dice)
+    def would_close(self, dice: list[tuple[Color, int]]) -> bool:
+        """True if a select would close lane, False for no dice."""
+        masks = self._probe(dice)
+        return bool(masks) and all(mask & CLOSE_BIT for mask in masks.values())
 
     def is_select_possible(self, dice: list[tuple[Color, int]]) -> bool:
         """Check if select with dice is possible."""
-        if all(dice[0][0] == d[0] for d in dice):
-            # all colors are same
-            numbers = [n for _, n in dice]
-            return self._lanes[dice[0][0]].is_select_possible(numbers)
-
-        # all different colors are possible
-        return all(self._lanes[c].is_select_possible([n]) for c, n in dice)
+        return self._probe(dice) is not None
 
     def is_dice_possible(self, options: dict[Color, list[int]]) -> bool:
         """Check if select with dice is possible."""
@@ -72,7 +241,7 @@ class Board:
     @property
     def score(self) -> int:
         """Score of board."""
-        return sum(lane.score for lane in self._lanes.values()) - (self._skips * 5)
+        return self._lane_score - (self._skips * _SKIP_PENALTY)
 
 if __name__ == '__main__':
     print(Board())
\ No newline at end of file
@@ -3,29 +3,181 @@ Dice model.
 
 This represents 6 dice. 2 are white and the others are red, yellow, blue and green
 """
-import re
-from random import randint
+from __future__ import annotations
+
+from array import array
+from functools import cache
+from random import Random, randint
 
 from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
 
 _DOUBLE_WHITE_MARKER = 'ww'
 
+DIE_SIDES = 6
+
+DICE = 2 + len(Color)
+"""Number of dice, white first and then the colors in order of Color."""
+
+DEFAULT_BATCH_SIZE = 4096
+
 _CHOSEN_DICE_VALIDATION = r'^(wwr|wwy|wwb|wwg|w1b|w2b|w1g|w2g|w1r|w2r|w1y|w2y)$'
 
 
+@cache
+def numpy_module():
+    """NumPy if it is installed, otherwise None, imported on first use to keep startup fast."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - numpy is optional
+        return None
+    return numpy
+
+
+@cache
+def _chosen_pattern():
+    """Compiled validation of chosen dice, only needed for console input."""
+    import re
+    return re.compile(_CHOSEN_DICE_VALIDATION)
+
+
+def roll_index(w1: int, w2: int, r: int, y: int, g: int, b: int) -> int:
+    """Index of a roll, the dice read as digits of base DIE_SIDES."""
+    index = 0
+    for die in (w1, w2, r, y, g, b):
+        index = index * DIE_SIDES + die - 1
+    return index
+
+
+def roll_dice(index: int) -> tuple[int, ...]:
+    """Dice w1, w2, r, y, g, b of a roll index."""
+    dice = []
+    for _ in range(DICE):
+        index, die = divmod(index, DIE_SIDES)
+        dice.append(die + 1)
+    return tuple(reversed(dice))
+
+
+class DiceBatch:
+    """
+    Batch of rolls in contiguous arrays.
+
+    Dice are stored row-major as w1, w2, r, y, g, b per roll. Colors holds the eight sums
+    of white and color dice per roll, w1 + r, w2 + r, w1 + y, ... in order of Color.
+    """
+
+    def __init__(self, dice, white, colors, index):
+        """Initialize batch from arrays computed by DiceRoller."""
+        self.dice = dice
+        self.white = white
+        self.colors = colors
+        self.index = index
+
+    def __len__(self):
+        """Number of rolls."""
+        return len(self.white)
+
+    def roll(self, i: int):
+        """View of the dice of roll i."""
+        if not isinstance(self.dice, array):
+            return self.dice[i]
+        return memoryview(self.dice)[i * DICE:(i + 1) * DICE]
+
+    def sums(self, i: int):
+        """View of the white and color sums of roll i."""
+        if not isinstance(self.colors, array):
+            return self.colors[i]
+        size = 2 * len(Color)
+        return memoryview(self.colors)[i * size:(i + 1) * size]
+
+
+class DiceRoller:
+    """Seedable source of dice rolls generated in batches."""
+
+    def __init__(
+        self,
+        seed: int | Random | object | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        use_numpy: bool | None = None,
+    ):
+        """
+        Initialize roller from seed, random.Random or numpy.random.Generator.
+
+        NumPy is used if it is installed unless use_numpy is False.
+        """
+        np = numpy_module() if use_numpy is not False else None
+        if use_numpy is None:
+            use_numpy = np is not None and not isinstance(seed, Random)
+        if use_numpy and np is None:
+            raise ImportError('numpy is required for use_numpy')
+
+        if use_numpy:
+            self._rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        else:
+            self._rng = seed if isinstance(seed, Random) else Random(seed)
+        self._numpy = use_numpy
+        self.batch_size = batch_size
+        self._batch = None
+        self._next = 0
+
+    def batch(self, size: int | None = None) -> DiceBatch:
+        """Roll a new batch of rolls."""
+        size = size or self.batch_size
+        if self._numpy:
+            return self._numpy_batch(size)
+        return self._array_batch(size)
+
+    def _numpy_batch(self, size: int) -> DiceBatch:
+        """Roll batch with numpy."""
+        np = numpy_module()
+        dice = self._rng.integers(1, DIE_SIDES + 1, size=(size, DICE), dtype=np.int8)
+        whites = dice[:, :2]
+        colors = (dice[:, 2:, np.newaxis] + whites[:, np.newaxis, :]).reshape(size, -1)
+        powers = DIE_SIDES ** np.arange(DICE - 1, -1, -1, dtype=np.int32)
+        index = (dice.astype(np.int32) - 1) @ powers
+        return DiceBatch(dice, whites.sum(axis=1, dtype=np.int8), colors, index)
+
+    def _array_batch(self, size: int) -> DiceBatch:
+        """Roll batch with the standard library."""
+        dice = array('b', self._rng.choices(range(1, DIE_SIDES + 1), k=size * DICE))
+        white = array('b')
+        colors = array('b')
+        index = array('l')
+        for i in range(0, size * DICE, DICE):
+            w1, w2, *color_dice = dice[i:i + DICE]
+            white.append(w1 + w2)
+            for die in color_dice:
+                colors.append(w1 + die)
+                colors.append(w2 + die)
+            index.append(roll_index(w1, w2, *color_dice))
+        return DiceBatch(dice, white, colors, index)
+
+    def next(self) -> tuple[DiceBatch, int]:
+        """Batch and position of the next roll."""
+        if self._batch is None or self._next >= len(self._batch):
+            self._batch = self.batch()
+            self._next = 0
+        position = self._next
+        self._next += 1
+        return self._batch, position
+
+
 class Dice:
 
-    options = dict[Color, list[int]]()
-    white = 0
-    w1 = 0
-    w2 = 0
-    r = 0
-    y = 0
-    b = 0
-    g = 0
+    __slots__ = ('white', 'w1', 'w2', 'r', 'y', 'b', 'g', 'options', '_roller')
+
+    def __init__(self, roller: DiceRoller | None = None):
+        """Initialize dice, rolled with the global random state without roller."""
+        self.white = self.w1 = self.w2 = self.r = self.y = self.b = self.g = 0
+        self.options: dict[Color, list[int]] = {}
+        self._roller = roller
 
     def roll(self) -> None:
         """Roll dice and set options for colors."""
+        if self._roller is not None:
+            self._roll_from(*self._roller.next())
+            return
+
         self.w1 = randint(1, 6)
         self.w2 = randint(1, 6)
         self.r = randint(1, 6)
@@ -47,6 +199,19 @@ class Dice:
                 self.w2 + die,
             ]
 
+    def _roll_from(self, batch: DiceBatch, i: int) -> None:
+        """Set dice to roll i of batch."""
+        self.w1, self.w2, self.r, self.y, self.g, self.b = (int(d) for d in batch.roll(i))
+        self.white = self.w1 + self.w2
+        sums = batch.sums(i)
+        for offset, color in enumerate(Color):
+            self.options[color] = [int(sums[2 * offset]), int(sums[2 * offset + 1])]
+
+    @property
+    def index(self) -> int:
+        """Index of rolled dice."""
+        return roll_index(self.w1, self.w2, self.r, self.y, self.g, self.b)
+
     def __str__(self):
         """String variant of dice."""
         if not self.white:
@@ -67,7 +232,7 @@ class Dice:
             if not chosen_die_input:
                 return ''
 
-            match = re.match(_CHOSEN_DICE_VALIDATION, chosen_die_input)
+            match = _chosen_pattern().match(chosen_die_input)
             if not match:
                 print(f'invalid choice: "{chosen_die_input}"')
                 continue
@@ -89,7 +254,7 @@ class Dice:
 
     def get_chosen(self, _white_chosen: bool = False, only_white: bool = False) -> list[tuple[Color, int]]:
         """Get chosen dice."""
-        chosen_die = self._input_chosen(_white_chosen)
+        chosen_die = self._input_chosen(_white_chosen, only_white)
         if not chosen_die:
             return []
 
@@ -104,6 +269,22 @@ class Dice:
 
         return chosen_dice
 
+    def get_move(self, only_white: bool = False) -> Move:
+        """Get chosen dice as move."""
+        chosen_die = self._input_chosen(False, only_white)
+        if not chosen_die:
+            return SKIP
+
+        chosen = (self._interpret_color(chosen_die), self._interpret_number(chosen_die))
+        if _DOUBLE_WHITE_MARKER not in chosen_die:
+            return Move(color=chosen)
+
+        if only_white:
+            return Move(chosen)
+
+        color = self.get_chosen(_white_chosen=True)
+        return Move(chosen, color[0] if color else None)
+
     @staticmethod
     def _interpret_color(chosen_die: str) -> Color:
         """Convert chosen die string to color"""
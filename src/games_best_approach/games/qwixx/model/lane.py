@@ -1,150 +1,201 @@
 """Lane model."""
 from __future__ import annotations
 
-from enum import Enum, auto
-from itertools import islice
-from typing import Iterator
-from zoneinfo import reset_tzpath
+from enum import Enum
 
 MINIMAL_CLOSE_SELECTIONS = 5
 
 LANE_MIN = 2
 LANE_MAX = 12
 
+LANE_SIZE = 12
+"""Fields of a lane including the closing bonus."""
+
+CLOSE_INDEX = LANE_SIZE - 1
+"""Internal index of the closing bonus."""
+
+LAST_INDEX = CLOSE_INDEX - 1
+"""Internal index of the last selectable number."""
+
+CLOSE_BIT = 1 << CLOSE_INDEX
+NUMBERS_MASK = CLOSE_BIT - 1
+
+TRIANGLE = tuple(n * (n + 1) // 2 for n in range(LANE_SIZE + 1))
+"""Score per number of crosses."""
+
+
 class Direction(Enum):
     """Direction of lane."""
-    ASC = auto()
-    DESC = auto()
+    ASC = 1, 1
+    DESC = 2, -1
+
+    def __new__(cls, value: int, step: int):
+        """Member with its step as plain attribute, valued by the first item."""
+        member = object.__new__(cls)
+        member._value_ = value
+        member.step = step
+        return member
+
+    step: int
+    """Step representation of direction."""
 
-    @property
-    def step(self):
-        """Step representation of  direction."""
-        if self is Direction.ASC:
-            return 1
-        elif self is Direction.DESC:
-            return -1
-        raise ValueError('Direction must be ASC or DESC')
 
 class Color(Enum):
     """Color of lane."""
-    R = auto()
-    Y = auto()
-    G = auto()
-    B = auto()
+    R = 1, Direction.ASC
+    Y = 2, Direction.ASC
+    G = 3, Direction.DESC
+    B = 4, Direction.DESC
+
+    def __new__(cls, value: int, direction: Direction):
+        """Member with its direction as plain attributes, valued by the first item."""
+        member = object.__new__(cls)
+        member._value_ = value
+        member.direction = direction
+        member.asc = direction is Direction.ASC
+        return member
+
+    direction: Direction
+    """Direction of lane."""
+    asc: bool
+    """If color has ascending direction."""
 
-    @property
-    def direction(self) -> Direction:
-        """Direction of lane."""
-        if self in {Color.R, Color.Y}:
-            return Direction.ASC
-        elif self in {Color.G, Color.B}:
-            return Direction.DESC
-        raise ValueError(f'Unknown direction for color {self}')
 
-    @property
-    def asc(self) -> bool:
-        """If color has ascending direction."""
-        if self.direction is Direction.ASC:
-            return True
-        elif self.direction is Direction.DESC:
-            return False
-        raise ValueError('Direction must be ASC or DESC')
+def _numbers(asc: bool) -> tuple[int, ...]:
+    """Numbers of lane by internal index, including closing bonus."""
+    if asc:
+        return tuple(range(LANE_MIN, LANE_MAX + 2))
+    return tuple(range(LANE_MAX, LANE_MIN - 2, -1))
+
+
+NUMBERS = {asc: _numbers(asc) for asc in (True, False)}
+"""Lane numbers by internal index per direction."""
+
+INDEX = {
+    asc: {n: i for i, n in enumerate(numbers[:CLOSE_INDEX])}
+    for asc, numbers in NUMBERS.items()
+}
+"""Internal index per selectable number and direction."""
+
+POSSIBLE = {
+    asc: tuple(
+        tuple(numbers[i] for i in range(LAST_INDEX, last, -1))
+        for last in range(-1, LANE_SIZE)
+    )
+    for asc, numbers in NUMBERS.items()
+}
+"""Possible numbers per direction, looked up by rightmost crossed index + 1."""
+
+
+def last_index(mask: int) -> int:
+    """Rightmost crossed number index of lane mask, -1 if nothing crossed."""
+    return (mask & NUMBERS_MASK).bit_length() - 1
+
+
+def select_mask(mask: int, index: int) -> int:
+    """Lane mask after crossing index, -1 if not possible."""
+    if not (mask & NUMBERS_MASK).bit_length() <= index <= LAST_INDEX:
+        return -1
+    mask |= 1 << index
+    if index == LAST_INDEX and mask.bit_count() > MINIMAL_CLOSE_SELECTIONS:
+        mask |= CLOSE_BIT
+    return mask
+
 
 class Lane:
     """Model representing a lane."""
 
+    __slots__ = ('color', '_asc', '_mask', '_last', '_count', '_score', '_can_close', '_closed')
+
     def __init__(self, color: Color):
         """Initialize lane."""
         self.color = color
-        if self.asc:
-            self._lane = list(range(LANE_MIN, LANE_MAX + 2, color.direction.step))
-        else:
-            self._lane = list(range(LANE_MAX, LANE_MIN - 2, color.direction.step))
+        self._asc = color.asc
+        self._load(0)
 
     def __str__(self):
         """String variant of lane."""
         lane = ' | '.join('><' if n is None else f'{n:02d}' for n in self._lane)
         return f'{self.color.name} ( {lane} )'
 
+    @property
+    def _lane(self) -> list[int | None]:
+        """Lane numbers by internal index, None if crossed."""
+        mask = self._mask
+        return [
+            None if mask >> i & 1 else n
+            for i, n in enumerate(NUMBERS[self._asc])
+        ]
+
     @property
     def asc(self) -> bool:
         """If lane has ascending direction."""
-        return self.color.asc
+        return self._asc
 
     @property
-    def possible(self) -> list[int]:
-        """Possible lane numbers."""
-        reversed_lane = self._lane[::-1]
-
-        if None not in self._lane:
-            if not self.can_close:
-                return reversed_lane[1:]
-            return reversed_lane
-
-        possible_numbers = list(islice(reversed_lane, reversed_lane.index(None)))[1:]  # closing bonus not selectable
-
-        if any(p is None for p in possible_numbers):
-            raise ValueError('possible lane numbers cannot be None')
-
-        return possible_numbers
+    def possible(self) -> tuple[int, ...]:
+        """Possible lane numbers, shared read-only tuple of the lookup table."""
+        return POSSIBLE[self._asc][self._last + 1]
 
     @property
     def is_closed(self) -> bool:
         """If lane is closed."""
-        return self._lane[-1] is None
+        return self._closed
+
+    def _select_mask(self, numbers: list[int]) -> int:
+        """Lane mask after selecting numbers, -1 if not possible."""
+        mask = self._mask
+        index = INDEX[self._asc]
+        for number in numbers:
+            if number not in index:
+                return -1
+            mask = select_mask(mask, index[number])
+            if mask < 0:
+                return -1
+        return mask
+
+    def _load(self, mask: int) -> None:
+        """Load crosses from lane mask and update derived state."""
+        self._mask = mask
+        self._last = last_index(mask)
+        self._count = mask.bit_count()
+        self._score = TRIANGLE[self._count]
+        self._can_close = self._count >= MINIMAL_CLOSE_SELECTIONS
+        self._closed = bool(mask & CLOSE_BIT)
 
     def would_close(self, numbers: list[int]) -> bool:
         """If select would close lane."""
-        if len(numbers) == 1:
-            return self.can_close and numbers[0] == self.possible[0]
-
-        temp_lane = self._copy()
-        return temp_lane.select(numbers[0]).would_close(numbers[1:])
-
-    def _copy(self) -> Lane:
-        """Copy lane."""
-        temp_lane = Lane(self.color)
-        temp_lane._lane = self._lane.copy()
-        return temp_lane
+        mask = self._select_mask(numbers)
+        return mask >= 0 and bool(mask & CLOSE_BIT)
 
     @property
     def can_close(self) -> bool:
         """If lane can be closed."""
-        return self._lane.count(None) >= MINIMAL_CLOSE_SELECTIONS
+        return self._can_close
+
+    def _selected(self, number: int) -> int:
+        """Lane mask after selecting number."""
+        mask = self._select_mask([number])
+        if mask < 0:
+            raise ValueError(f'number {number} not in possible options: {list(self.possible)}')
+        return mask
 
     def select(self, number: int) -> Lane:
         """Select number in lane."""
-        if number not in self.possible:
-            raise ValueError(f'number {number} not in possible options: {self.possible}')
-
-        if self.asc:
-            internal_index = number - LANE_MIN
-        else:
-            internal_index = LANE_MAX - number
-
-        if self.would_close([number]):
-            self._lane[-1] = None
-
-        self._lane[internal_index] = None
+        self._load(self._selected(number))
 
         return self
 
     def is_select_possible(self, numbers: list[int]) -> bool:
         """Check if select with number is possible."""
-        temp_lane = self._copy()
-        try:
-            for number in numbers:
-                temp_lane.select(number)
-        except ValueError:
-            return False
-        return True
+        return self._select_mask(numbers) >= 0
 
     @property
     def score(self) -> int:
         """Score of lane."""
-        return sum(range(1, self._lane.count(None)+1))
+        return self._score
 
 if __name__ == '__main__':
     l = Lane(Color.B).select(12).select(11).select(10).select(9).select(8)
     print(l.select(2))
-    print(Lane(Color.R).select(2).select(3).select(4).select(5).select(6).select(12))
\ No newline at end of file
+    print(Lane(Color.R).select(2).select(3).select(4).select(5).select(6).select(12))
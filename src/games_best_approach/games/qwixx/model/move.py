@@ -0,0 +1,58 @@
+"""
+Move model.
+
+Every move also has a compact code below MOVE_CODES. The white and the color part are
+encoded as 0 if unused or 1 + color position * 11 + number - 2, the move as
+white * 45 + color. MOVES decodes codes to interned moves.
+"""
+from typing import NamedTuple
+
+from games_best_approach.games.qwixx.model.lane import LANE_MAX, LANE_MIN, Color
+
+
+class Move(NamedTuple):
+    """
+    Move of a player for one dice roll.
+
+    White is the sum of both white dice crossed on a lane, color the sum of one white and
+    one color die crossed on the lane of that color. A move without both is a skip.
+    """
+    white: tuple[Color, int] | None = None
+    color: tuple[Color, int] | None = None
+
+    @property
+    def dice(self) -> list[tuple[Color, int]]:
+        """Chosen dice in order of selection."""
+        return [d for d in (self.white, self.color) if d is not None]
+
+    @property
+    def is_skip(self) -> bool:
+        """If no number is selected."""
+        return self.white is None and self.color is None
+
+    @property
+    def code(self) -> int:
+        """Compact code of move."""
+        return _CODES[self]
+
+    @staticmethod
+    def decode(code: int) -> 'Move':
+        """Interned move of a code."""
+        return MOVES[code]
+
+
+_NUMBERS = LANE_MAX - LANE_MIN + 1
+_PARTS = 1 + len(Color) * _NUMBERS
+
+MOVE_CODES = _PARTS * _PARTS
+"""Number of move codes."""
+
+_DICE = (None, *((color, number) for color in Color for number in range(LANE_MIN, LANE_MAX + 1)))
+"""Dice of a move part by code."""
+
+MOVES = tuple(Move(white, color) for white in _DICE for color in _DICE)
+"""Interned moves by code."""
+
+_CODES = {move: code for code, move in enumerate(MOVES)}
+
+SKIP = MOVES[0]
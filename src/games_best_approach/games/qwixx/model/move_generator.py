@@ -0,0 +1,152 @@
+"""
+Legal move generator.
+
+All 6^6 dice rolls and all lane transitions are precomputed into lookup tables, so
+generating the moves of a packed board state is a sequence of table lookups.
+A roll is addressed by its index, the dice w1, w2, r, y, g, b read as base 6 digits.
+"""
+from array import array
+from itertools import product
+
+from games_best_approach.games.qwixx.model.dice import DIE_SIDES
+from games_best_approach.games.qwixx.model.lane import (
+    INDEX,
+    LANE_MAX,
+    LANE_MIN,
+    LANE_SIZE,
+    LAST_INDEX,
+    NUMBERS_MASK,
+    Color,
+    select_mask,
+)
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+
+COLORS = tuple(Color)
+
+ROLLS = DIE_SIDES ** (2 + len(COLORS))
+"""Number of possible rolls of all dice."""
+
+_LANE_STATES = 1 << LANE_SIZE
+_NUMBER_BITS = 4
+_LANE_MASK = _LANE_STATES - 1
+
+
+def _next_table(asc: bool) -> array:
+    """Lane mask after crossing a number, by mask << 4 | number, -1 if not possible."""
+    table = array('h', [-1]) * (_LANE_STATES << _NUMBER_BITS)
+    numbers = sorted(INDEX[asc], key=INDEX[asc].get)
+    for mask in range(_LANE_STATES):
+        first = (mask & NUMBERS_MASK).bit_length()
+        if first > LAST_INDEX:
+            continue
+        # crossable numbers of a mask are consecutive, filled as one slice
+        row = array('h', (select_mask(mask, index) for index in range(first, LAST_INDEX + 1)))
+        if not asc:
+            row.reverse()
+        start = mask << _NUMBER_BITS | min(numbers[first], numbers[LAST_INDEX])
+        table[start:start + len(row)] = row
+    return table
+
+
+LANE_NEXT = {asc: _next_table(asc) for asc in (True, False)}
+"""Lane transition table per direction."""
+
+_NEXT = tuple(LANE_NEXT[color.asc] for color in COLORS)
+_SHIFT = tuple(i * LANE_SIZE for i in range(len(COLORS)))
+
+
+def _roll_tables() -> tuple[array, tuple[tuple[tuple[int, ...], ...], ...]]:
+    """White sum and distinct color sums per color for every roll."""
+    white = array('b')
+    colors = []
+    sides = range(1, DIE_SIDES + 1)
+    for w1, w2 in product(sides, repeat=2):
+        white.extend(array('b', [w1 + w2]) * DIE_SIDES ** len(COLORS))
+        sums = [tuple(sorted({w1 + d, w2 + d})) for d in sides]
+        colors.extend(product(sums, repeat=len(COLORS)))
+    return white, tuple(colors)
+
+
+ROLL_WHITE, ROLL_COLORS = _roll_tables()
+"""White sum and sorted distinct color sums per color, by roll index."""
+
+def _interned(move: Move) -> Move:
+    """Move of the decode table, the move itself for numbers no lane has."""
+    if all(number >= LANE_MIN for _, number in move.dice):
+        return Move.decode(move.code)
+    return move
+
+
+WHITE_MOVES = tuple(
+    tuple(_interned(Move((color, number))) for number in range(LANE_MAX + 1))
+    for color in COLORS
+)
+"""Interned white only moves by color position and number."""
+
+COLOR_MOVES = tuple(
+    tuple(
+        tuple(
+            _interned(Move(
+                None if white is None else (COLORS[white], number), (color, color_number)
+            ))
+            for color_number in range(LANE_MAX + 1)
+        )
+        for white in [None, *range(len(COLORS))]
+    )
+    for number in range(LANE_MAX + 1)
+    for color in COLORS
+)
+"""Interned moves by white number * 4 + color position, white color position + 1 and color number."""
+
+
+def select_state(state: int, color: int, number: int) -> int:
+    """Packed state after crossing number on lane at color position, -1 if not possible."""
+    shift = _SHIFT[color]
+    mask = _NEXT[color][(state >> shift & _LANE_MASK) << _NUMBER_BITS | number]
+    return -1 if mask < 0 else state | mask << shift
+
+
+def successors(state: int, roll: int, active: bool = True) -> list[tuple[Move, int]]:
+    """Legal moves with resulting packed states, a skip is always the first move."""
+    white = ROLL_WHITE[roll]
+    result = [(SKIP, state)]
+    whites = [(0, state)]
+    for i, shift in enumerate(_SHIFT):
+        mask = _NEXT[i][(state >> shift & _LANE_MASK) << _NUMBER_BITS | white]
+        if mask >= 0:
+            new_state = state | mask << shift
+            result.append((WHITE_MOVES[i][white], new_state))
+            whites.append((i + 1, new_state))
+
+    if not active:
+        return result
+
+    for i, numbers in enumerate(ROLL_COLORS[roll]):
+        shift = _SHIFT[i]
+        table = _NEXT[i]
+        moves = COLOR_MOVES[white * len(COLORS) + i]
+        for white_index, white_state in whites:
+            lane = (white_state >> shift & _LANE_MASK) << _NUMBER_BITS
+            for number in numbers:
+                mask = table[lane | number]
+                if mask >= 0:
+                    result.append((moves[white_index][number], white_state | mask << shift))
+
+    return result
+
+
+def legal_moves(state: int, roll: int, active: bool = True) -> list[Move]:
+    """Legal moves of packed state for roll, a skip is always the first move."""
+    return [move for move, _ in successors(state, roll, active)]
+
+
+def has_legal_move(state: int, roll: int, active: bool = True) -> bool:
+    """Check if any number can be selected for roll."""
+    white = ROLL_WHITE[roll]
+    for i, shift in enumerate(_SHIFT):
+        lane = (state >> shift & _LANE_MASK) << _NUMBER_BITS
+        if _NEXT[i][lane | white] >= 0:
+            return True
+        if active and any(_NEXT[i][lane | n] >= 0 for n in ROLL_COLORS[roll][i]):
+            return True
+    return False
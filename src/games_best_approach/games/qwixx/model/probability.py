@@ -0,0 +1,154 @@
+"""
+Exact probabilities of rolls and lane progress.
+
+A lane only depends on the white dice and its own color die, so probabilities over the
+6^3 outcomes of those dice equal the ones over all 6^6 rolls. Lanes are symmetric:
+replacing every die d by 7 - d maps a sum s to 14 - s and an ascending lane onto a
+descending one, so probabilities per lane mask hold for both directions and are computed
+by lane index.
+
+Probabilities of numbers are built at import, probabilities per lane state are cached
+on first use.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import cache
+from itertools import product
+
+from games_best_approach.games.qwixx.game import next_phase
+from games_best_approach.games.qwixx.model.dice import DICE, DIE_SIDES
+from games_best_approach.games.qwixx.model.lane import (
+    CLOSE_BIT,
+    INDEX,
+    LANE_MAX,
+    LANE_MIN,
+    LAST_INDEX,
+    MINIMAL_CLOSE_SELECTIONS,
+    NUMBERS_MASK,
+    last_index,
+)
+
+ROLL_PROBABILITY = 1 / DIE_SIDES ** DICE
+"""Probability of every roll index."""
+
+_OUTCOMES = tuple(product(range(1, DIE_SIDES + 1), repeat=3))
+"""White dice and one color die, equally likely."""
+
+
+def _sum_probability(sums) -> tuple[float, ...]:
+    """Probability per number that one of the sums of an outcome hits it."""
+    hits = [0] * (LANE_MAX + 1)
+    for w1, w2, die in _OUTCOMES:
+        for number in set(sums(w1, w2, die)):
+            hits[number] += 1
+    return tuple(h / len(_OUTCOMES) for h in hits)
+
+
+WHITE_SUM = _sum_probability(lambda w1, w2, die: (w1 + w2,))
+"""Probability of the white sum by number."""
+
+COLOR_SUM = _sum_probability(lambda w1, w2, die: (w1 + die, w2 + die))
+"""Probability that a white and color sum of a lane hits the number."""
+
+ANY_SUM = _sum_probability(lambda w1, w2, die: (w1 + w2, w1 + die, w2 + die))
+"""Probability that the active player can use the number on a lane."""
+
+
+def number_probability(number: int, active: bool = True) -> float:
+    """Probability that a number is available on a lane in a turn."""
+    if not LANE_MIN <= number <= LANE_MAX:
+        return 0.0
+    return ANY_SUM[number] if active else WHITE_SUM[number]
+
+
+def _group(options) -> tuple[tuple[float, tuple[tuple[int, ...], ...]], ...]:
+    """Distinct index sequences of outcomes on an ascending lane with probability."""
+    groups = defaultdict(int)
+    for w1, w2, die in _OUTCOMES:
+        white, first, second = (n - LANE_MIN for n in (w1 + w2, w1 + die, w2 + die))
+        groups[tuple(sorted(set(options(white, first, second))))] += 1
+    return tuple((count / len(_OUTCOMES), key) for key, count in groups.items())
+
+
+_PASSIVE = _group(lambda white, first, second: ((white,),))
+_ACTIVE = _group(
+    lambda white, first, second: (
+        (white,), (first,), (second,), (white, first), (white, second)
+    )
+)
+"""Sequences of indexes to cross on a lane per outcome, white first."""
+
+
+def _cross(last: int, count: int, indexes: tuple[int, ...]) -> tuple[int, int] | None:
+    """Rightmost index and crosses after crossing indexes, None if not possible."""
+    for index in indexes:
+        if not last < index <= LAST_INDEX:
+            return None
+        last, count = index, count + 1
+    return last, count
+
+
+def _is_closing(last: int, count: int) -> bool:
+    """Check if crosses ending at last close the lane."""
+    return last == LAST_INDEX and count > MINIMAL_CLOSE_SELECTIONS
+
+
+@cache
+def _cross_probability(last: int, count: int, active: bool) -> float:
+    """Probability of any cross on a lane."""
+    return sum(
+        probability
+        for probability, options in (_ACTIVE if active else _PASSIVE)
+        if any(_cross(last, count, indexes[:1]) is not None for indexes in options)
+    )
+
+
+def cross_probability(mask: int, active: bool = True) -> float:
+    """Probability that a lane mask can be crossed at all in a turn."""
+    if mask & CLOSE_BIT:
+        return 0.0
+    return _cross_probability(last_index(mask), (mask & NUMBERS_MASK).bit_count(), active)
+
+
+def number_cross_probability(mask: int, number: int, asc: bool, active: bool = True) -> float:
+    """Probability that number can be crossed on a lane mask in a turn."""
+    index = INDEX[asc].get(number)
+    if mask & CLOSE_BIT or index is None or index <= last_index(mask):
+        return 0.0
+    return number_probability(number, active)
+
+
+@cache
+def _close_probability(last: int, count: int, turns: int, phase: int, players: int) -> float:
+    """Probability to close a lane within turns, crossing only on this lane."""
+    if turns == 0:
+        return 0.0
+    turns -= 1
+    after = next_phase(phase, players)
+    stay = _close_probability(last, count, turns, after, players)
+    total = 0.0
+    for probability, options in _PASSIVE if phase else _ACTIVE:
+        best = stay
+        for indexes in options:
+            crossed = _cross(last, count, indexes)
+            if crossed is None:
+                continue
+            if _is_closing(*crossed):
+                best = 1.0
+                break
+            best = max(best, _close_probability(*crossed, turns, after, players))
+        total += probability * best
+    return total
+
+
+def close_probability(mask: int, turns: int, players: int = 2, phase: int = 0) -> float:
+    """
+    Probability to close a lane mask within turns when playing for it.
+
+    The player is active every players-th turn, next in phase turns.
+    """
+    if mask & CLOSE_BIT:
+        return 1.0
+    count = (mask & NUMBERS_MASK).bit_count()
+    return _close_probability(last_index(mask), count, turns, phase, players)
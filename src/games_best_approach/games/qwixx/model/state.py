@@ -0,0 +1,153 @@
+"""
+Packed board state.
+
+An immutable and hashable variant of the board, packed into a single int. Each lane
+takes 12 bits of crosses in the order of Color, followed by 3 bits for the skips.
+"""
+from __future__ import annotations
+
+from games_best_approach.games.qwixx.model.board import Board, GAME_END_LANES_CLOSED, _MAX_SKIPS
+from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.model.lane import (
+    CLOSE_BIT,
+    INDEX,
+    LANE_SIZE,
+    TRIANGLE,
+    Color,
+    select_mask,
+)
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.move_generator import legal_moves
+
+COLORS = tuple(Color)
+
+LANE_MASK = (1 << LANE_SIZE) - 1
+
+SKIPS_SHIFT = LANE_SIZE * len(COLORS)
+
+_SHIFT = {color: i * LANE_SIZE for i, color in enumerate(COLORS)}
+_ASC = {color: color.asc for color in COLORS}
+
+LANE_SHIFTS = tuple(_SHIFT.values())
+"""Bit offset of every lane in order of Color."""
+
+_R, _Y, _G, _B = LANE_SHIFTS
+
+
+def lane_masks(state: int) -> tuple[int, int, int, int]:
+    """Cross masks of the lanes of a packed state in order of Color."""
+    return (
+        state >> _R & LANE_MASK,
+        state >> _Y & LANE_MASK,
+        state >> _G & LANE_MASK,
+        state >> _B & LANE_MASK,
+    )
+
+
+def pack_lanes(r: int, y: int, g: int, b: int, skips: int = 0) -> int:
+    """Packed state of lane masks in order of Color and skips."""
+    return r << _R | y << _Y | g << _G | b << _B | skips << SKIPS_SHIFT
+
+
+class BoardState(int):
+    """Immutable board state packed into an int."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        """Representation of board state."""
+        lanes = ', '.join(f'{c.name}={self.lane(c):03x}' for c in COLORS)
+        return f'BoardState({lanes}, skips={self.skips})'
+
+    @classmethod
+    def from_board(cls, board: Board) -> BoardState:
+        """Pack mutable board."""
+        state = board._skips << SKIPS_SHIFT
+        for color, lane in board._lanes.items():
+            state |= lane._mask << _SHIFT[color]
+        return cls(state)
+
+    def to_board(self) -> Board:
+        """Unpack into a mutable board."""
+        board = Board()
+        board._load({color: self.lane(color) for color in COLORS}, self.skips)
+        return board
+
+    def lane(self, color: Color) -> int:
+        """Cross mask of lane."""
+        return self >> _SHIFT[color] & LANE_MASK
+
+    @property
+    def skips(self) -> int:
+        """Number of skips."""
+        return self >> SKIPS_SHIFT
+
+    @property
+    def closed_colors(self) -> list[Color]:
+        """Colors of closed lanes."""
+        return [c for c in COLORS if self >> _SHIFT[c] & CLOSE_BIT]
+
+    @property
+    def closed_by_skips(self) -> bool:
+        """True if too many skips."""
+        return self.skips >= _MAX_SKIPS
+
+    @property
+    def is_terminal(self) -> bool:
+        """True if board alone ends the game."""
+        return self.closed_by_skips or len(self.closed_colors) >= GAME_END_LANES_CLOSED
+
+    @property
+    def score(self) -> int:
+        """Score of board."""
+        return sum(
+            TRIANGLE[(self >> _SHIFT[c] & LANE_MASK).bit_count()] for c in COLORS
+        ) - (self.skips * 5)
+
+    def _select(self, color: Color, number: int) -> int:
+        """Packed state after selecting number, -1 if not possible."""
+        index = INDEX[_ASC[color]].get(number)
+        if index is None:
+            return -1
+        mask = select_mask(self >> _SHIFT[color] & LANE_MASK, index)
+        if mask < 0:
+            return -1
+        return self | mask << _SHIFT[color]
+
+    def select(self, color: Color, number: int) -> BoardState:
+        """Board state after selecting number on lane."""
+        state = self._select(color, number)
+        if state < 0:
+            raise ValueError(f'number {number} not possible on lane {color.name}')
+        return BoardState(state)
+
+    def skip(self) -> BoardState:
+        """Board state after skipping dice roll."""
+        if self.closed_by_skips:
+            raise RuntimeError('Too many skips')
+        return BoardState(self + (1 << SKIPS_SHIFT))
+
+    def apply(self, move: Move | list[tuple[Color, int]], active: bool = True) -> BoardState:
+        """Board state after a move, an empty move of the active player is a skip."""
+        dice = move.dice if isinstance(move, Move) else move
+        if not dice:
+            return self.skip() if active else self
+
+        state = self
+        for color, number in dice:
+            state = state.select(color, number)
+        return state
+
+    def is_select_possible(self, move: Move | list[tuple[Color, int]]) -> bool:
+        """Check if select with dice is possible."""
+        dice = move.dice if isinstance(move, Move) else move
+        state = self
+        for color, number in dice:
+            state = BoardState._select(state, color, number)
+            if state < 0:
+                return False
+        return True
+
+    def legal_moves(self, dice: Dice, active: bool = True) -> list[Move]:
+        """Legal moves for dice roll, a skip is always included."""
+        return legal_moves(self, dice.index, active)
@@ -0,0 +1,45 @@
+"""
+Symmetries of a single board.
+
+Evaluated alone, a board does not change its value when lanes of the same direction are
+swapped, as the color dice are independent and equally distributed. Lanes are stored by
+position, so swapping both ascending with both descending lanes keeps the value as well:
+flipping every die to 7 - die maps a number n to 14 - n at the same position and keeps
+the distribution of all dice. With compact lanes, the crosses before the last crossed
+number are moved to the start, which keeps the score and all future moves of a lane.
+
+canonical maps a packed state to the smallest representative of its equivalent states.
+"""
+from __future__ import annotations
+
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, LANE_SIZE, NUMBERS_MASK, last_index
+from games_best_approach.games.qwixx.model.state import LANE_MASK, SKIPS_SHIFT, lane_masks
+
+_DIRECTION_BITS = 2 * LANE_SIZE
+_SKIPS_MASK = ~((1 << SKIPS_SHIFT) - 1)
+
+
+def compact_lane(mask: int) -> int:
+    """Lane mask with the crosses before the last crossed number moved to the start."""
+    count = (mask & NUMBERS_MASK).bit_count()
+    if not count:
+        return mask & CLOSE_BIT
+    return (1 << count - 1) - 1 | 1 << last_index(mask) | mask & CLOSE_BIT
+
+
+COMPACT_LANE = tuple(compact_lane(mask) for mask in range(LANE_MASK + 1))
+"""Compact lane by lane mask."""
+
+
+def canonical(state: int, compact: bool = False) -> int:
+    """Smallest equivalent packed state, with compact lanes if compact."""
+    r, y, g, b = lane_masks(state)
+    if compact:
+        lane = COMPACT_LANE
+        r, y, g, b = lane[r], lane[y], lane[g], lane[b]
+    asc = r | y << LANE_SIZE if r <= y else y | r << LANE_SIZE
+    desc = g | b << LANE_SIZE if g <= b else b | g << LANE_SIZE
+    if asc > desc:
+        asc, desc = desc, asc
+    return asc | desc << _DIRECTION_BITS | state & _SKIPS_MASK
+
@@ -0,0 +1,266 @@
+"""
+Compact binary records of played games.
+
+A record file starts with a header followed by fixed-size slots of 8 bytes. A game takes
+three slots for seed, number of turns, players, agent codes and final scores, followed by
+one slot per turn with roll index, active player, switching players and one move byte per
+player. Agent codes identify the strategy of a seat, zero if unknown.
+
+A move byte holds the lane of the white dice in bits 0-2 and of the color dice in bits
+3-5, as position in Color plus one or zero if unused. Bit 6 is set if the color sum uses
+the second white die and bit 7 if the player moved at all. Numbers follow from the roll,
+skips from the active player not selecting anything.
+
+Games are appended by a buffered writer and read lazily from a memory map.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+from games_best_approach.games.qwixx.game import MAX_PLAYER, Qwuixx, Turn
+from games_best_approach.games.qwixx.model.dice import roll_dice
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import Move
+
+MAGIC = b'QWXR'
+VERSION = 1
+SLOT_SIZE = 8
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+"""Bytes buffered before writing to the file."""
+
+_HEADER = struct.Struct('<4sHH')
+_GAME = struct.Struct('<QHB4Bx4h')
+_TURN = struct.Struct('<HBB4B')
+_GAME_SLOTS = _GAME.size // SLOT_SIZE
+
+_NO_SEED = (1 << 64) - 1
+_COLORS = tuple(Color)
+_POSITION = {color: i + 1 for i, color in enumerate(_COLORS)}
+
+_MOVED = 0x80
+_SECOND_WHITE = 0x40
+
+
+def encode_move(move: Move | None, roll: int) -> int:
+    """Move byte of a move for roll, zero if the player did not move."""
+    if move is None:
+        return 0
+    code = _MOVED
+    if move.white is not None:
+        code |= _POSITION[move.white[0]]
+    if move.color is not None:
+        color, number = move.color
+        position = _POSITION[color]
+        code |= position << 3
+        dice = roll_dice(roll)
+        if number - dice[position + 1] != dice[0]:
+            code |= _SECOND_WHITE
+    return code
+
+
+def decode_move(code: int, roll: int) -> Move | None:
+    """Move of a move byte for roll."""
+    if not code & _MOVED:
+        return None
+    dice = roll_dice(roll)
+    white = color = None
+    if code & 7:
+        white = (_COLORS[(code & 7) - 1], dice[0] + dice[1])
+    if code >> 3 & 7:
+        position = code >> 3 & 7
+        w = dice[1] if code & _SECOND_WHITE else dice[0]
+        color = (_COLORS[position - 1], w + dice[position + 1])
+    return Move(white, color)
+
+
+class GameRecord:
+    """Seed, turns and final scores of a game."""
+
+    def __init__(
+        self,
+        seed: int | None,
+        players: int,
+        turns: Sequence[Turn],
+        scores: Sequence[int],
+        agents: Sequence[int] | None = None,
+    ):
+        """Initialize record, scores and agent codes are in order of players."""
+        self.seed = seed
+        self.players = players
+        self.turns = list(turns)
+        self.scores = list(scores)
+        self.agents = list(agents) if agents is not None else [0] * players
+
+    @classmethod
+    def from_game(cls, game: Qwuixx, agents: Sequence[int] | None = None) -> GameRecord:
+        """Record of a played game with agent codes per player."""
+        scores = list(game.scores.values())
+        return cls(game.seed, len(game.boards), game.history, scores, agents)
+
+    @property
+    def skips(self) -> list[int]:
+        """Skips per player."""
+        skips = [0] * self.players
+        for turn in self.turns:
+            move = turn.moves.get(turn.active)
+            if move is None or move.is_skip:
+                skips[turn.active - 1] += 1
+        return skips
+
+    def __eq__(self, other):
+        """Check records for equality."""
+        if not isinstance(other, GameRecord):
+            return NotImplemented
+        return (
+            (self.seed, self.players, self.turns, self.scores, self.agents)
+            == (other.seed, other.players, other.turns, other.scores, other.agents)
+        )
+
+    def __repr__(self):
+        """Representation of record."""
+        return (
+            f'GameRecord(seed={self.seed}, players={self.players}, '
+            f'turns={len(self.turns)}, scores={self.scores})'
+        )
+
+    def pack(self) -> bytes:
+        """Binary slots of the record."""
+        seed = _NO_SEED if self.seed is None else self.seed
+        padding = [0] * (MAX_PLAYER - self.players)
+        data = bytearray(_GAME.pack(
+            seed, len(self.turns), self.players, *self.agents, *padding, *self.scores, *padding
+        ))
+        players = range(1, MAX_PLAYER + 1)
+        for turn in self.turns:
+            switched = sum(1 << (p - 1) for p in turn.switched)
+            moves = (encode_move(turn.moves.get(p), turn.roll) for p in players)
+            data += _TURN.pack(turn.roll, turn.active, switched, *moves)
+        return bytes(data)
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> tuple[GameRecord, int]:
+        """Record at offset of buffer and offset of the next record."""
+        seed, turns, players, *values = _GAME.unpack_from(buffer, offset)
+        agents, scores = values[:players], values[MAX_PLAYER:MAX_PLAYER + players]
+        offset += _GAME.size
+        records = []
+        for _ in range(turns):
+            roll, active, switched, *codes = _TURN.unpack_from(buffer, offset)
+            offset += SLOT_SIZE
+            moves = {}
+            for player, code in enumerate(codes[:players], 1):
+                move = decode_move(code, roll)
+                if move is not None:
+                    moves[player] = move
+            switching = frozenset(p for p in range(1, players + 1) if switched >> (p - 1) & 1)
+            records.append(Turn(roll, active, moves, switching))
+        seed = None if seed == _NO_SEED else seed
+        return cls(seed, players, records, scores, agents), offset
+
+
+class RecordWriter:
+    """Buffered writer appending game records to a file."""
+
+    def __init__(self, path: str | Path, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """Open file for appending, a header is written to new files."""
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._buffer += _HEADER.pack(MAGIC, VERSION, SLOT_SIZE)
+        self.games = 0
+
+    def write(self, record: GameRecord | Qwuixx) -> None:
+        """Append record of a game."""
+        if isinstance(record, Qwuixx):
+            record = GameRecord.from_game(record)
+        self._buffer += record.pack()
+        self.games += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> RecordWriter:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close on exit of context."""
+        self.close()
+
+
+class RecordReader:
+    """Reader of game records memory mapping the file."""
+
+    def __init__(self, path: str | Path):
+        """Open and validate file."""
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                raise ValueError(f'{path} is no game record file')
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slot_size = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or slot_size != SLOT_SIZE:
+            self._map.close()
+            raise ValueError(f'{path} is no game record file')
+        if version != VERSION:
+            self._map.close()
+            raise ValueError(f'unsupported game record version {version}')
+
+    def offsets(self) -> Iterator[int]:
+        """Offsets of all records without decoding turns."""
+        offset = _HEADER.size
+        size = len(self._map)
+        while offset < size:
+            yield offset
+            turns = _GAME.unpack_from(self._map, offset)[1]
+            offset += (_GAME_SLOTS + turns) * SLOT_SIZE
+
+    def read(self, offset: int) -> GameRecord:
+        """Record at offset."""
+        return GameRecord.unpack_from(self._map, offset)[0]
+
+    def records(self, offset: int | None = None, count: int | None = None) -> Iterator[GameRecord]:
+        """Iterate count records lazily from offset, all following records without count."""
+        offset = _HEADER.size if offset is None else offset
+        size = len(self._map)
+        while offset < size and count != 0:
+            record, offset = GameRecord.unpack_from(self._map, offset)
+            if count is not None:
+                count -= 1
+            yield record
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        """Iterate records lazily."""
+        return self.records()
+
+    def close(self) -> None:
+        """Close memory map."""
+        self._map.close()
+
+    def __enter__(self) -> RecordReader:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close on exit of context."""
+        self.close()
+
@@ -0,0 +1,52 @@
+"""
+Deterministic seeds of independent random streams.
+
+Like SeedSequence of NumPy, a stream is identified by a root entropy and a spawn key.
+Both are hashed into the seed of the stream, so streams of different keys are
+independent, no matter in which process or order they are created, and nearby root
+seeds do not give overlapping streams. Children extend the spawn key by their index.
+
+Seeds are hashed with BLAKE2 of the standard library, so they are the same with or
+without NumPy installed, and fit into 63 bits to be stored in game records.
+"""
+from __future__ import annotations
+
+import hashlib
+import secrets
+from random import Random
+
+SEED_BITS = 63
+
+
+class SeedSequence:
+    """Root entropy and spawn key of a random stream."""
+
+    def __init__(self, entropy: int | None = None, spawn_key: tuple[int | str, ...] = ()):
+        """Initialize sequence, with fresh entropy of the OS if entropy is None."""
+        self.entropy = secrets.randbits(SEED_BITS) if entropy is None else entropy
+        self.spawn_key = tuple(spawn_key)
+        self.children_spawned = 0
+
+    @property
+    def seed(self) -> int:
+        """Seed of this stream."""
+        digest = hashlib.blake2b(repr((self.entropy, self.spawn_key)).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') >> 64 - SEED_BITS
+
+    def child(self, *key: int | str) -> SeedSequence:
+        """Sequence of the stream at key below this one."""
+        return SeedSequence(self.entropy, self.spawn_key + key)
+
+    def spawn(self, count: int) -> list[SeedSequence]:
+        """Next count child sequences, children spawned before are not repeated."""
+        start = self.children_spawned
+        self.children_spawned += count
+        return [self.child(i) for i in range(start, start + count)]
+
+    def random(self) -> Random:
+        """Generator of this stream."""
+        return Random(self.seed)
+
+    def __repr__(self):
+        """Sequence with entropy and spawn key."""
+        return f'SeedSequence(entropy={self.entropy}, spawn_key={self.spawn_key})'
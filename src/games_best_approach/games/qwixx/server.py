@@ -0,0 +1,410 @@
+"""
+Asyncio game server hosting many concurrent games.
+
+Clients connect via TCP and exchange JSON messages, one per line. A client joins with
+the number of players and the names of bot agents filling the other seats:
+
+    {"type": "join", "players": 2, "bots": ["heuristic"]}
+
+A game starts as soon as enough clients joined with the same lineup. Every turn each
+player who can use the roll is asked at the same time to choose a move:
+
+    {"type": "choose", "id": 3, "player": 1, "active": true, "dice": [...], "boards": {...}, "moves": [...]}
+
+Boards are packed board states by player, moves the legal move codes. The client answers
+with the id and one of the codes, {"id": 3, "move": 0}. If a white sum closes a lane,
+players who can switch are asked {"type": "switch", "id": 4, "move": ..., "closing": ...}
+and answer {"id": 4, "switch": true}. After each turn all clients get the applied moves,
+at the end the scores. Without a valid answer in time, a move defaults to skip and a
+switch to keep the move.
+
+Bot agents run in a thread pool, so slow searches do not block the event loop.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from collections.abc import Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from games_best_approach.games.qwixx.agents.player import Player
+from games_best_approach.games.qwixx.game import MAX_PLAYER, MIN_PLAYER, Qwuixx
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import legal_moves
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.tournament import AGENTS
+
+DEFAULT_PORT = 8765
+
+DEFAULT_TIMEOUT = 60.0
+"""Seconds a client has to answer a request."""
+
+
+class BotSeat:
+    """Seat played by an agent in an executor."""
+
+    def __init__(self, agent: Player, executor: Executor | None = None):
+        """Initialize seat, the default executor of the loop is used without executor."""
+        self.agent = agent
+        self.executor = executor
+
+    async def send(self, message: dict) -> None:
+        """Bots need no messages."""
+
+    async def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Choose move of agent."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.agent.choose, game, player, active)
+
+    async def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Switch decision of agent."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.agent.switch, game, player, move, closing)
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+class RemoteSeat:
+    """Seat played by a connected client."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """Initialize seat of connection."""
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.closed = False
+        self.matched = asyncio.Event()
+        self.done = asyncio.Event()
+        self._id = 0
+
+    async def send(self, message: dict) -> None:
+        """Send message, the seat is closed if the connection is lost."""
+        if self.closed:
+            return
+        try:
+            self.writer.write(json.dumps(message).encode() + b'\n')
+            await self.writer.drain()
+        except ConnectionError:
+            self.closed = True
+
+    async def receive(self) -> dict | None:
+        """Next message, None if the connection is closed."""
+        if self.closed:
+            return None
+        try:
+            line = await self.reader.readline()
+        except ConnectionError:
+            line = b''
+        if not line:
+            self.closed = True
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if not isinstance(message, dict):
+            await self.send({'type': 'error', 'message': 'message is no JSON object'})
+            return {}
+        return message
+
+    async def _request(self, message: dict, parse):
+        """Send request and parse the answer with its id, None on timeout or disconnect."""
+        if self.closed:
+            return None
+        self._id += 1
+        message['id'] = self._id
+        await self.send(message)
+        try:
+            async with asyncio.timeout(self.timeout):
+                while True:
+                    answer = await self.receive()
+                    if answer is None:
+                        return None
+                    if answer.get('id') != self._id:
+                        continue
+                    try:
+                        return parse(answer)
+                    except (KeyError, TypeError, ValueError) as error:
+                        await self.send({'type': 'error', 'id': self._id, 'message': str(error)})
+        except TimeoutError:
+            await self.send({'type': 'timeout', 'id': self._id})
+            return None
+
+    async def choose(self, game: Qwuixx, player: int, active: bool) -> Move:
+        """Ask client for one of the legal moves, skip without answer."""
+        moves = legal_moves(BoardState.from_board(game.boards[player]), game.dice.index, active)
+        codes = {move.code: move for move in moves}
+
+        def parse(answer: dict) -> Move:
+            """Legal move of answer."""
+            code = answer['move']
+            if not isinstance(code, int) or code not in codes:
+                raise ValueError(f'move {code} is not legal')
+            return codes[code]
+
+        dice = game.dice
+        message = {
+            'type': 'choose',
+            'player': player,
+            'active': active,
+            'dice': [dice.w1, dice.w2, dice.r, dice.y, dice.g, dice.b],
+            'boards': _boards(game),
+            'moves': list(codes),
+        }
+        move = await self._request(message, parse)
+        return SKIP if move is None else move
+
+    async def switch(self, game: Qwuixx, player: int, move: Move, closing: Move) -> bool:
+        """Ask client to switch to the closing move, no switch without answer."""
+
+        def parse(answer: dict) -> bool:
+            """Switch decision of answer."""
+            if not isinstance(answer['switch'], bool):
+                raise ValueError('switch must be true or false')
+            return answer['switch']
+
+        message = {'type': 'switch', 'player': player, 'move': move.code, 'closing': closing.code}
+        return bool(await self._request(message, parse))
+
+    def close(self) -> None:
+        """Release connection handler."""
+        self.done.set()
+
+
+def _boards(game: Qwuixx) -> dict[int, int]:
+    """Packed board states by player."""
+    return {player: int(BoardState.from_board(board)) for player, board in game.boards.items()}
+
+
+class Match:
+    """Game played by seats, decisions of a turn are collected concurrently."""
+
+    def __init__(self, seats: Sequence[BotSeat | RemoteSeat], seed: int | None = None):
+        """Initialize game, dice are rolled from an own generator of seed."""
+        self.seats = dict(enumerate(seats, 1))
+        self.game = Qwuixx(len(seats), (), seed)
+
+    async def broadcast(self, message: dict) -> None:
+        """Send message to all seats."""
+        await asyncio.gather(*(seat.send(message) for seat in self.seats.values()))
+
+    async def play(self) -> dict[int, int]:
+        """Play game and return scores."""
+        try:
+            await asyncio.gather(*(
+                seat.send({'type': 'start', 'player': player, 'players': len(self.seats)})
+                for player, seat in self.seats.items()
+            ))
+            while not self.game.is_finished:
+                await self.play_turn()
+            scores = self.game.scores
+            await self.broadcast({'type': 'end', 'scores': scores})
+            return scores
+        finally:
+            for seat in self.seats.values():
+                seat.close()
+
+    async def play_turn(self) -> dict[int, Move]:
+        """Play one dice roll and return applied moves per player."""
+        game = self.game
+        game.dice.roll()
+        players = game.deciding_players()
+        chosen = await asyncio.gather(*(
+            self.seats[p].choose(game, p, p == game.active_player) for p in players
+        ))
+        moves = dict(zip(players, chosen))
+        for player, move in moves.items():
+            game.check_move(move, player)
+
+        options = game.closing_options(moves)
+        decisions = await asyncio.gather(*(
+            self.seats[p].switch(game, p, move, closing) for p, (move, closing) in options.items()
+        ))
+        switched = frozenset(p for p, switch in zip(options, decisions) if switch)
+        for player in switched:
+            moves[player] = options[player][1]
+
+        game.finish_turn(moves, switched)
+        await self.broadcast({
+            'type': 'turn',
+            'moves': {p: move.code for p, move in moves.items()},
+            'switched': sorted(switched),
+            'boards': _boards(game),
+        })
+        return moves
+
+
+class GameServer:
+    """TCP server matching clients and hosting their games."""
+
+    def __init__(
+        self,
+        host: str = 'localhost',
+        port: int = DEFAULT_PORT,
+        timeout: float = DEFAULT_TIMEOUT,
+        executor: Executor | None = None,
+        seed: int | None = None,
+    ):
+        """Initialize server, bots run in a thread pool without executor."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.executor = executor or ThreadPoolExecutor()
+        self._random = random.Random(seed)
+        self._waiting: dict[tuple[int, tuple[str, ...]], list[RemoteSeat]] = {}
+        self._matches: set[asyncio.Task] = set()
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Start listening, port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and cancel running games."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._matches:
+            task.cancel()
+        await asyncio.gather(*self._matches, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+
+    @property
+    def matches(self) -> int:
+        """Number of running games."""
+        return len(self._matches)
+
+    def start_match(self, seats: Sequence[BotSeat | RemoteSeat]) -> asyncio.Task:
+        """Play a game of seats in the background."""
+        task = asyncio.create_task(Match(seats, self._random.getrandbits(63)).play())
+        self._matches.add(task)
+        task.add_done_callback(self._matches.discard)
+        return task
+
+    def bot(self, name: str) -> BotSeat:
+        """Seat of a named agent."""
+        return BotSeat(AGENTS[name](self._random.getrandbits(63)), self.executor)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection until its game ended."""
+        seat = RemoteSeat(reader, writer, self.timeout)
+        key = None
+        try:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    message = await seat.receive()
+            except TimeoutError:
+                message = None
+            if message is None:
+                return
+            try:
+                key = self._lineup(message)
+            except (KeyError, TypeError, ValueError) as error:
+                await seat.send({'type': 'error', 'message': str(error)})
+                return
+
+            waiting = self._waiting.setdefault(key, [])
+            waiting.append(seat)
+            players, bots = key
+            await seat.send({'type': 'waiting', 'players': players, 'bots': list(bots)})
+            if len(waiting) == players - len(bots):
+                del self._waiting[key]
+                for other in waiting:
+                    other.matched.set()
+                self.start_match([*waiting, *(self.bot(name) for name in bots)])
+            if await self._lobby(seat):
+                await seat.done.wait()
+        finally:
+            waiting = self._waiting.get(key, [])
+            if seat in waiting:
+                waiting.remove(seat)
+                if not waiting:
+                    del self._waiting[key]
+            writer.close()
+
+    @staticmethod
+    async def _lobby(seat: RemoteSeat) -> bool:
+        """Wait until seat is matched, False if its client disconnected before."""
+        matched = asyncio.create_task(seat.matched.wait())
+        try:
+            while not seat.matched.is_set():
+                received = asyncio.create_task(seat.receive())
+                await asyncio.wait({matched, received}, return_when=asyncio.FIRST_COMPLETED)
+                if not received.done():
+                    # the match reads from now on, so the read must have ended
+                    received.cancel()
+                    await asyncio.wait({received})
+                elif received.result() is None:
+                    return False
+                elif received.result():
+                    await seat.send({'type': 'error', 'message': 'game has not started'})
+            return True
+        finally:
+            matched.cancel()
+
+    @staticmethod
+    def _lineup(message: dict) -> tuple[int, tuple[str, ...]]:
+        """Players and bot names of a join message."""
+        if message.get('type') != 'join':
+            raise ValueError('expected join message')
+        players = message.get('players', MIN_PLAYER)
+        bots = tuple(message.get('bots', ()))
+        if not isinstance(players, int) or not MIN_PLAYER <= players <= MAX_PLAYER:
+            raise ValueError(f'players must be between {MIN_PLAYER} and {MAX_PLAYER}')
+        if len(bots) >= players:
+            raise ValueError('at least one seat must be left for clients')
+        unknown = [name for name in bots if name not in AGENTS]
+        if unknown:
+            raise ValueError(f'unknown agents {unknown}, choose from {sorted(AGENTS)}')
+        return players, bots
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Host Qwuixx games for TCP clients.')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-t', '--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds per answer')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='bot threads')
+    parser.add_argument('-s', '--seed', type=int, default=None)
+    options = parser.parse_args(args)
+
+    async def serve() -> None:
+        """Run server until interrupted."""
+        server = GameServer(
+            options.host,
+            options.port,
+            options.timeout,
+            ThreadPoolExecutor(options.workers),
+            options.seed,
+        )
+        await server.start()
+        print(f'serving on {server.host}:{server.port}')
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Expectimax solver for a single board.
+
+The value of a board is the expected score after a horizon of turns when every move is
+chosen to maximize it. The player is active every players-th turn and uses white and
+color dice, in all other turns only the white dice. Values are memoized in a value table
+keyed by packed board state, turns left and the turns until the player is active again.
+
+Values are stored once per set of equivalent boards, keyed by the canonical state with
+compact lanes (see symmetry), unless a custom leaf value may tell them apart.
+
+Given the white dice, the four color dice are independent, so the expected best move of
+an active turn is computed from the distribution of the best move per color die instead
+of enumerating all 6^6 rolls.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from itertools import product
+import mmap
+import os
+from pathlib import Path
+import struct
+
+from games_best_approach.games.qwixx.game import MIN_PLAYER, next_phase
+from games_best_approach.games.qwixx.model.dice import DIE_SIDES
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import COLORS, select_state, successors
+from games_best_approach.games.qwixx.model.state import SKIPS_SHIFT, BoardState
+from games_best_approach.games.qwixx.model.symmetry import canonical
+
+DEFAULT_HORIZON = 2
+
+_SKIP = 1 << SKIPS_SHIFT
+_PHASE_SHIFT = SKIPS_SHIFT + 3
+_TURNS_SHIFT = _PHASE_SHIFT + 2
+
+_WHITE_PAIRS = tuple(
+    ((w1, w2), (1 if w1 == w2 else 2) / DIE_SIDES ** 2)
+    for w1, w2 in product(range(1, DIE_SIDES + 1), repeat=2)
+    if w1 <= w2
+)
+"""Unordered white dice with probability."""
+
+_WHITE_SUMS = tuple(
+    (white, sum(p for (w1, w2), p in _WHITE_PAIRS if w1 + w2 == white))
+    for white in range(2, 2 * DIE_SIDES + 1)
+)
+"""White sum with probability."""
+
+_MAGIC = b'QWXV'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBBBQ')
+
+
+def score(state: int) -> float:
+    """Score of packed state as leaf value."""
+    return BoardState(state).score
+
+
+class ValueTable:
+    """
+    Memoized values by packed key, persistable to disk.
+
+    Saved tables hold keys and values as sorted arrays. A loaded table maps the file
+    read-only and finds keys by binary search, so it is read lazily and forked workers
+    share its pages. Values solved afterwards are kept in a dict besides the file.
+    """
+
+    def __init__(self, players: int = MIN_PLAYER, horizon: int = DEFAULT_HORIZON):
+        """Initialize empty value table."""
+        self.players = players
+        self.horizon = horizon
+        self._solved: dict[int, float] = {}
+        self._keys: Sequence[int] = ()
+        self._values: Sequence[float] = ()
+        self._map: mmap.mmap | None = None
+
+    @staticmethod
+    def key(state: int, turns: int, phase: int) -> int:
+        """Key of board state with turns left and turns until active."""
+        return state | phase << _PHASE_SHIFT | turns << _TURNS_SHIFT
+
+    def _index(self, key: int) -> int:
+        """Position of key in the saved keys, -1 if missing."""
+        keys = self._keys
+        i = bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else -1
+
+    def get(self, key: int, default: float | None = None) -> float | None:
+        """Value of key, default if missing."""
+        value = self._solved.get(key)
+        if value is None:
+            i = self._index(key)
+            return default if i < 0 else self._values[i]
+        return value
+
+    def __getitem__(self, key: int) -> float:
+        """Value of key."""
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: int, value: float) -> None:
+        """Store value of key solved after loading."""
+        self._solved[key] = value
+
+    def __contains__(self, key: int) -> bool:
+        """True if key has a value."""
+        return key in self._solved or self._index(key) >= 0
+
+    def __len__(self):
+        """Number of keys."""
+        return len(self._keys) + sum(self._index(key) < 0 for key in self._solved)
+
+    def items(self) -> Iterator[tuple[int, float]]:
+        """Keys with values, saved ones first."""
+        solved = self._solved
+        for key, value in zip(self._keys, self._values):
+            yield key, solved.get(key, value)
+        for key, value in solved.items():
+            if self._index(key) < 0:
+                yield key, value
+
+    def __eq__(self, other):
+        """Tables are equal with equal values by key."""
+        if not isinstance(other, ValueTable):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def save(self, path: str | Path) -> None:
+        """Save table as packed binary file, replacing a mapped file safely."""
+        items = sorted(self.items())
+        path = Path(path)
+        temporary = path.with_suffix(path.suffix + '.tmp')
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.players, self.horizon, len(items)))
+            array('Q', (key for key, _ in items)).tofile(file)
+            array('d', (value for _, value in items)).tofile(file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> ValueTable:
+        """Map table saved before read-only."""
+        with open(path, 'rb') as file:
+            table_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, players, horizon, size = _HEADER.unpack_from(table_map)
+        if magic != _MAGIC or version != _VERSION or len(table_map) != _HEADER.size + 16 * size:
+            table_map.close()
+            raise ValueError(f'{path} is no value table')
+
+        table = cls(players, horizon)
+        data = memoryview(table_map)[_HEADER.size:]
+        table._keys = data[:8 * size].cast('Q')
+        table._values = data[8 * size:16 * size].cast('d')
+        table._map = table_map
+        return table
+
+    def close(self) -> None:
+        """Unmap file of a loaded table, its values are no longer available."""
+        if self._map is not None:
+            self._keys.release()
+            self._values.release()
+            self._keys = self._values = ()
+            self._map.close()
+            self._map = None
+
+
+class Expectimax:
+    """Expectimax solver over the dice distribution for one board."""
+
+    def __init__(
+        self,
+        players: int = MIN_PLAYER,
+        horizon: int = DEFAULT_HORIZON,
+        table: ValueTable | None = None,
+        leaf: Callable[[int], float] = score,
+    ):
+        """Initialize solver, values of an existing table are reused."""
+        if table is None:
+            table = ValueTable(players, horizon)
+        if (table.players, table.horizon) != (players, horizon):
+            raise ValueError(
+                f'table is built for {table.players} players and horizon {table.horizon}'
+            )
+        self.players = players
+        self.horizon = horizon
+        self.table = table
+        self._leaf = leaf
+        self._canonical = leaf is score
+
+    def next_phase(self, phase: int) -> int:
+        """Turns until active after a turn."""
+        return next_phase(phase, self.players)
+
+    def value(self, state: int, turns: int | None = None, phase: int = 0) -> float:
+        """Expected score of state with turns left, active in phase turns."""
+        if turns is None:
+            turns = self.horizon
+        key = ValueTable.key(canonical(state, compact=True) if self._canonical else state, turns, phase)
+        value = self.table.get(key)
+        if value is None:
+            value = self._solve(state, turns, phase)
+            self.table[key] = value
+        return value
+
+    def _solve(self, state: int, turns: int, phase: int) -> float:
+        """Compute value of state."""
+        if turns == 0 or BoardState(state).is_terminal:
+            return self._leaf(state)
+
+        next_phase = self.next_phase(phase)
+        if phase:
+            return self._passive(state, turns - 1, next_phase)
+        return self._active(state, turns - 1, next_phase)
+
+    def _passive(self, state: int, turns: int, phase: int) -> float:
+        """Expected value of a turn using white dice only."""
+        stay = self.value(state, turns, phase)
+        expected = 0.0
+        for white, probability in _WHITE_SUMS:
+            best = stay
+            for i in range(len(COLORS)):
+                new_state = select_state(state, i, white)
+                if new_state >= 0:
+                    best = max(best, self.value(new_state, turns, phase))
+            expected += probability * best
+        return expected
+
+    def _active(self, state: int, turns: int, phase: int) -> float:
+        """Expected value of a turn using white and color dice."""
+        value = self.value
+        skip = value(state + _SKIP, turns, phase)
+        expected = 0.0
+        for (w1, w2), probability in _WHITE_PAIRS:
+            white = w1 + w2
+            white_states = [state]
+            best_white = skip
+            for i in range(len(COLORS)):
+                new_state = select_state(state, i, white)
+                if new_state >= 0:
+                    white_states.append(new_state)
+                    best_white = max(best_white, value(new_state, turns, phase))
+
+            per_color = []
+            for i in range(len(COLORS)):
+                best_per_die = []
+                for die in range(1, DIE_SIDES + 1):
+                    best = best_white
+                    for number in {w1 + die, w2 + die}:
+                        for white_state in white_states:
+                            new_state = select_state(white_state, i, number)
+                            if new_state >= 0:
+                                best = max(best, value(new_state, turns, phase))
+                    best_per_die.append(best)
+                per_color.append(best_per_die)
+
+            expected += probability * _expected_max(per_color)
+        return expected
+
+    def successors(self, state: int, roll: int, active: bool) -> list[tuple[Move, int]]:
+        """Legal moves with resulting states, a skip of the active player counts as miss."""
+        moves = successors(state, roll, active)
+        if active:
+            moves[0] = (SKIP, state + _SKIP)
+        return moves
+
+    def best_move(self, state: int, roll: int, phase: int = 0) -> Move:
+        """Move maximizing expected score for roll, active if phase is 0."""
+        turns = self.horizon - 1
+        next_phase = self.next_phase(phase)
+        return max(
+            self.successors(state, roll, not phase),
+            key=lambda move_state: self.value(move_state[1], turns, next_phase),
+        )[0]
+
+
+def _expected_max(per_die: list[list[float]]) -> float:
+    """Expected maximum of independent dice, given the value per die side."""
+    sides = len(per_die[0])
+    expected = 0.0
+    previous = 0.0
+    for threshold in sorted({v for values in per_die for v in values}):
+        probability = 1.0
+        for values in per_die:
+            probability *= sum(v <= threshold for v in values) / sides
+        expected += threshold * (probability - previous)
+        previous = probability
+    return expected
@@ -0,0 +1,358 @@
+"""
+Monte Carlo tree search over the joint boards of a game.
+
+Decision nodes hold the joint boards and a known roll, their children are the own moves
+of the searching player, selected by UCT. Opponents act on the same roll with the
+rollout policy. After a move a chance node samples the next roll and keeps one decision
+node per roll class: rolls with the same white sum and color sums per lane allow the
+same moves. With progressive widening a chance node samples a new roll only while it has
+fewer than visits ** widening children, otherwise it revisits a sampled roll in
+proportion to its visits, so the tree grows deeper than the moves of the root.
+Rollouts play the policy for all players until the game ends or the rollout depth is
+reached, where the heuristic margin is squashed into a reward. Rewards are 1 for a win,
+0.5 for a tie and 0 for a loss.
+
+The subtree of the class of the actually rolled dice is reused for the next decision.
+With more than one worker independent trees are searched in a process pool, created on
+the first parallel search and kept until close, and their root statistics merged.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.move_generator import ROLL_COLORS, ROLL_WHITE, ROLLS, successors
+from games_best_approach.games.qwixx.model.state import SKIPS_SHIFT
+from games_best_approach.games.qwixx.solver.multiplayer import _score, board_value, is_over
+
+DEFAULT_EXPLORATION = math.sqrt(2)
+DEFAULT_ROLLOUT_DEPTH = 8
+DEFAULT_WIDENING = 0.5
+"""Exponent of the visits of a chance node bounding its number of sampled roll classes."""
+DEFAULT_TIME_BUDGET = 0.05
+"""Seconds per decision if no iterations are given."""
+
+MARGIN_SCALE = 10.0
+"""Heuristic margin giving a reward of about 0.88 at the rollout depth."""
+
+_SKIP = 1 << SKIPS_SHIFT
+
+RolloutPolicy = Callable[[int, int, bool, random.Random], int]
+"""Packed board, roll, active and random source to packed board after the move."""
+
+
+def greedy_policy(state: int, roll: int, active: bool, rand: random.Random) -> int:
+    """Board after the move with the best heuristic value."""
+    best_state = state + _SKIP if active else state
+    best = board_value(best_state)
+    for _, new_state in successors(state, roll, active)[1:]:
+        value = board_value(new_state)
+        if value > best:
+            best, best_state = value, new_state
+    return best_state
+
+
+def random_policy(state: int, roll: int, active: bool, rand: random.Random) -> int:
+    """Board after a random legal move."""
+    move, new_state = rand.choice(successors(state, roll, active))
+    return new_state + _SKIP if active and move.is_skip else new_state
+
+
+def roll_class(roll: int) -> tuple:
+    """Key of rolls with the same white sum and color sums, which allow the same moves."""
+    return ROLL_WHITE[roll], ROLL_COLORS[roll]
+
+
+def _reward(states: Sequence[int], player: int, final: bool) -> float:
+    """Reward of player, win probability from heuristic margin if not final."""
+    value = _score if final else board_value
+    own = value(states[player])
+    margin = own - max(value(s) for i, s in enumerate(states) if i != player)
+    if final:
+        return 1.0 if margin > 0 else 0.5 if margin == 0 else 0.0
+    return 0.5 + 0.5 * math.tanh(margin / MARGIN_SCALE)
+
+
+class _Chance:
+    """Own move with the joint boards after it, children by class of the next roll."""
+
+    __slots__ = ('move', 'states', 'active', 'visits', 'value', 'children')
+
+    def __init__(self, move: Move, states: tuple[int, ...], active: int):
+        self.move = move
+        self.states = states
+        self.active = active
+        self.visits = 0
+        self.value = 0.0
+        self.children: dict[tuple, _Decision] = {}
+
+
+class _Decision:
+    """Joint boards with rolled dice, children by own move."""
+
+    __slots__ = ('states', 'active', 'roll', 'visits', 'children', 'untried')
+
+    def __init__(self, states: tuple[int, ...], active: int, roll: int):
+        self.states = states
+        self.active = active
+        self.roll = roll
+        self.visits = 0
+        self.children: list[_Chance] = []
+        self.untried: list[_Chance] | None = None
+
+
+class MCTSStats:
+    """Statistics of the last search."""
+
+    def __init__(self, iterations: int = 0, nodes: int = 0, seconds: float = 0.0):
+        """Initialize stats."""
+        self.iterations = iterations
+        self.nodes = nodes
+        self.seconds = seconds
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Expanded nodes per second."""
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        """Representation of stats."""
+        return (
+            f'MCTSStats(iterations={self.iterations}, nodes={self.nodes}, '
+            f'seconds={self.seconds:.4f}, nodes_per_second={self.nodes_per_second:.0f})'
+        )
+
+
+class MCTS:
+    """UCT search for one player with chance nodes for the dice."""
+
+    def __init__(
+        self,
+        iterations: int | None = None,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        exploration: float = DEFAULT_EXPLORATION,
+        rollout_depth: int = DEFAULT_ROLLOUT_DEPTH,
+        policy: RolloutPolicy = greedy_policy,
+        workers: int = 1,
+        seed: int | None = None,
+        widening: float = DEFAULT_WIDENING,
+    ):
+        """Initialize search, iterations take precedence over the time budget."""
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.policy = policy
+        self.workers = workers
+        self.seed = seed
+        self.widening = widening
+        self._executor: ProcessPoolExecutor | None = None
+        self._random = random.Random(seed)
+        self._root: _Decision | None = None
+        self._chosen: _Chance | None = None
+        self.player = 0
+        self.stats = MCTSStats()
+
+    def _expand(self, node: _Decision) -> None:
+        """Create own move children, opponents move by policy on the same roll."""
+        others = list(node.states)
+        for i, state in enumerate(node.states):
+            if i != self.player:
+                others[i] = self.policy(state, node.roll, i == node.active, self._random)
+
+        next_active = (node.active + 1) % len(node.states)
+        active = node.active == self.player
+        children = []
+        for move, state in successors(node.states[self.player], node.roll, active):
+            others[self.player] = state + _SKIP if active and move.is_skip else state
+            children.append(_Chance(move, tuple(others), next_active))
+        self._random.shuffle(children)
+        node.untried = children
+        self.stats.nodes += 1
+
+    def _outcome(self, chance: _Chance) -> _Decision:
+        """Decision node after chance, a new roll is sampled while the children are few."""
+        children = chance.children
+        if len(children) <= chance.visits ** self.widening:
+            roll = self._random.randrange(ROLLS)
+            key = roll_class(roll)
+            node = children.get(key)
+            if node is None:
+                node = children[key] = _Decision(chance.states, chance.active, roll)
+            return node
+        nodes = list(children.values())
+        return self._random.choices(nodes, [n.visits for n in nodes])[0]
+
+    def _select(self, node: _Decision) -> _Chance:
+        """Child with the highest upper confidence bound."""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(
+            node.children,
+            key=lambda c: c.value / c.visits + exploration * math.sqrt(log_visits / c.visits),
+        )
+
+    def _rollout(self, states: tuple[int, ...], active: int) -> float:
+        """Play policy for all players from joint boards."""
+        states = list(states)
+        rand = self._random
+        for _ in range(self.rollout_depth):
+            if is_over(states):
+                return _reward(states, self.player, final=True)
+            roll = rand.randrange(ROLLS)
+            for i, state in enumerate(states):
+                states[i] = self.policy(state, roll, i == active, rand)
+            active = (active + 1) % len(states)
+        final = is_over(states)
+        return _reward(states, self.player, final)
+
+    def _iterate(self, root: _Decision) -> None:
+        """Run one selection, expansion, rollout and backpropagation."""
+        node = root
+        path: list[_Decision | _Chance] = [node]
+        while True:
+            if node.untried is None:
+                self._expand(node)
+            if node.untried:
+                chance = node.untried.pop()
+                node.children.append(chance)
+                path.append(chance)
+                if is_over(chance.states):
+                    reward = _reward(chance.states, self.player, final=True)
+                else:
+                    reward = self._rollout(chance.states, chance.active)
+                break
+
+            chance = self._select(node)
+            path.append(chance)
+            if is_over(chance.states):
+                reward = _reward(chance.states, self.player, final=True)
+                break
+
+            node = self._outcome(chance)
+            path.append(node)
+
+        for visited in path:
+            visited.visits += 1
+            if isinstance(visited, _Chance):
+                visited.value += reward
+
+    def _reuse(self, states: tuple[int, ...], active: int, roll: int) -> _Decision | None:
+        """Subtree of the last chosen move matching the actual boards and roll class."""
+        if self._chosen is None:
+            return None
+        node = self._chosen.children.get(roll_class(roll))
+        if node is not None and node.states == states and node.active == active:
+            return node
+        return None
+
+    def search(self, states: Sequence[int], player: int, active: int, roll: int) -> _Decision:
+        """Search tree for player and return its root."""
+        states = tuple(states)
+        if player != self.player:
+            self._chosen = None
+        self.player = player
+        root = self._reuse(states, active, roll) or _Decision(states, active, roll)
+        self._root = root
+
+        self.stats = MCTSStats()
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        while True:
+            self._iterate(root)
+            self.stats.iterations += 1
+            if self.iterations is not None:
+                if self.stats.iterations >= self.iterations:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+        self.stats.seconds = time.perf_counter() - start
+        return root
+
+    def root_statistics(
+        self, states: Sequence[int], player: int, active: int, roll: int
+    ) -> dict[int, tuple[int, float]]:
+        """Visits and value per root move code of a search."""
+        root = self.search(states, player, active, roll)
+        return {c.move.code: (c.visits, c.value) for c in root.children}
+
+    def best_move(self, states: Sequence[int], player: int, active: int, roll: int) -> Move:
+        """Most visited move of player for roll, players are positions in states."""
+        if self.workers > 1:
+            return self._parallel_best_move(states, player, active, roll)
+
+        root = self.search(states, player, active, roll)
+        self._chosen = max(root.children, key=lambda c: c.visits)
+        return self._chosen.move
+
+    def _parallel_best_move(
+        self, states: Sequence[int], player: int, active: int, roll: int
+    ) -> Move:
+        """Merge root statistics of independent trees searched in processes."""
+        seeds = [self._random.randrange(2 ** 32) for _ in range(self.workers)]
+        start = time.perf_counter()
+        visits: dict[int, int] = {}
+        stats = MCTSStats()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        futures = [
+            self._executor.submit(
+                _search_root, self._config(seed), tuple(states), player, active, roll
+            )
+            for seed in seeds
+        ]
+        for future in futures:
+            root_stats, worker_stats = future.result()
+            stats.iterations += worker_stats.iterations
+            stats.nodes += worker_stats.nodes
+            for code, (count, _) in root_stats.items():
+                visits[code] = visits.get(code, 0) + count
+        stats.seconds = time.perf_counter() - start
+        self.stats = stats
+        self._chosen = None
+        return Move.decode(max(visits, key=visits.get))
+
+    def _config(self, seed: int) -> dict:
+        """Arguments of a single process search with seed."""
+        return {
+            'iterations': self.iterations,
+            'time_budget': self.time_budget,
+            'exploration': self.exploration,
+            'rollout_depth': self.rollout_depth,
+            'policy': self.policy,
+            'seed': seed,
+            'widening': self.widening,
+        }
+
+    def close(self) -> None:
+        """Shut down the worker processes of parallel searches."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> MCTS:
+        """Search as context closing its workers on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Shut down the worker processes."""
+        self.close()
+
+    def __getstate__(self):
+        """State without the process pool, which can't be pickled."""
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+
+
+def _search_root(
+    config: dict, states: tuple[int, ...], player: int, active: int, roll: int
+) -> tuple[dict[int, tuple[int, float]], MCTSStats]:
+    """Search one tree in a worker process."""
+    search = MCTS(**config)
+    root_stats = search.root_statistics(states, player, active, roll)
+    return root_stats, search.stats
@@ -0,0 +1,220 @@
+"""
+Search over the joint state of all boards of a game.
+
+Every turn all players act on the same roll: the active player with white and color
+dice, the others with the white dice only. Opponents follow a fast greedy policy on
+their own board, so their crosses, closed lanes and skips end the game for everyone.
+The searching player maximizes the expected margin to the best opponent with sparse
+sampling expectimax: each chance node samples rolls, shared between sibling nodes of
+the same depth to compare moves on common dice.
+
+Searches are bounded by a node budget and a deadline, values are cached in a bounded
+transposition table. Values only hold for the rolls sampled for one decision, so the
+table is cleared at the start of each. The closing switch is not modelled by the search.
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+from games_best_approach.games.qwixx.model.board import GAME_END_LANES_CLOSED, _MAX_SKIPS, _SKIP_PENALTY
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, NUMBERS_MASK, TRIANGLE
+from games_best_approach.games.qwixx.model.move import Move
+from games_best_approach.games.qwixx.model.move_generator import ROLLS, successors
+from games_best_approach.games.qwixx.model.state import (
+    LANE_MASK,
+    LANE_SHIFTS,
+    SKIPS_SHIFT,
+    BoardState,
+    lane_masks,
+)
+
+DEFAULT_DEPTH = 1
+DEFAULT_SAMPLES = 8
+DEFAULT_ROOT_WIDTH = 4
+DEFAULT_BUDGET = 0.008
+"""Seconds per decision."""
+
+DEFAULT_MAX_NODES = 20_000
+DEFAULT_TABLE_SIZE = 200_000
+
+GAP_WEIGHT = 1.5
+"""Penalty per number left out in a lane."""
+
+_SKIP = 1 << SKIPS_SHIFT
+_CLOSED_BITS = sum(CLOSE_BIT << shift for shift in LANE_SHIFTS)
+
+
+def _lane_value(mask: int) -> float:
+    """Score of lane minus penalty for left out numbers."""
+    numbers = mask & NUMBERS_MASK
+    gaps = numbers.bit_length() - numbers.bit_count()
+    return TRIANGLE[mask.bit_count()] - GAP_WEIGHT * gaps
+
+
+LANE_VALUE = tuple(_lane_value(mask) for mask in range(LANE_MASK + 1))
+"""Heuristic value per lane mask."""
+
+
+def board_value(state: int) -> float:
+    """Heuristic value of a packed board, score with penalty for gaps."""
+    r, y, g, b = lane_masks(state)
+    return (
+        LANE_VALUE[r] + LANE_VALUE[y] + LANE_VALUE[g] + LANE_VALUE[b]
+        - (state >> SKIPS_SHIFT) * _SKIP_PENALTY
+    )
+
+
+def _score(state: int) -> float:
+    """Score of a packed board."""
+    return BoardState(state).score
+
+
+def is_over(states: Sequence[int]) -> bool:
+    """Check if game of boards is finished."""
+    closed = 0
+    for state in states:
+        if state >> SKIPS_SHIFT >= _MAX_SKIPS:
+            return True
+        closed |= state & _CLOSED_BITS
+    return closed.bit_count() >= GAME_END_LANES_CLOSED
+
+
+class TranspositionTable(OrderedDict[tuple, float]):
+    """Least recently used cache of search values with bounded size."""
+
+    def __init__(self, size: int = DEFAULT_TABLE_SIZE):
+        """Initialize empty table."""
+        super().__init__()
+        self.size = size
+
+    def lookup(self, key: tuple) -> float | None:
+        """Value of key, marked as recently used."""
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key: tuple, value: float) -> None:
+        """Store value and evict least recently used keys."""
+        self[key] = value
+        if len(self) > self.size:
+            self.popitem(last=False)
+
+
+class MultiplayerSearch:
+    """Expectimax over the joint boards of a game with budget per decision."""
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_DEPTH,
+        samples: int = DEFAULT_SAMPLES,
+        root_width: int = DEFAULT_ROOT_WIDTH,
+        budget: float = DEFAULT_BUDGET,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        table: TranspositionTable | None = None,
+        evaluate: Callable[[int], float] = board_value,
+        seed: int | None = None,
+    ):
+        """Initialize search."""
+        self.depth = depth
+        self.samples = samples
+        self.root_width = root_width
+        self.budget = budget
+        self.max_nodes = max_nodes
+        self.table = table if table is not None else TranspositionTable()
+        self.evaluate = evaluate
+        self._random = random.Random(seed)
+        self.nodes = 0
+        self._deadline = 0.0
+        self._rolls: list[list[int]] = []
+        self._policy: dict[tuple[int, int, bool], int] = {}
+
+    def _exhausted(self) -> bool:
+        """True if node budget or time is used up."""
+        return self.nodes >= self.max_nodes or time.perf_counter() >= self._deadline
+
+    def _margin(self, states: Sequence[int], player: int, final: bool) -> float:
+        """Value of own board minus best opponent."""
+        value = _score if final else self.evaluate
+        own = value(states[player])
+        return own - max(value(s) for i, s in enumerate(states) if i != player)
+
+    def _policy_move(self, state: int, roll: int, active: bool) -> int:
+        """Greedy state of an opponent after roll."""
+        key = (state, roll, active)
+        new_state = self._policy.get(key)
+        if new_state is None:
+            options = successors(state, roll, active)
+            if active:
+                options[0] = (options[0][0], state + _SKIP)
+            new_state = max(options, key=lambda o: self.evaluate(o[1]))[1]
+            self._policy[key] = new_state
+        return new_state
+
+    def _children(
+        self, states: tuple[int, ...], player: int, active: int, roll: int
+    ) -> list[tuple[Move, tuple[int, ...]]]:
+        """Joint states after own moves for roll, opponents play their policy."""
+        others = list(states)
+        for i, state in enumerate(states):
+            if i != player:
+                others[i] = self._policy_move(state, roll, i == active)
+
+        children = []
+        for move, state in successors(states[player], roll, player == active):
+            if move.is_skip and player == active:
+                state += _SKIP
+            others[player] = state
+            children.append((move, tuple(others)))
+        return children
+
+    def value(self, states: tuple[int, ...], player: int, active: int, depth: int) -> float:
+        """Expected margin of player in joint state with active player to roll."""
+        if is_over(states):
+            return self._margin(states, player, final=True)
+        if depth == 0 or self._exhausted():
+            return self._margin(states, player, final=False)
+
+        key = (states, player, active, depth)
+        value = self.table.lookup(key)
+        if value is not None:
+            return value
+
+        self.nodes += 1
+        next_active = (active + 1) % len(states)
+        rolls = self._rolls[depth - 1]
+        total = 0.0
+        for roll in rolls:
+            total += max(
+                self.value(child, player, next_active, depth - 1)
+                for _, child in self._children(states, player, active, roll)
+            )
+        value = total / len(rolls)
+        if not self._exhausted():
+            # values cut short by the budget are not reused
+            self.table.store(key, value)
+        return value
+
+    def best_move(self, states: Sequence[int], player: int, active: int, roll: int) -> Move:
+        """Best move of player for roll, players are positions in states."""
+        self.nodes = 0
+        self._deadline = time.perf_counter() + self.budget
+        self._rolls = [
+            [self._random.randrange(ROLLS) for _ in range(self.samples)]
+            for _ in range(self.depth)
+        ]
+        self._policy.clear()
+        self.table.clear()
+        states = tuple(states)
+        next_active = (active + 1) % len(states)
+
+        children = self._children(states, player, active, roll)
+        children.sort(key=lambda c: self._margin(c[1], player, final=False), reverse=True)
+        candidates = children[:self.root_width]
+        return max(
+            candidates,
+            key=lambda c: self.value(c[1], player, next_active, self.depth),
+        )[0]
@@ -0,0 +1,188 @@
+"""
+Endgame tablebase of exact board values.
+
+The endgame are the boards where every open lane has at most positions numbers left that
+can still be crossed. These boards only reach boards of the endgame again, so their
+values are solved exactly: the expected final score of the board played to the end of
+the game by its own skips or closed lanes, by expectimax without a horizon.
+
+Values only depend on the number of crosses and the last crossed position of each lane,
+not on which numbers before were crossed, so lanes are indexed by their compact lane.
+
+The tablebase file holds a header and a dense array of float32 values indexed by lane
+keys, skips and phase (turns until active), so probing a memory-mapped file is O(1).
+"""
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections.abc import Sequence
+from itertools import product
+from pathlib import Path
+
+from games_best_approach.games.qwixx.game import MIN_PLAYER, next_phase
+from games_best_approach.games.qwixx.model.board import _MAX_SKIPS
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, LAST_INDEX, MINIMAL_CLOSE_SELECTIONS
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import successors
+from games_best_approach.games.qwixx.model.state import SKIPS_SHIFT, BoardState, lane_masks, pack_lanes
+from games_best_approach.games.qwixx.model.symmetry import COMPACT_LANE
+from games_best_approach.games.qwixx.solver.expectimax import Expectimax, score
+
+DEFAULT_POSITIONS = 1
+"""Numbers left per open lane in the endgame."""
+
+MAGIC = b'QWXT'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBBxI')
+"""Magic, version, players, positions and number of lane keys."""
+
+_SKIP = 1 << SKIPS_SHIFT
+_SKIP_STATES = _MAX_SKIPS + 1
+
+
+def lane_keys(positions: int) -> list[int]:
+    """Canonical lane masks of the endgame in index order."""
+    keys = [
+        (1 << count - 1) - 1 | 1 << LAST_INDEX | CLOSE_BIT
+        for count in range(MINIMAL_CLOSE_SELECTIONS + 1, LAST_INDEX + 2)
+    ]
+    for left in range(min(positions, LAST_INDEX + 1) + 1):
+        last = LAST_INDEX - left
+        if last < 0:
+            keys.append(0)
+            continue
+        counts = range(1, (MINIMAL_CLOSE_SELECTIONS if left == 0 else last + 1) + 1)
+        keys += [(1 << count - 1) - 1 | 1 << last for count in counts]
+    return keys
+
+
+def lane_index(positions: int) -> array:
+    """Index of lane key by lane mask, -1 outside of the endgame."""
+    index = {key: i for i, key in enumerate(lane_keys(positions))}
+    return array('h', (index.get(lane, -1) for lane in COMPACT_LANE))
+
+
+class EndgameSolver(Expectimax):
+    """Expectimax until the end of the game."""
+
+    def __init__(self, players: int = MIN_PLAYER):
+        """Initialize solver without horizon, turns are ignored."""
+        super().__init__(players, horizon=0)
+
+    def _solve(self, state: int, turns: int, phase: int) -> float:
+        """Compute value of state until the end of the game."""
+        if BoardState(state).is_terminal:
+            return score(state)
+        next_phase = self.next_phase(phase)
+        if phase:
+            return self._passive(state, 0, next_phase)
+        return self._active(state, 0, next_phase)
+
+
+def generate(
+    path: str | Path,
+    players: int = MIN_PLAYER,
+    positions: int = DEFAULT_POSITIONS,
+) -> int:
+    """Solve all endgame boards and write the tablebase, returns number of values."""
+    solver = EndgameSolver(players)
+    values = array('f')
+    for r, y, g, b in product(lane_keys(positions), repeat=4):
+        for skips in range(_SKIP_STATES):
+            state = pack_lanes(r, y, g, b, skips)
+            values.extend(solver.value(state, phase=phase) for phase in range(players))
+
+    path = Path(path)
+    temporary = path.with_suffix(path.suffix + '.tmp')
+    with open(temporary, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, players, positions, len(lane_keys(positions))))
+        values.tofile(file)
+    os.replace(temporary, path)
+    return len(values)
+
+
+class Tablebase:
+    """Memory-mapped tablebase probed in constant time."""
+
+    def __init__(self, path: str | Path):
+        """Map tablebase file read-only."""
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, players, positions, keys = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is no tablebase file')
+        self.players = players
+        self.positions = positions
+        self._keys = keys
+        self._lanes = lane_index(positions)
+        self._values = memoryview(self._map)[_HEADER.size:].cast('f')
+
+    def close(self) -> None:
+        """Unmap file."""
+        self._values.release()
+        self._map.close()
+
+    def __enter__(self):
+        """Tablebase as context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Unmap file on exit."""
+        self.close()
+
+    def index(self, state: int, phase: int = 0) -> int:
+        """Position of state in the value array, -1 outside of the endgame."""
+        lanes = self._lanes
+        r, y, g, b = lane_masks(state)
+        r, y, g, b = lanes[r], lanes[y], lanes[g], lanes[b]
+        skips = state >> SKIPS_SHIFT
+        if r < 0 or y < 0 or g < 0 or b < 0 or skips >= _SKIP_STATES:
+            return -1
+        keys = self._keys
+        return ((((r * keys + y) * keys + g) * keys + b) * _SKIP_STATES + skips) * self.players + phase
+
+    def __contains__(self, state: int) -> bool:
+        """True if state is in the endgame."""
+        return self.index(state) >= 0
+
+    def value(self, state: int, phase: int = 0) -> float | None:
+        """Expected final score of state active in phase turns, None outside of the endgame."""
+        index = self.index(state, phase)
+        return None if index < 0 else self._values[index]
+
+    def best_move(self, state: int, roll: int, phase: int = 0) -> Move | None:
+        """Move of roll with the best value, None outside of the endgame."""
+        if self.index(state, phase) < 0:
+            return None
+        active = not phase
+        after = next_phase(phase, self.players)
+        moves = successors(state, roll, active)
+        if active:
+            moves[0] = (SKIP, state + _SKIP)
+        return max(moves, key=lambda move_state: self.value(move_state[1], after))[0]
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Generate an endgame tablebase.')
+    parser.add_argument('output', help='tablebase file to write')
+    parser.add_argument('-p', '--players', type=int, default=MIN_PLAYER)
+    parser.add_argument(
+        '--positions', type=int, default=DEFAULT_POSITIONS, help='numbers left per open lane'
+    )
+    options = parser.parse_args(args)
+
+    start = time.perf_counter()
+    count = generate(options.output, options.players, options.positions)
+    print(f'{count} values in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+"""
+Monte Carlo tournament between agents.
+
+Games are split into shards which are played in a process pool. Each game has its own
+seed sequence spawned from the tournament seed and the game number, with independent
+streams for the dice and every agent, so results do not depend on the number of workers.
+With common rolls, the default, the dice of a game do not depend on the lineup, so
+tournaments of different lineups with the same seed replay the same rolls and their
+difference has far less variance. Otherwise the lineup is part of the spawn key.
+
+Workers only send aggregated results back to the parent. The starting player rotates
+between games. Games can be recorded to one file per shard, with the lineup position
+plus one as agent code. With profile, the game loop of every shard is instrumented and
+the profiles are merged into the result.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from functools import cache
+from pathlib import Path
+
+from games_best_approach.games.qwixx.agents.player import Player
+from games_best_approach.games.qwixx.game import MAX_PLAYER, MIN_PLAYER, Qwuixx
+from games_best_approach.games.qwixx.instrumentation import Profile, instrument
+from games_best_approach.games.qwixx.records import GameRecord, RecordWriter
+from games_best_approach.games.qwixx.seeding import SeedSequence
+
+Z_95 = 1.959963984540054
+
+DEFAULT_SHARD_SIZE = 500
+
+
+def _random(seed: int) -> Player:
+    """Random agent."""
+    from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+    return RandomPlayer(seed)
+
+
+def _optimal(seed: int) -> Player:
+    """Expectimax agent, the seed is not used."""
+    from games_best_approach.games.qwixx.agents.optimal import OptimalPlayer
+    return OptimalPlayer()
+
+
+def _search(seed: int) -> Player:
+    """Multiplayer search agent."""
+    from games_best_approach.games.qwixx.agents.search import SearchPlayer
+    return SearchPlayer(seed=seed)
+
+
+def _mcts(seed: int) -> Player:
+    """Monte Carlo tree search agent."""
+    from games_best_approach.games.qwixx.agents.mcts import MCTSPlayer
+    return MCTSPlayer(seed=seed)
+
+
+def _heuristic(seed: int) -> Player:
+    """Heuristic agent, the seed is not used."""
+    from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer
+    return HeuristicPlayer()
+
+
+AGENTS: dict[str, Callable[[int], Player]] = {
+    'random': _random,
+    'optimal': _optimal,
+    'search': _search,
+    'mcts': _mcts,
+    'heuristic': _heuristic,
+}
+"""Agent factories by name, called with a seed, agent modules are imported on first use."""
+
+SHARED_AGENTS = frozenset({'optimal'})
+"""Agents without state of a game, one agent plays all their games of a tournament process."""
+
+
+@cache
+def _shared_agent(name: str) -> Player:
+    """
+    Agent reused by all games of this process.
+
+    Its memoized values hold for any game, so they stay warm instead of being solved
+    again every game. Tournament processes play one game at a time; agents of the
+    game server are never shared, as its bots run in threads.
+    """
+    return AGENTS[name](0)
+
+
+def _agent(name: str, seed: int) -> Player:
+    """Agent of name for a tournament game."""
+    return _shared_agent(name) if name in SHARED_AGENTS else AGENTS[name](seed)
+
+
+class Stats:
+    """Running mean and variance, mergeable between workers."""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        """Initialize stats."""
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: Stats) -> None:
+        """Merge stats of other values."""
+        count = self.count + other.count
+        if not count:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def confidence(self) -> tuple[float, float]:
+        """95% confidence interval of the mean."""
+        half = Z_95 * math.sqrt(self.variance / self.count) if self.count else math.inf
+        return self.mean - half, self.mean + half
+
+
+class TournamentResult:
+    """Aggregated results per lineup position."""
+
+    def __init__(self, lineup: Sequence[str]):
+        """Initialize empty result."""
+        self.lineup = list(lineup)
+        self.games = 0
+        self.wins = [0.0] * len(lineup)
+        self.scores = [Stats() for _ in lineup]
+        self.profile: Profile | None = None
+
+    def add_game(self, scores: Sequence[int]) -> None:
+        """Add scores of a game, ties share the win."""
+        self.games += 1
+        best = max(scores)
+        winners = [i for i, s in enumerate(scores) if s == best]
+        for i, score in enumerate(scores):
+            self.scores[i].add(score)
+            if i in winners:
+                self.wins[i] += 1 / len(winners)
+
+    def merge(self, other: TournamentResult) -> None:
+        """Merge result of another shard."""
+        if other.lineup != self.lineup:
+            raise ValueError('lineups of results differ')
+        self.games += other.games
+        for i, stats in enumerate(other.scores):
+            self.wins[i] += other.wins[i]
+            self.scores[i].merge(stats)
+        if other.profile is not None:
+            if self.profile is None:
+                self.profile = Profile()
+            self.profile.merge(other.profile)
+
+    def win_rate(self, index: int) -> float:
+        """Win rate of lineup position."""
+        return self.wins[index] / self.games if self.games else 0.0
+
+    def win_rate_confidence(self, index: int) -> tuple[float, float]:
+        """95% confidence interval of win rate."""
+        rate = self.win_rate(index)
+        half = Z_95 * math.sqrt(rate * (1 - rate) / self.games) if self.games else 1.0
+        return max(rate - half, 0.0), min(rate + half, 1.0)
+
+    def __str__(self):
+        """String variant of result."""
+        lines = [f'{self.games} games']
+        for i, name in enumerate(self.lineup):
+            low, high = self.win_rate_confidence(i)
+            stats = self.scores[i]
+            score_low, score_high = stats.confidence
+            lines.append(
+                f'{i + 1}. {name}: win rate {self.win_rate(i):.3f} [{low:.3f}, {high:.3f}]'
+                f', score {stats.mean:.2f} [{score_low:.2f}, {score_high:.2f}]'
+                f' sd {math.sqrt(stats.variance):.2f}'
+            )
+        return '\n'.join(lines)
+
+
+def game_sequence(seed: int, game: int, lineup: Sequence[str] | None = None) -> SeedSequence:
+    """Seed sequence of a game in tournament, shared by all lineups without lineup."""
+    return SeedSequence(seed, (game,) if lineup is None else (game, *lineup))
+
+
+def play_game(
+    lineup: Sequence[str],
+    seed: int,
+    game: int,
+    writer: RecordWriter | None = None,
+    common_rolls: bool = True,
+) -> list[int]:
+    """Play one game, record it with writer and return scores by lineup position."""
+    players = len(lineup)
+    rotation = game % players
+    order = [(i + rotation) % players for i in range(players)]
+    dice, *streams = game_sequence(seed, game, None if common_rolls else lineup).spawn(1 + players)
+    agents = [_agent(lineup[i], streams[i].seed) for i in order]
+    qwuixx = Qwuixx(players, agents, dice.seed)
+    scores = qwuixx.play()
+    if writer is not None:
+        writer.write(GameRecord.from_game(qwuixx, [i + 1 for i in order]))
+    result = [0] * players
+    for seat, index in enumerate(order, 1):
+        result[index] = scores[seat]
+    return result
+
+
+def shard_path(record: str | Path, start: int) -> Path:
+    """Record file of the shard starting with game start."""
+    return Path(record) / f'shard-{start:010d}.qwx'
+
+
+def play_shard(
+    lineup: Sequence[str],
+    seed: int,
+    start: int,
+    games: int,
+    record: str | Path | None = None,
+    profile: bool = False,
+    common_rolls: bool = True,
+) -> TournamentResult:
+    """Play games of a shard, recorded to a shard file in the record directory."""
+    result = TournamentResult(lineup)
+    with ExitStack() as stack:
+        writer = None
+        if record is not None:
+            writer = stack.enter_context(RecordWriter(shard_path(record, start)))
+        if profile:
+            result.profile = stack.enter_context(instrument())
+        for game in range(start, start + games):
+            result.add_game(play_game(lineup, seed, game, writer, common_rolls))
+    return result
+
+
+def _validate(lineup: Sequence[str]) -> None:
+    """Validate lineup of agent names."""
+    if not (MIN_PLAYER <= len(lineup) <= MAX_PLAYER):
+        raise ValueError(f'lineup must have between {MIN_PLAYER} and {MAX_PLAYER} agents')
+    unknown = [name for name in lineup if name not in AGENTS]
+    if unknown:
+        raise ValueError(f'unknown agents: {unknown}')
+
+
+def iter_tournament(
+    lineup: Sequence[str],
+    games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    record: str | Path | None = None,
+    profile: bool = False,
+    common_rolls: bool = True,
+) -> Iterator[TournamentResult]:
+    """Play tournament and yield the aggregated result after every finished shard."""
+    _validate(lineup)
+    if record is not None:
+        Path(record).mkdir(parents=True, exist_ok=True)
+    shards = [
+        (start, min(shard_size, games - start))
+        for start in range(0, games, shard_size)
+    ]
+    result = TournamentResult(lineup)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for start, count in shards:
+            result.merge(play_shard(lineup, seed, start, count, record, profile, common_rolls))
+            yield result
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(play_shard, lineup, seed, start, count, record, profile, common_rolls)
+            for start, count in shards
+        ]
+        for future in as_completed(futures):
+            result.merge(future.result())
+            yield result
+
+
+def run_tournament(
+    lineup: Sequence[str],
+    games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    record: str | Path | None = None,
+    profile: bool = False,
+    common_rolls: bool = True,
+) -> TournamentResult:
+    """Play tournament and return the aggregated result."""
+    result = TournamentResult(lineup)
+    for result in iter_tournament(
+        lineup, games, seed, workers, shard_size, record, profile, common_rolls
+    ):
+        pass
+    return result
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Play a Qwuixx tournament between agents.')
+    parser.add_argument('agents', nargs='+', choices=sorted(AGENTS), help='lineup of agents')
+    parser.add_argument('-n', '--games', type=int, default=1000, help='number of games')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='tournament seed')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help='games per shard')
+    parser.add_argument('--record', help='directory to record games per shard')
+    parser.add_argument('--progress', action='store_true', help='print result after every shard')
+    parser.add_argument('--profile', help='file to save a profile, JSON for .json, else collapsed stacks')
+    parser.add_argument(
+        '--independent-rolls', action='store_true', help='roll other dice than other lineups with the same seed'
+    )
+    options = parser.parse_args(args)
+
+    result = TournamentResult(options.agents)
+    for result in iter_tournament(
+        options.agents,
+        options.games,
+        options.seed,
+        options.workers,
+        options.shard_size,
+        options.record,
+        options.profile is not None,
+        not options.independent_rolls,
+    ):
+        if options.progress:
+            print(result, end='\n\n')
+    if not options.progress:
+        print(result)
+    if result.profile is not None:
+        result.profile.save(options.profile)
+
+
+if __name__ == '__main__':
+    main()
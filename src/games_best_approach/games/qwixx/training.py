@@ -0,0 +1,209 @@
+"""
+Tuning of heuristic weights by self-play.
+
+A genetic algorithm evolves a population of weights of the heuristic agent. Candidates
+play against an opponent heuristic, the fitness is the average score margin. All
+candidates of a generation play the same game seeds in both seats (common random
+numbers), so differences in fitness come from the weights rather than the dice.
+
+Generations are evaluated in a process pool. Random numbers of a generation are derived
+from the run seed and the generation, so a run resumed from its checkpoint continues
+exactly like an uninterrupted run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer, Weights
+from games_best_approach.games.qwixx.game import Qwuixx
+
+DEFAULT_POPULATION = 16
+DEFAULT_GAMES = 40
+"""Game seeds per generation, each played in both seats."""
+
+DEFAULT_ELITE = 2
+"""Best candidates kept unchanged."""
+
+MUTATION = Weights(gap=0.5, skip=1.0, risk=0.5, close=2.0, progress=0.5)
+"""Standard deviation of mutations per weight."""
+
+MUTATION_RATE = 0.4
+"""Probability to mutate a weight."""
+
+
+def play_match(weights: Weights, opponent: Weights, seeds: Sequence[int]) -> float:
+    """Average score margin of weights against opponent over seeds in both seats."""
+    total = 0
+    candidate, other = HeuristicPlayer(weights), HeuristicPlayer(opponent)
+    for seed in seeds:
+        scores = Qwuixx(2, [candidate, other], seed).play()
+        total += scores[1] - scores[2]
+        scores = Qwuixx(2, [other, candidate], seed).play()
+        total += scores[2] - scores[1]
+    return total / (2 * len(seeds)) if seeds else 0.0
+
+
+def evaluate(
+    population: Sequence[Weights],
+    opponent: Weights,
+    seeds: Sequence[int],
+    executor: Executor | None = None,
+) -> list[float]:
+    """Fitness of every candidate on the same seeds."""
+    if executor is None:
+        return [play_match(weights, opponent, seeds) for weights in population]
+    futures = [executor.submit(play_match, weights, opponent, seeds) for weights in population]
+    return [future.result() for future in futures]
+
+
+def mutate(weights: Weights, rand: random.Random, rate: float = MUTATION_RATE) -> Weights:
+    """Weights with gaussian noise on some weights."""
+    return Weights(*(
+        w + rand.gauss(0, sigma) if rand.random() < rate else w
+        for w, sigma in zip(weights, MUTATION)
+    ))
+
+
+def crossover(first: Weights, second: Weights, rand: random.Random) -> Weights:
+    """Weights taken from either parent."""
+    return Weights(*(rand.choice(pair) for pair in zip(first, second)))
+
+
+def next_generation(
+    population: Sequence[Weights],
+    fitness: Sequence[float],
+    rand: random.Random,
+    elite: int = DEFAULT_ELITE,
+) -> list[Weights]:
+    """Elite of population and offspring of tournament selected parents."""
+    ranked = [w for _, w in sorted(zip(fitness, population), key=lambda x: x[0], reverse=True)]
+
+    def select() -> Weights:
+        """Better of two random candidates."""
+        return ranked[min(rand.randrange(len(ranked)), rand.randrange(len(ranked)))]
+
+    offspring = ranked[:elite]
+    while len(offspring) < len(population):
+        offspring.append(mutate(crossover(select(), select(), rand), rand))
+    return offspring
+
+
+class TrainingState:
+    """Progress of a training run, saved as checkpoint."""
+
+    def __init__(self, seed: int, population: Sequence[Weights]):
+        """Initialize state of a new run."""
+        self.seed = seed
+        self.generation = 0
+        self.population = list(population)
+        self.best = population[0]
+        self.best_fitness = float('-inf')
+        self.history: list[float] = []
+
+    @classmethod
+    def initial(cls, seed: int, size: int) -> TrainingState:
+        """Default weights and mutations of them."""
+        rand = random.Random(seed)
+        population = [Weights()]
+        population += [mutate(Weights(), rand, rate=1.0) for _ in range(size - 1)]
+        return cls(seed, population)
+
+    def save(self, path: str | Path) -> None:
+        """Save state as JSON, replacing the file atomically."""
+        data = {
+            'seed': self.seed,
+            'generation': self.generation,
+            'population': [w._asdict() for w in self.population],
+            'best': self.best._asdict(),
+            'best_fitness': self.best_fitness,
+            'history': self.history,
+        }
+        path = Path(path)
+        temporary = path.with_suffix(path.suffix + '.tmp')
+        temporary.write_text(json.dumps(data, indent=2))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> TrainingState:
+        """Load state saved before."""
+        data = json.loads(Path(path).read_text())
+        state = cls(data['seed'], [Weights(**w) for w in data['population']])
+        state.generation = data['generation']
+        state.best = Weights(**data['best'])
+        state.best_fitness = data['best_fitness']
+        state.history = data['history']
+        return state
+
+
+def train(
+    generations: int,
+    population: int = DEFAULT_POPULATION,
+    games: int = DEFAULT_GAMES,
+    seed: int = 0,
+    workers: int | None = None,
+    checkpoint: str | Path | None = None,
+    opponent: Weights | None = None,
+) -> TrainingState:
+    """Run or resume training until generations are evaluated."""
+    opponent = opponent or Weights()
+    if checkpoint is not None and Path(checkpoint).exists():
+        state = TrainingState.load(checkpoint)
+        if state.seed != seed:
+            raise ValueError(f'checkpoint was created with seed {state.seed}')
+    else:
+        state = TrainingState.initial(seed, population)
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        while state.generation < generations:
+            rand = random.Random(seed << 32 | state.generation)
+            seeds = [rand.getrandbits(63) for _ in range(games)]
+            fitness = evaluate(state.population, opponent, seeds, executor)
+
+            best = max(range(len(fitness)), key=fitness.__getitem__)
+            state.history.append(fitness[best])
+            if fitness[best] > state.best_fitness:
+                state.best, state.best_fitness = state.population[best], fitness[best]
+
+            state.population = next_generation(state.population, fitness, rand)
+            state.generation += 1
+            if checkpoint is not None:
+                state.save(checkpoint)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return state
+
+
+def main(args: Sequence[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description='Tune heuristic weights by self-play.')
+    parser.add_argument('-g', '--generations', type=int, default=20)
+    parser.add_argument('-p', '--population', type=int, default=DEFAULT_POPULATION)
+    parser.add_argument('-n', '--games', type=int, default=DEFAULT_GAMES, help='seeds per generation')
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes')
+    parser.add_argument('-c', '--checkpoint', help='checkpoint to save and resume from')
+    options = parser.parse_args(args)
+
+    state = train(
+        options.generations,
+        options.population,
+        options.games,
+        options.seed,
+        options.workers,
+        options.checkpoint,
+    )
+    print(f'generation {state.generation}: best margin {state.best_fitness:.2f}')
+    print(state.best)
+
+
+if __name__ == '__main__':
+    main()
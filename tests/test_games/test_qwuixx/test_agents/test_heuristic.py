@@ -0,0 +1,35 @@
+"""Test heuristic agent."""
+import random
+
+import pytest
+
+from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer, Weights
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.multiplayer import board_value
+
+
+def test_default_weights_match_board_value():
+    """Test default weights value boards like the search heuristic."""
+    player = HeuristicPlayer()
+    state = BoardState().select(Color.R, 4).select(Color.B, 9).skip()
+    assert player.value(state) == pytest.approx(board_value(state))
+
+
+def test_weights_change_value():
+    """Test weights for skips and crosses."""
+    player = HeuristicPlayer(Weights(risk=1.0, progress=2.0))
+    assert player.value(BoardState().skip().skip()) == -5 * 2 - 4
+    assert player.value(BoardState().select(Color.G, 12)) == 1 + 2
+
+
+def test_heuristic_player_beats_random():
+    """Test heuristic player wins against random players."""
+    random.seed(0)
+    wins = 0
+    for seed in range(10):
+        scores = Qwuixx(3, [HeuristicPlayer(), RandomPlayer(seed), RandomPlayer(seed + 1)]).play()
+        wins += scores[1] == max(scores.values())
+    assert wins >= 7
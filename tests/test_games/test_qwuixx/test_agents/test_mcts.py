@@ -0,0 +1,18 @@
+"""Test tree search agent."""
+import random
+
+from games_best_approach.games.qwixx.agents.mcts import MCTSPlayer
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.solver.mcts import MCTS
+
+
+def test_mcts_player_beats_random():
+    """Test tree search player wins against random players."""
+    random.seed(0)
+    wins = 0
+    for seed in range(6):
+        player = MCTSPlayer(MCTS(iterations=100, seed=seed))
+        scores = Qwuixx(3, [player, RandomPlayer(seed), RandomPlayer(seed + 1)]).play()
+        wins += scores[1] == max(scores.values())
+    assert wins >= 4
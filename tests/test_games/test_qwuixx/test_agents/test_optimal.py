@@ -0,0 +1,47 @@
+"""Test optimal agent."""
+import random
+
+import pytest
+
+from games_best_approach.games.qwixx.agents.optimal import OptimalPlayer
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+
+
+def test_optimal_player_beats_random():
+    """Test optimal player scores higher than random."""
+    random.seed(0)
+    optimal = OptimalPlayer(horizon=1)
+    total = 0
+    for seed in range(10):
+        scores = Qwuixx(2, [optimal, RandomPlayer(seed)]).play()
+        total += scores[1] - scores[2]
+    assert total > 0
+
+
+def test_optimal_player_keeps_solvers():
+    """Test games of other player counts keep the values of each count."""
+    random.seed(2)
+    optimal = OptimalPlayer(horizon=1)
+    Qwuixx(2, [optimal, RandomPlayer()]).play()
+    two = optimal.solvers[2]
+    Qwuixx(3, [optimal, RandomPlayer(), RandomPlayer()]).play()
+
+    assert optimal.solvers[2] is two
+    assert optimal.solvers[3].players == 3
+    assert optimal.solver is two
+
+
+def test_optimal_player_persists_table(tmp_path):
+    """Test value table is saved and loaded."""
+    random.seed(1)
+    path = tmp_path / 'values.bin'
+    optimal = OptimalPlayer(path=path, horizon=1)
+    Qwuixx(2, [optimal, RandomPlayer()]).play()
+    optimal.save()
+
+    loaded = OptimalPlayer(path=path)
+    assert loaded.solver.table == optimal.solver.table
+    assert loaded.horizon == 1
+    with pytest.raises(ValueError, match='horizon 1, not 2'):
+        OptimalPlayer(path=path, horizon=2)
@@ -0,0 +1,28 @@
+"""Test random agent."""
+import random
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.state import BoardState
+
+
+def test_random_player_legal():
+    """Test random player only chooses legal moves."""
+    random.seed(1)
+    game = Qwuixx(2, [RandomPlayer(1), RandomPlayer(2)])
+    agent = RandomPlayer(3)
+    for _ in range(20):
+        game.dice.roll()
+        for active in (True, False):
+            move = agent.choose(game, 1, active)
+            assert move in BoardState.from_board(game.boards[1]).legal_moves(game.dice, active)
+            assert active or move.color is None
+
+
+def test_random_player_seeded():
+    """Test same seed gives same game."""
+    scores = []
+    for _ in range(2):
+        random.seed(2)
+        scores.append(Qwuixx(2, [RandomPlayer(1), RandomPlayer(2)]).play())
+    assert scores[0] == scores[1]
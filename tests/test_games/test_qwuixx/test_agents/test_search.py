@@ -0,0 +1,16 @@
+"""Test search agent."""
+import random
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.agents.search import SearchPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+
+
+def test_search_player_beats_random():
+    """Test search player wins against random players."""
+    random.seed(0)
+    wins = 0
+    for seed in range(6):
+        scores = Qwuixx(3, [SearchPlayer(seed=seed), RandomPlayer(seed), RandomPlayer(seed + 1)]).play()
+        wins += scores[1] == max(scores.values())
+    assert wins >= 4
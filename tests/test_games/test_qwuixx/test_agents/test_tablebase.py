@@ -0,0 +1,56 @@
+"""Test tablebase agent."""
+import pytest
+
+from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer
+from games_best_approach.games.qwixx.agents.tablebase import TablebasePlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT, Color
+from games_best_approach.games.qwixx.solver.tablebase import Tablebase, generate
+
+
+class CountingPlayer(HeuristicPlayer):
+    """Heuristic player counting its decisions."""
+
+    def __init__(self):
+        """Initialize counter."""
+        super().__init__()
+        self.calls = 0
+
+    def choose(self, game, player, active):
+        """Count and choose."""
+        self.calls += 1
+        return super().choose(game, player, active)
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    """Tablebase of boards without numbers left."""
+    path = tmp_path_factory.mktemp('tablebase') / 'endgame.qwt'
+    generate(path, positions=0)
+    with Tablebase(path) as tablebase:
+        yield tablebase
+
+
+def test_tablebase_player_falls_back(tablebase):
+    """Test the fallback decides outside of the endgame."""
+    fallback = CountingPlayer()
+    scores = Qwuixx(2, [TablebasePlayer(tablebase, fallback), HeuristicPlayer()], 1).play()
+    assert set(scores) == {1, 2}
+    assert fallback.calls > 0
+
+
+def test_tablebase_player_in_endgame(tablebase):
+    """Test endgame moves are looked up without fallback."""
+    fallback = CountingPlayer()
+    game = Qwuixx(2, [TablebasePlayer(tablebase, fallback), HeuristicPlayer()], 2)
+    board = game.boards[1]
+    dead = 0b10000000011
+    board._load({color: dead for color in Color}, 0)
+    game.dice.roll()
+    move = game.agents[1].choose(game, 1, True)
+    assert move.is_skip
+    assert fallback.calls == 0
+
+    board._load({Color.R: 0b11111100000 | CLOSE_BIT, Color.Y: dead, Color.G: dead, Color.B: dead}, 1)
+    assert game.agents[1].choose(game, 1, True).is_skip
+    assert fallback.calls == 0
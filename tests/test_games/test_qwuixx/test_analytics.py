@@ -0,0 +1,96 @@
+"""Test replay and analytics of recorded games."""
+import pytest
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.analytics import (
+    Analytics,
+    analyze,
+    chunks,
+    final_boards,
+    main,
+    replay,
+)
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.records import GameRecord
+from games_best_approach.games.qwixx.tournament import run_tournament
+
+
+def test_replay_reconstructs_boards():
+    """Test replayed boards equal the boards of the game after every turn."""
+    game = Qwuixx(3, [RandomPlayer(seed) for seed in range(3)], 5)
+    game.play()
+    record = GameRecord.from_game(game)
+
+    turns = [turn for turn, _ in replay(record)]
+    boards = final_boards(record)
+
+    assert turns == game.history
+    for player, board in boards.items():
+        assert board.possible == game.boards[player].possible
+        assert board._skips == game.boards[player]._skips
+
+
+def test_final_boards_checks_scores():
+    """Test replay detects records with wrong scores."""
+    game = Qwuixx(2, [RandomPlayer(0), RandomPlayer(1)], 1)
+    game.play()
+    record = GameRecord.from_game(game)
+    record.scores[0] += 1
+    with pytest.raises(ValueError, match='replayed scores'):
+        final_boards(record)
+
+
+def test_final_boards_without_turns():
+    """Test a record without turns ends with fresh boards."""
+    boards = final_boards(GameRecord(1, 3, [], [0, 0, 0]))
+    assert list(boards) == [1, 2, 3]
+    assert all(board.score == 0 for board in boards.values())
+
+
+def test_analytics_of_records():
+    """Test statistics of single games."""
+    analytics = Analytics(['random'])
+    games = []
+    for seed in range(4):
+        game = Qwuixx(2, [RandomPlayer(seed), RandomPlayer(seed + 10)], seed)
+        game.play()
+        games.append(game)
+        analytics.add(GameRecord.from_game(game, [1, 1]))
+
+    assert analytics.games == 4
+    assert analytics.scores['random'].count == 8
+    assert analytics.win_rate('random') == pytest.approx(0.5)
+    assert sum(analytics.lengths.values()) == 4
+    assert analytics.mean_length == pytest.approx(sum(len(g.history) for g in games) / 4)
+    assert sum(analytics.skips.values()) == 8
+    closed = sum(len(b.closed_colors) for g in games for b in g.boards.values())
+    assert sum(analytics.closed[c] for c in Color) == closed
+
+
+def test_analyze_shards(tmp_path):
+    """Test analysis does not depend on chunks and workers."""
+    lineup = ['random', 'search']
+    result = run_tournament(lineup, 12, workers=1, shard_size=5, record=tmp_path)
+    paths = sorted(tmp_path.iterdir())
+
+    assert [count for _, _, count in chunks(paths, 2)] == [2, 2, 1, 2, 2, 1, 2]
+    single = analyze(paths, lineup, workers=1)
+    parallel = analyze(paths, lineup, workers=2, chunk_size=3)
+
+    assert single.games == parallel.games == 12
+    assert single.wins == pytest.approx(parallel.wins)
+    assert single.lengths == parallel.lengths
+    assert single.closed == parallel.closed
+    for i, name in enumerate(lineup):
+        assert single.scores[name].mean == pytest.approx(result.scores[i].mean)
+        assert single.win_rate(name) == pytest.approx(result.win_rate(i))
+
+
+def test_analytics_main(tmp_path, capsys):
+    """Test command line."""
+    run_tournament(['random', 'random'], 3, workers=1, record=tmp_path)
+    main([str(tmp_path), '-n', 'random', '-w', '1'])
+    out = capsys.readouterr().out
+    assert out.startswith('3 games')
+    assert 'random: score' in out
@@ -0,0 +1,33 @@
+"""Test benchmark runner."""
+from games_best_approach.games.qwixx.benchmark import BENCHMARKS, compare, load, main, run, save
+
+
+def test_benchmark_run():
+    """Test all benchmarks run."""
+    results = run(repeat=1, scale=0.001)
+    assert set(results) == set(BENCHMARKS)
+    assert all(r['ops_per_sec'] > 0 for r in results.values())
+
+
+def test_benchmark_compare():
+    """Test regressions above threshold are flagged."""
+    baseline = {'a': {'seconds_per_op': 1.0}, 'b': {'seconds_per_op': 1.0}}
+    results = {
+        'a': {'seconds_per_op': 1.05},
+        'b': {'seconds_per_op': 1.5},
+        'c': {'seconds_per_op': 9.0},
+    }
+    assert compare(results, baseline, threshold=0.1) == {'b': 1.5}
+
+
+def test_benchmark_main(tmp_path, capsys):
+    """Test results are saved and compared."""
+    path = tmp_path / 'baseline.json'
+    assert main(['lane_possible', '-r', '1', '--scale', '0.01', '-o', str(path)]) == 0
+    assert set(load(path)) == {'lane_possible'}
+
+    results = load(path)
+    results['lane_possible']['seconds_per_op'] /= 1000
+    save(results, path)
+    assert main(['lane_possible', '-r', '1', '--scale', '0.01', '-c', str(path)]) == 1
+    assert 'REGRESSION lane_possible' in capsys.readouterr().out
@@ -0,0 +1,162 @@
+"""Test headless game."""
+import random
+
+import pytest
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx, next_phase
+from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+
+
+class ScriptedPlayer:
+    """Player returning prepared moves."""
+
+    def __init__(self, moves: list[Move], switch: bool = False):
+        self.moves = moves
+        self.switched = []
+        self._switch = switch
+
+    def choose(self, game, player, active):
+        return self.moves.pop(0)
+
+    def switch(self, game, player, move, closing):
+        self.switched.append((move, closing))
+        return self._switch
+
+
+def roll(game: Qwuixx, w1: int, w2: int, r: int, y: int, g: int, b: int) -> None:
+    """Let next roll of game return fixed dice."""
+    class FixedDice(Dice):
+        __slots__ = ()
+
+        def roll(self):
+            self.w1, self.w2, self.r, self.y, self.g, self.b = w1, w2, r, y, g, b
+            self.white = w1 + w2
+            self.options = {
+                color: [w1 + die, w2 + die]
+                for color, die in zip((Color.R, Color.Y, Color.G, Color.B), (r, y, g, b))
+            }
+    game.dice = FixedDice()
+
+
+@pytest.mark.parametrize('player', [1, 5])
+def test_game_player_count(player: int):
+    """Test player count is validated."""
+    with pytest.raises(ValueError, match='player must be between 2 and 4'):
+        Qwuixx(player, [])
+
+
+def test_game_agent_count():
+    """Test agent count is validated."""
+    with pytest.raises(ValueError, match='expected 2 agents, got 1'):
+        Qwuixx(2, [RandomPlayer()])
+
+
+def test_game_turn():
+    """Test active player uses white and color, others white only."""
+    active = ScriptedPlayer([Move((Color.R, 5), (Color.R, 7))])
+    passive = ScriptedPlayer([Move((Color.G, 5))])
+    game = Qwuixx(2, [active, passive])
+    roll(game, 2, 3, 4, 1, 1, 1)
+
+    moves = game.play_turn()
+
+    assert moves == {1: Move((Color.R, 5), (Color.R, 7)), 2: Move((Color.G, 5))}
+    assert game.boards[1].possible[Color.R] == (12, 11, 10, 9, 8)
+    assert game.boards[2].possible[Color.G] == (2, 3, 4)
+    assert game.active_player == 2
+
+
+def test_game_active_skip():
+    """Test active player misses without selection, others don't."""
+    game = Qwuixx(2, [ScriptedPlayer([SKIP]), ScriptedPlayer([SKIP])])
+    roll(game, 1, 1, 1, 1, 1, 1)
+
+    game.play_turn()
+
+    assert game.boards[1]._skips == 1
+    assert game.boards[2]._skips == 0
+
+
+def test_game_invalid_move():
+    """Test invalid moves of agents are rejected."""
+    game = Qwuixx(2, [ScriptedPlayer([SKIP]), ScriptedPlayer([Move(None, (Color.R, 3))])])
+    roll(game, 1, 1, 1, 1, 1, 1)
+
+    with pytest.raises(ValueError, match='Invalid move of player 2'):
+        game.play_turn()
+
+
+def test_game_closing_switch():
+    """Test other players can switch to close lane with white dice."""
+    active = ScriptedPlayer([Move((Color.R, 12))])
+    passive = ScriptedPlayer([SKIP], switch=True)
+    game = Qwuixx(2, [active, passive])
+    for number in range(7, 12):
+        game.boards[1].select(Color.R, number)
+        game.boards[2].select(Color.R, number)
+    roll(game, 6, 6, 1, 1, 1, 1)
+
+    game.play_turn()
+
+    assert passive.switched == [(SKIP, Move((Color.R, 12)))]
+    assert game.boards[1].closed_colors == (Color.R,)
+    assert game.boards[2].closed_colors == (Color.R,)
+
+
+def test_next_phase():
+    """Test turns until active count down and restart after the active turn."""
+    assert [next_phase(phase, 3) for phase in range(3)] == [2, 0, 1]
+
+
+def test_game_turn_steps():
+    """Test a turn played in steps by a driver without agents."""
+    game = Qwuixx(2, ())
+    for number in range(7, 12):
+        game.boards[1].select(Color.R, number)
+        game.boards[2].select(Color.R, number)
+    roll(game, 6, 6, 1, 1, 1, 1)
+    game.dice.roll()
+
+    assert game.deciding_players() == [1, 2]
+    moves = {1: Move((Color.R, 12)), 2: SKIP}
+    for player, move in moves.items():
+        game.check_move(move, player)
+    with pytest.raises(ValueError, match='Invalid move of player 2'):
+        game.check_move(Move(None, (Color.R, 2)), 2)
+    options = game.closing_options(moves)
+    assert options == {2: (SKIP, Move((Color.R, 12)))}
+    game.finish_turn({**moves, 2: options[2][1]}, frozenset({2}))
+
+    assert game.boards[2].closed_colors == (Color.R,)
+    assert game.active_player == 2
+    assert game.history[-1].switched == {2}
+    with pytest.raises(ValueError, match='in steps'):
+        game.play_turn()
+
+
+def test_game_play_random():
+    """Test game with random agents ends."""
+    random.seed(0)
+    game = Qwuixx(4, [RandomPlayer(seed) for seed in range(4)])
+
+    scores = game.play()
+
+    assert scores == {p: b.score for p, b in game.boards.items()}
+    assert game.is_finished
+
+
+def test_game_seed_replays_rolls():
+    """Test a seed rolls the same dice for other agents without the global random state."""
+    random.seed(5)
+    state = random.getstate()
+    first = Qwuixx(2, [RandomPlayer(1), RandomPlayer(2)], 9)
+    first.play()
+    second = Qwuixx(3, [RandomPlayer(3), RandomPlayer(4), RandomPlayer(5)], 9)
+    second.play()
+    turns = min(len(first.history), len(second.history))
+
+    assert [t.roll for t in first.history[:turns]] == [t.roll for t in second.history[:turns]]
+    assert random.getstate() == state
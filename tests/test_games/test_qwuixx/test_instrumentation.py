@@ -0,0 +1,82 @@
+"""Test instrumentation of the game loop."""
+import json
+import pickle
+
+import pytest
+
+from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.instrumentation import Profile, instrument
+from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.tournament import play_shard
+
+
+def play() -> dict[int, int]:
+    """Play a game of heuristic agents."""
+    return Qwuixx(2, [HeuristicPlayer(), HeuristicPlayer()], 3).play()
+
+
+def test_instrument_records_phases():
+    """Test phases and agent decisions are recorded and scores are unchanged."""
+    expected = play()
+    originals = Qwuixx.play, Qwuixx._get_valid_move, Dice.roll, HeuristicPlayer.choose
+    with instrument() as profile:
+        assert play() == expected
+
+    assert (Qwuixx.play, Qwuixx._get_valid_move, Dice.roll, HeuristicPlayer.choose) == originals
+    turns = profile.spans[('game', 'turn')].count
+    assert profile.spans[('game',)].count == 1
+    assert profile.spans[('game', 'turn', 'roll')].count == turns
+    assert ('game', 'turn', 'active', 'agent.HeuristicPlayer.choose') in profile.spans
+    assert ('game', 'turn', 'passive') in profile.spans
+    assert sum(profile.counters.values()) == sum(
+        stats.count for stack, stats in profile.spans.items() if stack[-1] in ('active', 'passive')
+    )
+
+
+def test_instrument_not_nested():
+    """Test instrumentation can not be enabled twice."""
+    with instrument():
+        with pytest.raises(RuntimeError):
+            with instrument():
+                pass
+
+
+def test_profile_self_time_and_merge():
+    """Test self time excludes children and merged profiles add up."""
+    profile = Profile()
+    profile.record(('turn',), 100)
+    profile.record(('turn', 'roll'), 30)
+    profile.record(('turn', 'roll', 'x'), 10)
+    profile.count('moves.skip')
+    assert profile.self_time(('turn',)) == 70
+    assert profile.collapsed() == 'turn 70\nturn;roll 20\nturn;roll;x 10\n'
+
+    merged = pickle.loads(pickle.dumps(profile))
+    merged.merge(profile)
+    stats = merged.spans[('turn',)]
+    assert (stats.count, stats.total, stats.min, stats.max) == (2, 200, 100, 100)
+    assert stats.histogram == {(100).bit_length(): 2}
+    assert merged.counters == {'moves.skip': 2}
+
+
+def test_profile_save(tmp_path):
+    """Test export as JSON and collapsed stacks."""
+    profile = Profile()
+    profile.record(('game', 'turn'), 5)
+    profile.save(tmp_path / 'profile.json')
+    profile.save(tmp_path / 'profile.folded')
+
+    data = json.loads((tmp_path / 'profile.json').read_text())
+    assert data['spans']['game;turn']['count'] == 1
+    assert data['spans']['game;turn']['histogram'] == {'8': 1}
+    assert (tmp_path / 'profile.folded').read_text() == 'game;turn 5\n'
+
+
+def test_tournament_profile():
+    """Test shards return a profile only if requested."""
+    assert play_shard(['random', 'random'], 0, 0, 2).profile is None
+    result = play_shard(['random', 'random'], 0, 0, 2, profile=True)
+    assert result.profile.spans[('game',)].count == 2
+    result.merge(play_shard(['random', 'random'], 0, 2, 2, profile=True))
+    assert result.profile.spans[('game',)].count == 4
@@ -0,0 +1,146 @@
+"""Test batch of boards."""
+from random import Random
+
+import pytest
+
+from games_best_approach.games.qwixx.model.batch import LANES, BoardBatch, greedy_moves
+from games_best_approach.games.qwixx.model.dice import DiceRoller
+from games_best_approach.games.qwixx.model.move_generator import select_state, successors
+from games_best_approach.games.qwixx.model.state import BoardState
+
+SIZE = 64
+
+
+def random_states(seed: int, count: int = SIZE, turns: int = 30) -> list[int]:
+    """States reached by random legal moves."""
+    rand = Random(seed)
+    roller = DiceRoller(seed, use_numpy=False)
+    states = []
+    for _ in range(count):
+        state = BoardState()
+        for _ in range(rand.randrange(turns)):
+            batch, i = roller.next()
+            options = successors(state, batch.index[i], rand.random() < 0.5)
+            state = BoardState(rand.choice(options)[1])
+            if state.is_terminal:
+                break
+        states.append(state)
+    return states
+
+
+@pytest.fixture(params=[False, True], ids=['array', 'numpy'])
+def use_numpy(request) -> bool:
+    """Run with both backends."""
+    if request.param:
+        pytest.importorskip('numpy')
+    return request.param
+
+
+def test_batch_states(use_numpy: bool) -> None:
+    """Test states round trip through the batch."""
+    states = random_states(1)
+    batch = BoardBatch.from_states(states, use_numpy)
+    assert len(batch) == SIZE
+    assert batch.states() == states
+
+
+def test_batch_scores_and_terminal(use_numpy: bool) -> None:
+    """Test scores and terminal flags match single boards."""
+    states = random_states(2, turns=60)
+    batch = BoardBatch.from_states(states, use_numpy)
+    assert [int(s) for s in batch.scores()] == [BoardState(s).score for s in states]
+    assert [bool(t) for t in batch.is_terminal()] == [BoardState(s).is_terminal for s in states]
+
+
+def test_batch_legal_move_masks(use_numpy: bool) -> None:
+    """Test legal crosses match the move generator."""
+    states = random_states(3)
+    batch = BoardBatch.from_states(states, use_numpy)
+    dice = DiceRoller(3, use_numpy=use_numpy).batch(SIZE)
+    active = [i % 2 == 0 for i in range(SIZE)]
+    masks = batch.legal_move_masks(dice, active)
+    for i, state in enumerate(states):
+        white = int(dice.white[i])
+        expected = sum(1 << lane for lane in range(LANES) if select_state(state, lane, white) >= 0)
+        if active[i]:
+            sums = [int(s) for s in dice.sums(i)]
+            expected |= sum(
+                1 << LANES + k for k in range(2 * LANES) if select_state(state, k // 2, sums[k]) >= 0
+            )
+        assert int(masks[i]) == expected
+
+
+@pytest.mark.parametrize('active', [True, False])
+def test_batch_greedy_moves(use_numpy: bool, active: bool) -> None:
+    """Test greedy moves lead to legal successors and terminal boards are kept."""
+    states = random_states(4, turns=60)
+    batch = BoardBatch.from_states(states, use_numpy)
+    dice = DiceRoller(4, use_numpy=use_numpy).batch(SIZE)
+    batch.apply_moves(dice, greedy_moves(batch, dice, active, max_gap=2), active)
+    for i, (before, after) in enumerate(zip(states, batch.states())):
+        if BoardState(before).is_terminal:
+            assert after == before
+        else:
+            expected = [s for _, s in successors(before, int(dice.index[i]), active)]
+            if active:
+                expected[0] = BoardState(before).skip()
+            assert after in expected
+
+
+def test_batch_greedy_moves_skip() -> None:
+    """Test active boards skip without acceptable cross."""
+    batch = BoardBatch(2, use_numpy=False)
+    dice = DiceRoller(5, use_numpy=False).batch(2)
+    moves = greedy_moves(batch, dice, [True, False], max_gap=-1)
+    assert list(moves) == [0, 0]
+    batch.apply_moves(dice, moves, [True, False])
+    assert list(batch.skips) == [1, 0]
+    assert batch.states()[1] == 0
+
+
+def test_batch_apply_legal_moves(use_numpy: bool) -> None:
+    """Test moves chosen from the legal masks match single crosses of the move generator."""
+    states = random_states(7)
+    batch = BoardBatch.from_states(states, use_numpy)
+    dice = DiceRoller(7, use_numpy=use_numpy).batch(SIZE)
+    masks = batch.legal_move_masks(dice)
+    terminal = batch.is_terminal()
+    moves = [int(mask) & -int(mask) for mask in masks]
+    batch.apply_moves(dice, moves)
+    for i, (before, after) in enumerate(zip(states, batch.states())):
+        if terminal[i]:
+            assert after == before
+        elif not moves[i]:
+            assert after == BoardState(before).skip()
+        elif moves[i] < 1 << LANES:
+            lane = moves[i].bit_length() - 1
+            assert after == select_state(before, lane, int(dice.white[i]))
+        else:
+            k = moves[i].bit_length() - 1 - LANES
+            assert after == select_state(before, k // 2, int(dice.sums(i)[k]))
+
+
+def test_batch_apply_invalid_moves(use_numpy: bool) -> None:
+    """Test invalid moves raise without changing the boards."""
+    batch = BoardBatch(2, use_numpy)
+    dice = DiceRoller(8, use_numpy=use_numpy).batch(2)
+    for moves, active in [([0b11, 0], True), ([1 << LANES, 0], False), ([0b11 << LANES, 0], True)]:
+        with pytest.raises(ValueError):
+            batch.apply_moves(dice, moves, active)
+    batch[0] = select_state(0, 0, 11)
+    with pytest.raises(ValueError):
+        batch.apply_moves(dice, [1, 0])
+    assert batch.states() == [select_state(0, 0, 11), 0]
+    assert list(batch.skips) == [0, 0]
+
+
+def test_batch_numpy_matches_array() -> None:
+    """Test both backends choose and apply the same moves."""
+    pytest.importorskip('numpy')
+    states = random_states(6)
+    dice = DiceRoller(6, use_numpy=True).batch(SIZE)
+    expected = BoardBatch.from_states(states, use_numpy=False)
+    result = BoardBatch.from_states(states, use_numpy=True)
+    for batch in (expected, result):
+        batch.apply_moves(dice, greedy_moves(batch, dice, True))
+    assert result.states() == expected.states()
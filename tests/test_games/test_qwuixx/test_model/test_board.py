@@ -3,6 +3,7 @@ import pytest
 
 from games_best_approach.games.qwixx.model.board import Board
 from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import Move
 from tests.test_games.test_qwuixx.test_model.test_lane import ASC_LANE, DESC_LANE
 
 BOARD_STR = (
@@ -61,20 +62,20 @@ def test_board_select_number(board):
 def test_board_possible(board):
     """Test board model possible."""
     board.select(Color.R, 2)
-    assert board.possible[Color.R] == DESC_LANE[:-2]
-    assert board.possible[Color.Y] == DESC_LANE[:-1]
+    assert board.possible[Color.R] == tuple(DESC_LANE[:-2])
+    assert board.possible[Color.Y] == tuple(DESC_LANE[:-1])
 
     board.select(Color.B, 12)
-    assert board.possible[Color.B] == ASC_LANE[:-2]
-    assert board.possible[Color.G] == ASC_LANE[:-1]
+    assert board.possible[Color.B] == tuple(ASC_LANE[:-2])
+    assert board.possible[Color.G] == tuple(ASC_LANE[:-1])
 
     board.select(Color.R, 11)
-    assert board.possible[Color.R] == [12]
-    assert board.possible[Color.Y] == DESC_LANE[:-1]
+    assert board.possible[Color.R] == (12,)
+    assert board.possible[Color.Y] == tuple(DESC_LANE[:-1])
 
     board.select(Color.B, 3)
-    assert board.possible[Color.B] == [2]
-    assert board.possible[Color.G] == ASC_LANE[:-1]
+    assert board.possible[Color.B] == (2,)
+    assert board.possible[Color.G] == tuple(ASC_LANE[:-1])
 
 def test_board_str(board):
     """Test board model str."""
@@ -87,4 +88,132 @@ def test_board_str(board):
     board.select(Color.G, 3)
     board.select(Color.Y, 7)
 
-    assert str(board) == BOARD_WITH_SELECTIONS_STR
\ No newline at end of file
+    assert str(board) == BOARD_WITH_SELECTIONS_STR
+
+def test_board_incremental_state(board):
+    """Test score, closed and closable lanes are kept up to date."""
+    for number in (2, 3, 4, 5):
+        board.select(Color.R, number)
+    board.select(Color.G, 12)
+    board.skip()
+    assert board.score == 10 + 1 - 5
+    assert board.closable_colors == ()
+
+    board.select(Color.R, 6)
+    assert board.score == 15 + 1 - 5
+    assert board.closable_colors == (Color.R,)
+    assert board.closed_colors == ()
+
+    board.select(Color.R, 12)
+    assert board.score == 28 + 1 - 5
+    assert board.closable_colors == ()
+    assert board.closed_colors == (Color.R,)
+    assert board.score == sum(l.score for l in board._lanes.values()) - 5
+
+
+def test_board_push_pop(board):
+    """Test moves are undone and redone."""
+    board.select(Color.R, 4)
+    before = str(board), board.score
+    board.push([(Color.R, 6), (Color.R, 7)])
+    board.push(Move((Color.G, 9)))
+    board.push([], active=True)
+    assert board._skips == 1
+    assert board.score == 6 + 1 - 5
+
+    board.pop()
+    board.pop()
+    assert board._skips == 0
+    assert board.possible[Color.G] == tuple(DESC_LANE[:-1][::-1])
+    board.redo()
+    assert board.possible[Color.G] == tuple(ASC_LANE[:7])
+    board.pop()
+    board.pop()
+    assert (str(board), board.score) == before
+
+    with pytest.raises(IndexError, match='no move to undo'):
+        board.pop()
+    board.redo()
+    assert board.possible[Color.R] == (12, 11, 10, 9, 8)
+
+
+def test_board_push_not_possible(board):
+    """Test failed push keeps board unchanged."""
+    board.select(Color.B, 5)
+    with pytest.raises(ValueError, match=r'selection \[\(<Color.B: 4>, 4\), \(<Color.B: 4>, 6\)\] not possible'):
+        board.push([(Color.B, 4), (Color.B, 6)])
+    assert board.possible[Color.B] == (2, 3, 4)
+    assert board._undo == []
+
+
+def test_board_push_pop_closing(board):
+    """Test closing a lane is undone including derived state."""
+    for number in (7, 6, 5, 4, 3):
+        board.select(Color.G, number)
+    board.push([(Color.G, 2), (Color.R, 2)])
+    assert board.closed_colors == (Color.G,)
+    assert board.score == 28 + 1
+    board.pop()
+    assert board.closed_colors == ()
+    assert board.closable_colors == (Color.G,)
+    assert board.score == 15
+
+
+def test_board_trying(board):
+    """Test trying selections."""
+    with board.trying([(Color.Y, 5)]) as possible:
+        assert possible
+        assert board.possible[Color.Y] == (12, 11, 10, 9, 8, 7, 6)
+    assert board.possible[Color.Y] == tuple(DESC_LANE[:-1])
+
+    board.select(Color.Y, 5)
+    with board.trying([(Color.Y, 4)]) as possible:
+        assert not possible
+    assert board._undo == []
+
+
+def test_board_probes(board):
+    """Test probing selections without changing the board."""
+    for number in (2, 3, 4, 5, 6):
+        board.select(Color.R, number)
+    masks = {color: lane._mask for color, lane in board._lanes.items()}
+
+    assert board.is_select_possible([(Color.R, 7), (Color.R, 12)])
+    assert not board.is_select_possible([(Color.R, 12), (Color.R, 7)])
+    assert not board.is_select_possible([(Color.R, 13)])
+    assert board.would_close([(Color.R, 12)])
+    assert not board.would_close([(Color.R, 12), (Color.G, 12)])
+    assert not board.would_close([(Color.G, 2)])
+    assert not board.would_close([])
+    assert {color: lane._mask for color, lane in board._lanes.items()} == masks
+    assert board.closed_colors == ()
+
+
+def test_board_cached_views(board):
+    """Test views are shared until a lane changes and can't be modified."""
+    possible = board.possible
+    closed = board.closed_colors
+    assert board.possible is possible
+    board.skip()
+    assert board.possible is possible
+    with pytest.raises(TypeError):
+        possible[Color.R] = (2,)
+
+    assert board.is_select_possible([(Color.R, 2)])
+    assert board.would_close([(Color.R, 12)]) is False
+    with board.trying([(Color.R, 3)]):
+        assert board.possible[Color.R][-1] == 4
+    assert board.possible is possible
+
+    board.select(Color.R, 2)
+    assert board.possible is not possible
+    assert board.possible[Color.R] == tuple(ASC_LANE[1:-1][::-1])
+    assert board.closed_colors is closed
+
+
+def test_board_slots(board):
+    """Test board and lanes have no instance dict."""
+    with pytest.raises(AttributeError):
+        board.foo = 1
+    with pytest.raises(AttributeError):
+        board._lanes[Color.R].foo = 1
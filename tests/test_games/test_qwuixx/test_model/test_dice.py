@@ -1,9 +1,10 @@
 """Test dice model."""
 import random
+from random import Random
 
 import pytest
 
-from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.model.dice import Dice, DiceRoller, roll_index
 from games_best_approach.games.qwixx.model.lane import Color
 
 @pytest.fixture
@@ -35,4 +36,50 @@ def test_dice_str(fixed_random) -> None:
         str(dice)
 
     dice.roll()
-    assert str(dice) == 'w1\tw2\tr\ty\tb\tg\n04\t04\t01\t03\t05\t04'
\ No newline at end of file
+    assert str(dice) == 'w1\tw2\tr\ty\tb\tg\n04\t04\t01\t03\t05\t04'
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+def test_dice_roller_batch(use_numpy: bool) -> None:
+    """Test batch sums and indices."""
+    if use_numpy:
+        pytest.importorskip('numpy')
+    batch = DiceRoller(1, use_numpy=use_numpy).batch(50)
+    assert len(batch) == 50
+    for i in range(len(batch)):
+        w1, w2, r, y, g, b = (int(d) for d in batch.roll(i))
+        assert all(1 <= d <= 6 for d in (w1, w2, r, y, g, b))
+        assert batch.white[i] == w1 + w2
+        assert [int(s) for s in batch.sums(i)] == [
+            w1 + r, w2 + r, w1 + y, w2 + y, w1 + g, w2 + g, w1 + b, w2 + b
+        ]
+        assert batch.index[i] == roll_index(w1, w2, r, y, g, b)
+
+
+def test_dice_roller_seeded() -> None:
+    """Test same seed gives same rolls independent of global random."""
+    first = DiceRoller(Random(7), batch_size=8)
+    random.seed(1)
+    second = DiceRoller(Random(7), batch_size=8)
+    assert [first.next()[0].roll(i).tolist() for i in range(8)] == [
+        second.next()[0].roll(i).tolist() for i in range(8)
+    ]
+
+
+def test_dice_roll_with_roller() -> None:
+    """Test dice rolled from roller."""
+    expected = DiceRoller(3, use_numpy=False).batch(8)
+    roller = DiceRoller(3, batch_size=4, use_numpy=False)
+    dice = Dice(roller)
+    for i in range(8):
+        dice.roll()
+        assert [dice.w1, dice.w2, dice.r, dice.y, dice.g, dice.b] == expected.roll(i).tolist()
+        assert dice.white == expected.white[i]
+        assert dice.options[Color.G] == [dice.w1 + dice.g, dice.w2 + dice.g]
+        assert dice.index == expected.index[i]
+
+
+def test_dice_options_not_shared() -> None:
+    """Test options are per dice instance."""
+    dice = Dice(DiceRoller(0, use_numpy=False))
+    dice.roll()
+    assert Dice().options == {}
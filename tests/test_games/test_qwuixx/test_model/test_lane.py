@@ -34,6 +34,8 @@ def test_color_direction_asc(color: Color, direction: Direction, asc: bool):
     """Test color enum."""
     assert color.direction == direction
     assert color.asc == asc
+    assert Color(color.value) is color
+    assert 'direction' in vars(color) and 'asc' in vars(color)
 
 @pytest.mark.parametrize(
     'lane, numbers, asc',
@@ -94,11 +96,11 @@ def test_lane_select():
 @pytest.mark.parametrize(
     'lane, possible',
     [
-        (Lane(Color.R).select(10), [12, 11]),
-        (Lane(Color.B).select(7), [2, 3, 4, 5, 6]),
+        (Lane(Color.R).select(10), (12, 11)),
+        (Lane(Color.B).select(7), (2, 3, 4, 5, 6)),
     ]
 )
-def test_lane_possible(lane: Lane, possible: list[int]):
+def test_lane_possible(lane: Lane, possible: tuple[int, ...]):
     """Test lane possible numbers."""
     assert lane.possible == possible
 
@@ -149,4 +151,42 @@ def test_lane_select_not_possible():
         ValueError,
         match=r'number 10 not in possible options: \[2\]'
     ):
-        Lane(Color.B).select(3).select(10)
\ No newline at end of file
+        Lane(Color.B).select(3).select(10)
+
+@pytest.mark.parametrize(
+    'lane, numbers, would_close',
+    [
+        (Lane(Color.R).select(8).select(9).select(10).select(11), [12], False),
+        (Lane(Color.R).select(7).select(8).select(9).select(10).select(11), [12], True),
+        (Lane(Color.R).select(7).select(8).select(9).select(10), [11, 12], True),
+        (Lane(Color.G).select(6).select(5).select(4).select(3), [2], False),
+        (Lane(Color.G).select(7).select(6).select(5).select(4).select(3), [2], True),
+        (Lane(Color.G).select(7).select(6).select(5).select(4).select(3).select(2), [2], False),
+    ]
+)
+def test_lane_would_close(lane: Lane, numbers: list[int], would_close: bool):
+    """Test lane would close."""
+    assert lane.would_close(numbers) == would_close
+
+
+@pytest.mark.parametrize(
+    'lane, score, is_closed',
+    [
+        (Lane(Color.R), 0, False),
+        (Lane(Color.R).select(2).select(12), 3, False),
+        (Lane(Color.B).select(12).select(11).select(10).select(9).select(8).select(2), 28, True),
+    ]
+)
+def test_lane_score(lane: Lane, score: int, is_closed: bool):
+    """Test lane score and closing bonus."""
+    assert lane.score == score
+    assert lane.is_closed == is_closed
+
+
+def test_lane_is_select_possible():
+    """Test lane is select possible without changing lane."""
+    lane = Lane(Color.Y).select(5)
+    assert lane.is_select_possible([6, 12])
+    assert not lane.is_select_possible([6, 4])
+    assert not lane.is_select_possible([13])
+    assert lane._lane == [2, 3, 4, None, 6, 7, 8, 9, 10, 11, 12, 13]
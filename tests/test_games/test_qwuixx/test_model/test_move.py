@@ -0,0 +1,29 @@
+"""Test move model."""
+import pytest
+
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import MOVE_CODES, MOVES, SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import legal_moves
+
+
+def test_move_codes_roundtrip():
+    """Test every move code decodes to an interned move with that code."""
+    assert len(MOVES) == MOVE_CODES == 45 * 45
+    assert SKIP.code == 0
+    for code in (0, 1, 45, 2024):
+        assert Move.decode(code).code == code
+    move = Move((Color.G, 12), (Color.B, 2))
+    assert Move.decode(move.code) == move
+    assert Move.decode(move.code) is Move.decode(move.code)
+
+
+def test_generated_moves_are_interned():
+    """Test the move generator shares moves of the decode table."""
+    for move in legal_moves(0, 12345):
+        assert move is Move.decode(move.code)
+
+
+def test_move_without_lane_number_has_no_code():
+    """Test numbers outside lanes can't be encoded."""
+    with pytest.raises(KeyError):
+        Move((Color.R, 13)).code
@@ -0,0 +1,91 @@
+"""Test legal move generator."""
+import random
+
+import pytest
+
+from games_best_approach.games.qwixx.model.dice import Dice, roll_index
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import (
+    ROLL_COLORS,
+    ROLL_WHITE,
+    ROLLS,
+    has_legal_move,
+    legal_moves,
+    successors,
+)
+from games_best_approach.games.qwixx.model.state import BoardState
+
+
+def brute_force_moves(state: BoardState, dice: Dice, active: bool) -> set[Move]:
+    """All legal moves by trying every selection."""
+    whites = [None] + [(c, dice.white) for c in Color]
+    colors = [None]
+    if active:
+        colors += [(c, n) for c, numbers in dice.options.items() for n in numbers]
+    return {
+        Move(white, color)
+        for white in whites
+        for color in colors
+        if state.is_select_possible(Move(white, color))
+    }
+
+
+def random_state(rand: random.Random) -> BoardState:
+    """Random reachable board state."""
+    state = BoardState()
+    for _ in range(rand.randint(0, 25)):
+        color = rand.choice(list(Color))
+        number = rand.randint(2, 12)
+        if state.is_select_possible([(color, number)]):
+            state = state.select(color, number)
+    return state
+
+
+@pytest.mark.parametrize(
+    'dice, index',
+    [
+        ((1, 1, 1, 1, 1, 1), 0),
+        ((1, 1, 1, 1, 1, 2), 1),
+        ((2, 1, 1, 1, 1, 1), 6 ** 5),
+        ((6, 6, 6, 6, 6, 6), ROLLS - 1),
+    ]
+)
+def test_roll_index(dice: tuple[int, ...], index: int):
+    """Test roll index."""
+    assert roll_index(*dice) == index
+
+
+def test_roll_tables():
+    """Test precomputed roll tables."""
+    assert len(ROLL_WHITE) == len(ROLL_COLORS) == 6 ** 6
+    index = roll_index(2, 5, 1, 3, 3, 6)
+    assert ROLL_WHITE[index] == 7
+    assert ROLL_COLORS[index] == ((3, 6), (5, 8), (5, 8), (8, 11))
+    assert ROLL_COLORS[roll_index(4, 4, 1, 2, 3, 4)][0] == (5,)
+
+
+def test_legal_moves_match_brute_force():
+    """Test generated moves are exactly the legal moves."""
+    rand = random.Random(0)
+    random.seed(0)
+    dice = Dice()
+    for _ in range(300):
+        state = random_state(rand)
+        dice.roll()
+        for active in (True, False):
+            moves = legal_moves(state, dice.index, active)
+            assert moves[0] == SKIP
+            assert len(moves) == len(set(moves))
+            assert set(moves) == brute_force_moves(state, dice, active)
+            assert has_legal_move(state, dice.index, active) == (len(moves) > 1)
+
+
+def test_successors_states():
+    """Test successor states are the applied moves."""
+    rand = random.Random(1)
+    for _ in range(100):
+        state = random_state(rand)
+        roll = rand.randrange(ROLLS)
+        for move, new_state in successors(state, roll):
+            assert new_state == (state if move.is_skip else state.apply(move))
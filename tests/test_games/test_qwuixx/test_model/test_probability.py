@@ -0,0 +1,62 @@
+"""Test exact probabilities."""
+from itertools import product
+
+import pytest
+
+from games_best_approach.games.qwixx.model.lane import Color, Lane
+from games_best_approach.games.qwixx.model.probability import (
+    ANY_SUM,
+    COLOR_SUM,
+    WHITE_SUM,
+    close_probability,
+    cross_probability,
+    number_cross_probability,
+    number_probability,
+)
+
+
+def test_sum_probabilities():
+    """Test probabilities of sums against enumerating the dice."""
+    assert sum(WHITE_SUM) == pytest.approx(1)
+    assert WHITE_SUM[7] == pytest.approx(6 / 36)
+    assert WHITE_SUM[2] == WHITE_SUM[12] == pytest.approx(1 / 36)
+    hits = sum(1 for w1, w2, r in product(range(1, 7), repeat=3) if 4 in (w1 + r, w2 + r))
+    assert COLOR_SUM[4] == pytest.approx(hits / 216)
+    for number in range(2, 13):
+        assert ANY_SUM[number] == pytest.approx(ANY_SUM[14 - number])
+        assert ANY_SUM[number] >= max(WHITE_SUM[number], COLOR_SUM[number])
+    assert number_probability(7, active=False) == WHITE_SUM[7]
+    assert number_probability(13) == 0
+
+
+def test_cross_probability():
+    """Test probability of any cross on a lane."""
+    assert cross_probability(0) == pytest.approx(1)
+    assert cross_probability(0, active=False) == pytest.approx(1)
+    lane = Lane(Color.R).select(11)
+    assert cross_probability(lane._mask, active=False) == pytest.approx(1 / 36)
+    assert cross_probability(lane._mask) == pytest.approx(ANY_SUM[12])
+    assert cross_probability(Lane(Color.G).select(2)._mask) == 0
+
+
+def test_number_cross_probability():
+    """Test probability of crossing a number depends on the lane state."""
+    lane = Lane(Color.B).select(9)
+    assert number_cross_probability(lane._mask, 8, asc=False) == ANY_SUM[8]
+    assert number_cross_probability(lane._mask, 10, asc=False) == 0
+    assert number_cross_probability(lane._mask, 9, asc=False, active=False) == 0
+
+
+def test_close_probability():
+    """Test probability to close a lane within turns."""
+    lane = Lane(Color.Y)
+    for number in range(2, 7):
+        lane.select(number)
+    assert close_probability(lane._mask, 0) == 0
+    assert close_probability(lane._mask, 1) == pytest.approx(ANY_SUM[12])
+    assert close_probability(lane._mask, 1, phase=1) == pytest.approx(WHITE_SUM[12])
+    missed = (1 - ANY_SUM[12]) * (1 - WHITE_SUM[12])
+    assert close_probability(lane._mask, 2) == pytest.approx(1 - missed)
+    assert close_probability(Lane(Color.Y).select(12)._mask, 10) == 0
+    assert 0 < close_probability(0, 10) < close_probability(0, 20) < 1
+    assert close_probability(0, 20, players=4) < close_probability(0, 20, players=2)
@@ -0,0 +1,114 @@
+"""Test packed board state."""
+import pytest
+
+from games_best_approach.games.qwixx.model.board import Board
+from games_best_approach.games.qwixx.model.dice import Dice
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.state import BoardState, lane_masks, pack_lanes
+
+
+@pytest.fixture
+def board() -> Board:
+    board = Board()
+    board.select(Color.R, 2)
+    board.select(Color.R, 5)
+    board.select(Color.B, 11)
+    board.skip()
+    return board
+
+
+@pytest.fixture
+def dice() -> Dice:
+    dice = Dice()
+    dice.w1, dice.w2, dice.r, dice.y, dice.g, dice.b = 1, 2, 3, 4, 5, 6
+    dice.white = 3
+    dice.options = {
+        Color.R: [4, 5],
+        Color.Y: [5, 6],
+        Color.G: [6, 7],
+        Color.B: [7, 8],
+    }
+    return dice
+
+
+def test_state_board_round_trip(board):
+    """Test packing and unpacking board."""
+    state = BoardState.from_board(board)
+    assert state.skips == 1
+    assert state.score == board.score
+    assert str(state.to_board()) == str(board)
+    assert BoardState.from_board(state.to_board()) == state
+
+
+def test_state_lane_masks(board):
+    """Test lane masks are unpacked and packed in order of Color."""
+    state = BoardState.from_board(board)
+    assert lane_masks(state) == tuple(state.lane(color) for color in Color)
+    assert lane_masks(state) == tuple(lane._mask for lane in board._lanes.values())
+    assert pack_lanes(*lane_masks(state), state.skips) == state
+
+
+def test_state_hashable(board):
+    """Test equal boards are equal keys."""
+    values = {BoardState.from_board(board): 1}
+    assert values[BoardState.from_board(board)] == 1
+    assert BoardState.from_board(Board()) == 0
+
+
+def test_state_immutable_select(board):
+    """Test select returns new state."""
+    state = BoardState.from_board(board)
+    selected = state.select(Color.Y, 7)
+    assert selected != state
+    assert selected.lane(Color.Y) == 1 << 5
+    assert state.lane(Color.Y) == 0
+
+    with pytest.raises(ValueError, match='number 3 not possible on lane R'):
+        state.select(Color.R, 3)
+
+
+def test_state_apply():
+    """Test apply move to state."""
+    state = BoardState()
+    assert state.apply(SKIP).skips == 1
+    assert state.apply(SKIP, active=False) == state
+    state = state.apply(Move((Color.G, 12), (Color.G, 10)))
+    assert state.to_board().possible[Color.G] == (2, 3, 4, 5, 6, 7, 8, 9)
+
+
+def test_state_terminal():
+    """Test terminal states."""
+    state = BoardState()
+    for _ in range(4):
+        assert not state.is_terminal
+        state = state.skip()
+    assert state.is_terminal
+    assert state.score == -20
+    with pytest.raises(RuntimeError, match='Too many skips'):
+        state.skip()
+
+    state = BoardState()
+    for color in (Color.R, Color.G):
+        for i in range(6):
+            number = 7 + i if color.asc else 7 - i
+            state = state.select(color, number)
+    assert state.closed_colors == [Color.R, Color.G]
+    assert state.is_terminal
+
+
+def test_state_legal_moves(board, dice):
+    """Test legal moves match board."""
+    state = BoardState.from_board(board)
+    moves = state.legal_moves(dice)
+    assert moves[0] == SKIP
+    assert Move((Color.Y, 3)) in moves
+    assert Move(None, (Color.R, 5)) not in moves
+    assert Move((Color.Y, 3), (Color.Y, 5)) in moves
+    assert len(set(moves)) == len(moves)
+    for move in moves[1:]:
+        assert board.is_select_possible(move.dice)
+
+    assert state.legal_moves(dice, active=False) == [
+        SKIP, Move((Color.Y, 3)), Move((Color.G, 3)), Move((Color.B, 3))
+    ]
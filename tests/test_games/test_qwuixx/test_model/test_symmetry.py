@@ -0,0 +1,48 @@
+"""Test board symmetries."""
+import pytest
+
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT
+from games_best_approach.games.qwixx.model.state import SKIPS_SHIFT, BoardState
+from games_best_approach.games.qwixx.model.symmetry import canonical, compact_lane
+
+CLOSED = 0b11111100000 | CLOSE_BIT
+
+
+def state(r: int, y: int, g: int, b: int, skips: int = 0) -> int:
+    """Packed state of lane masks."""
+    return r | y << 12 | g << 24 | b << 36 | skips << SKIPS_SHIFT
+
+
+def symmetric(r: int, y: int, g: int, b: int, skips: int = 0) -> list[int]:
+    """All states equivalent by lane order and direction."""
+    return [
+        state(*lanes, skips)
+        for lanes in ((r, y, g, b), (y, r, g, b), (r, y, b, g), (g, b, r, y), (b, g, y, r))
+    ]
+
+
+def test_compact_lane():
+    """Test crosses before the last cross are moved to the start."""
+    assert compact_lane(0b01000010101) == 0b01000000111
+    assert compact_lane(0) == 0
+    assert compact_lane(CLOSED) == 0b10000011111 | CLOSE_BIT
+    assert (
+        BoardState(compact_lane(0b01000010101)).score == BoardState(0b01000010101).score
+    )
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_canonical_symmetries(compact: bool):
+    """Test lanes of a direction and both directions are interchangeable."""
+    lanes = 0b101, 0b11, CLOSED, 0
+    expected = canonical(state(*lanes, 2), compact)
+    assert all(canonical(s, compact) == expected for s in symmetric(*lanes, 2))
+    assert canonical(state(*lanes, 3), compact) != expected
+    assert canonical(expected, compact) == expected
+
+
+def test_canonical_compact():
+    """Test compact lanes ignore which numbers before the last were crossed."""
+    assert canonical(state(0b1001, 0, 0, 0), compact=True) == canonical(state(0b1010, 0, 0, 0), compact=True)
+    assert canonical(state(0b1001, 0, 0, 0)) != canonical(state(0b1010, 0, 0, 0))
+
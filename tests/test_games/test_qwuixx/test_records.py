@@ -0,0 +1,83 @@
+"""Test binary game records."""
+import pytest
+
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.game import Qwuixx
+from games_best_approach.games.qwixx.model.dice import roll_index
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.records import (
+    GameRecord,
+    RecordReader,
+    RecordWriter,
+    decode_move,
+    encode_move,
+)
+
+
+def play(players: int, seed: int) -> Qwuixx:
+    """Played game with random agents."""
+    game = Qwuixx(players, [RandomPlayer(seed + i) for i in range(players)], seed)
+    game.play()
+    return game
+
+
+@pytest.mark.parametrize('move', [
+    None,
+    SKIP,
+    Move((Color.R, 5)),
+    Move((Color.R, 5), (Color.R, 6)),
+    Move(None, (Color.B, 7)),
+    Move((Color.G, 5), (Color.Y, 3)),
+])
+def test_move_encoding(move: Move | None):
+    """Test moves survive encoding with the roll."""
+    roll = roll_index(2, 3, 3, 1, 6, 4)
+    code = encode_move(move, roll)
+    assert 0 <= code < 256
+    assert decode_move(code, roll) == move
+
+
+def test_game_record_roundtrip():
+    """Test a packed record equals the game."""
+    game = play(3, 7)
+    record = GameRecord.from_game(game)
+    data = record.pack()
+
+    unpacked, offset = GameRecord.unpack_from(data)
+
+    assert offset == len(data) == 24 + 8 * len(game.history)
+    assert unpacked == record
+    assert unpacked.seed == 7
+    assert unpacked.scores == list(game.scores.values())
+    assert unpacked.skips == [board._skips for board in game.boards.values()]
+
+
+def test_writer_and_reader(tmp_path):
+    """Test games written in several sessions are read back lazily."""
+    path = tmp_path / 'games.qwx'
+    games = [play(2 + seed % 3, seed) for seed in range(10)]
+    with RecordWriter(path, buffer_size=64) as writer:
+        for game in games[:6]:
+            writer.write(game)
+    with RecordWriter(path) as writer:
+        for game in games[6:]:
+            writer.write(game)
+
+    with RecordReader(path) as reader:
+        records = list(reader)
+        offsets = list(reader.offsets())
+        assert reader.read(offsets[3]) == records[3]
+
+    assert records == [GameRecord.from_game(game) for game in games]
+
+
+def test_reader_rejects_other_files(tmp_path):
+    """Test reader validates the header."""
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a record file')
+    with pytest.raises(ValueError, match='is no game record file'):
+        RecordReader(path)
+    path.write_bytes(b'')
+    with pytest.raises(ValueError, match='is no game record file'):
+        RecordReader(path)
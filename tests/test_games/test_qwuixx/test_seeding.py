@@ -0,0 +1,26 @@
+"""Test seed sequences."""
+from games_best_approach.games.qwixx.seeding import SEED_BITS, SeedSequence
+
+
+def test_seed_is_deterministic():
+    """Test equal entropy and spawn key give equal seeds."""
+    assert SeedSequence(3, (1, 2)).seed == SeedSequence(3, (1, 2)).seed
+    assert SeedSequence(3).child(1, 2).seed == SeedSequence(3, (1, 2)).seed
+    assert 0 <= SeedSequence(3).seed < 1 << SEED_BITS
+    assert SeedSequence().entropy != SeedSequence().entropy
+
+
+def test_seeds_are_distinct():
+    """Test nearby entropy and keys give distinct seeds."""
+    seeds = {SeedSequence(entropy, (game,)).seed for entropy in range(20) for game in range(20)}
+    seeds |= {SeedSequence(entropy).seed for entropy in range(20)}
+    assert len(seeds) == 420
+
+
+def test_spawn_continues():
+    """Test spawned children are not repeated and do not depend on batching."""
+    sequence = SeedSequence(7)
+    first = sequence.spawn(2) + sequence.spawn(3)
+    assert [child.seed for child in first] == [child.seed for child in SeedSequence(7).spawn(5)]
+    assert first[4].spawn_key == (4,)
+    assert sequence.random().random() == SeedSequence(7).random().random()
@@ -0,0 +1,169 @@
+"""Test asyncio game server."""
+import asyncio
+import json
+
+from games_best_approach.games.qwixx.agents.heuristic import HeuristicPlayer
+from games_best_approach.games.qwixx.agents.randomized import RandomPlayer
+from games_best_approach.games.qwixx.server import BotSeat, GameServer, Match
+
+
+async def send(writer: asyncio.StreamWriter, message: dict) -> None:
+    """Send one message."""
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+async def receive(reader: asyncio.StreamReader) -> dict:
+    """Receive one message."""
+    return json.loads(await reader.readline())
+
+
+async def play_client(port: int, join: dict, answer: bool = True) -> list[dict]:
+    """Play with the last legal move and without switching, returns received messages."""
+    reader, writer = await asyncio.open_connection('localhost', port)
+    await send(writer, join)
+    messages = []
+    while True:
+        message = await receive(reader)
+        messages.append(message)
+        if message['type'] in ('end', 'error'):
+            break
+        if not answer:
+            continue
+        if message['type'] == 'choose':
+            await send(writer, {'id': message['id'], 'move': message['moves'][-1]})
+        elif message['type'] == 'switch':
+            await send(writer, {'id': message['id'], 'switch': False})
+    writer.close()
+    return messages
+
+
+async def serve(timeout: float = 5.0) -> GameServer:
+    """Started server on a free port."""
+    server = GameServer(port=0, timeout=timeout, seed=1)
+    await server.start()
+    return server
+
+
+def test_match_of_bots():
+    """Test a match of bots plays to the end."""
+
+    async def run():
+        match = Match([BotSeat(HeuristicPlayer()), BotSeat(RandomPlayer(1))], seed=2)
+        return match, await match.play()
+
+    match, scores = asyncio.run(run())
+    assert scores == match.game.scores
+    assert match.game.is_finished
+    assert match.game.history
+
+
+def test_client_against_bot():
+    """Test a client plays a game against a bot."""
+
+    async def run():
+        server = await serve()
+        try:
+            return await play_client(server.port, {'type': 'join', 'players': 2, 'bots': ['heuristic']})
+        finally:
+            await server.close()
+
+    messages = asyncio.run(run())
+    types = [m['type'] for m in messages]
+    assert types[:2] == ['waiting', 'start']
+    assert 'choose' in types and 'turn' in types
+    assert messages[-1]['type'] == 'end'
+    assert set(messages[-1]['scores']) == {'1', '2'}
+
+
+def test_clients_are_matched():
+    """Test two clients joining the same lineup play one game."""
+
+    async def run():
+        server = await serve()
+        try:
+            join = {'type': 'join', 'players': 2}
+            return await asyncio.gather(play_client(server.port, join), play_client(server.port, join))
+        finally:
+            await server.close()
+
+    first, second = asyncio.run(run())
+    assert first[-1] == second[-1]
+    assert {first[1]['player'], second[1]['player']} == {1, 2}
+
+
+def test_disconnect_leaves_lobby():
+    """Test a client disconnecting before its game started is not matched."""
+
+    async def run():
+        server = await serve()
+        try:
+            join = {'type': 'join', 'players': 2}
+            reader, writer = await asyncio.open_connection('localhost', server.port)
+            await send(writer, join)
+            await receive(reader)
+            writer.close()
+            while server._waiting:
+                await asyncio.sleep(0.01)
+            return await asyncio.gather(play_client(server.port, join), play_client(server.port, join))
+        finally:
+            await server.close()
+
+    first, second = asyncio.run(asyncio.wait_for(run(), 10))
+    assert first[-1]['type'] == second[-1]['type'] == 'end'
+    assert {first[1]['player'], second[1]['player']} == {1, 2}
+
+
+def test_timeout_skips():
+    """Test a silent client skips until the game ends."""
+
+    async def run():
+        server = await serve(timeout=0.01)
+        try:
+            join = {'type': 'join', 'players': 2, 'bots': ['random']}
+            return await play_client(server.port, join, answer=False)
+        finally:
+            await server.close()
+
+    messages = asyncio.run(run())
+    assert any(m['type'] == 'timeout' for m in messages)
+    assert messages[-1]['type'] == 'end'
+
+
+def test_invalid_move_is_rejected():
+    """Test an illegal move is answered with an error and can be retried."""
+
+    async def run():
+        server = await serve()
+        try:
+            reader, writer = await asyncio.open_connection('localhost', server.port)
+            await send(writer, {'type': 'join', 'players': 2, 'bots': ['random']})
+            while (message := await receive(reader))['type'] != 'choose':
+                pass
+            await send(writer, {'id': message['id'], 'move': -1})
+            error = await receive(reader)
+            await send(writer, {'id': message['id'], 'move': message['moves'][0]})
+            turn = await receive(reader)
+            writer.close()
+            return error, turn
+        finally:
+            await server.close()
+
+    error, turn = asyncio.run(run())
+    assert error['type'] == 'error'
+    assert turn['type'] in ('turn', 'switch')
+
+
+def test_invalid_join():
+    """Test an invalid lineup is rejected."""
+
+    async def run():
+        server = await serve()
+        try:
+            return await play_client(server.port, {'type': 'join', 'players': 2, 'bots': ['unknown']})
+        finally:
+            await server.close()
+
+    messages = asyncio.run(run())
+    assert messages[-1]['type'] == 'error'
+    assert 'unknown' in messages[-1]['message']
@@ -0,0 +1,104 @@
+"""Test expectimax solver."""
+import pytest
+
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move import SKIP, Move
+from games_best_approach.games.qwixx.model.move_generator import ROLLS
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.expectimax import Expectimax, ValueTable, score
+
+
+@pytest.fixture
+def state() -> BoardState:
+    state = BoardState()
+    for number in (2, 3, 4, 5, 6):
+        state = state.select(Color.R, number)
+    for number in (12, 11, 10, 9, 8, 7, 6):
+        state = state.select(Color.G, number)
+    return state.select(Color.Y, 7).select(Color.B, 4).skip()
+
+
+def brute_force(solver: Expectimax, state: int, phase: int) -> float:
+    """Expected value of one turn by enumerating every roll."""
+    total = 0.0
+    for roll in range(ROLLS):
+        total += max(score(s) for _, s in solver.successors(state, roll, not phase))
+    return total / ROLLS
+
+
+@pytest.mark.parametrize('phase', [0, 1])
+def test_expectimax_matches_brute_force(state, phase: int):
+    """Test value of one turn equals enumerating all rolls."""
+    solver = Expectimax(players=2, horizon=1)
+    assert solver.value(state, 1, phase) == pytest.approx(brute_force(solver, state, phase))
+
+
+def test_expectimax_terminal():
+    """Test terminal states are scored."""
+    state = BoardState().skip().skip().skip().skip()
+    assert Expectimax().value(state) == -20
+
+
+def test_expectimax_values_increase_with_horizon(state):
+    """Test more turns can only increase the expected score."""
+    values = [Expectimax(horizon=h).value(state) for h in range(3)]
+    assert values[0] == state.score
+    assert values[0] <= values[1] <= values[2]
+
+
+def test_expectimax_best_move():
+    """Test best move prefers crossing without gaps."""
+    solver = Expectimax(horizon=1)
+    state = BoardState()
+    roll = 0  # all dice one
+    assert solver.best_move(state, roll, phase=0) != SKIP
+    assert solver.best_move(state, roll, phase=1) == Move((Color.R, 2))
+
+
+def test_value_table_round_trip(tmp_path, state):
+    """Test value table save and load."""
+    solver = Expectimax(players=3, horizon=2)
+    value = solver.value(state)
+    path = tmp_path / 'values.bin'
+    solver.table.save(path)
+
+    table = ValueTable.load(path)
+    assert table == solver.table
+    assert (table.players, table.horizon) == (3, 2)
+    assert Expectimax(3, 2, table).value(state) == value
+
+    with pytest.raises(ValueError, match='table is built for 3 players and horizon 2'):
+        Expectimax(2, 2, table)
+
+
+def test_value_table_is_mapped(tmp_path, state):
+    """Test a loaded table looks up the file and keeps values solved later besides it."""
+    solver = Expectimax(horizon=1)
+    solver.value(state)
+    path = tmp_path / 'values.bin'
+    solver.table.save(path)
+
+    table = ValueTable.load(path)
+    assert table._solved == {}
+    key, value = next(iter(solver.table.items()))
+    assert key in table and table[key] == value
+    assert table.get(-1) is None
+
+    solver = Expectimax(table=table, horizon=1)
+    solver.value(state, phase=1)
+    size = len(table)
+    assert size > len(ValueTable.load(path))
+    table.save(path)
+    table.close()
+    reloaded = ValueTable.load(path)
+    assert len(reloaded) == size
+    assert list(reloaded._keys) == sorted(reloaded._keys)
+    reloaded.close()
+
+
+def test_value_table_invalid(tmp_path):
+    """Test loading other files fails."""
+    path = tmp_path / 'values.bin'
+    path.write_bytes(b'\0' * 32)
+    with pytest.raises(ValueError, match='is no value table'):
+        ValueTable.load(path)
@@ -0,0 +1,121 @@
+"""Test Monte Carlo tree search."""
+import random
+
+from games_best_approach.games.qwixx.model.dice import roll_dice, roll_index
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move_generator import legal_moves
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.mcts import MCTS, greedy_policy, random_policy, roll_class
+
+
+def closed(*colors: Color) -> BoardState:
+    """Board with closed lanes."""
+    state = BoardState()
+    for color in colors:
+        for i in range(6):
+            state = state.select(color, 7 + i if color.asc else 7 - i)
+    return state
+
+
+def depth(node) -> int:
+    """Decision levels of a tree."""
+    return 1 + max(
+        (depth(child) for chance in node.children for child in chance.children.values()),
+        default=0,
+    )
+
+
+def test_roll_class():
+    """Test rolls with swapped white dice allow the same moves."""
+    roll = roll_index(2, 5, 1, 3, 6, 4)
+    swapped = roll_index(5, 2, 1, 3, 6, 4)
+    state = BoardState().select(Color.G, 11)
+    assert roll_class(roll) == roll_class(swapped)
+    assert roll_class(roll) != roll_class(roll_index(2, 5, 1, 3, 6, 5))
+    assert legal_moves(state, roll, True) == legal_moves(state, swapped, True)
+
+
+def test_policies_play_legal_moves():
+    """Test rollout policies return boards reachable by a legal move."""
+    rand = random.Random(0)
+    state = BoardState().select(Color.G, 11)
+    for roll in range(0, 46656, 7777):
+        for active in (False, True):
+            reachable = {
+                BoardState(state).apply(move, active)
+                for move in legal_moves(state, roll, active)
+            }
+            assert greedy_policy(state, roll, active, rand) in reachable
+            assert random_policy(state, roll, active, rand) in reachable
+
+
+def test_search_best_move_legal_with_stats():
+    """Test search returns legal moves and reports its rate."""
+    search = MCTS(iterations=50, seed=0)
+    states = [BoardState().select(Color.G, 11), BoardState(), closed(Color.B)]
+    for roll in range(0, 46656, 9999):
+        for player in range(3):
+            move = search.best_move(states, player, 1, roll)
+            assert move in legal_moves(states[player], roll, player == 1)
+            assert search.stats.iterations == 50
+            assert search.stats.nodes > 0
+            assert search.stats.nodes_per_second > 0
+
+
+def test_search_budget():
+    """Test iterations take precedence over the time budget, which is checked per iteration."""
+    search = MCTS(iterations=20, time_budget=0.0, seed=0)
+    search.best_move([BoardState(), BoardState()], 0, 0, 0)
+    assert search.stats.iterations == 20
+
+    search = MCTS(time_budget=0.0, seed=0)
+    search.best_move([BoardState(), BoardState()], 0, 0, 0)
+    assert search.stats.iterations == 1
+
+
+def test_search_grows_deeper_than_root():
+    """Test chance nodes revisit sampled roll classes, so the tree grows below the root moves."""
+    search = MCTS(iterations=2000, seed=0)
+    root = search.search([BoardState(), BoardState()], 0, 0, 46655)
+    assert depth(root) > 2
+
+
+def test_search_reuses_subtree():
+    """Test the subtree of the chosen move and actual roll is reused."""
+    search = MCTS(iterations=2000, seed=0)
+    states = [BoardState(), BoardState()]
+    roll = 46655  # all dice six
+    search.best_move(states, 0, 0, roll)
+    chosen = search._chosen
+    child = max(chosen.children.values(), key=lambda node: node.visits)
+    w1, w2, *colors = roll_dice(child.roll)
+    visits = child.visits
+    assert visits > 1
+    root = search.search(child.states, 0, child.active, roll_index(w2, w1, *colors))
+    assert root is child
+    assert root.visits == visits + 2000
+
+
+def test_search_ends_game_when_ahead():
+    """Test search closes the last lane when ahead."""
+    search = MCTS(iterations=200, seed=0)
+    own = closed(Color.R)
+    for number in (7, 8, 9, 10, 11):
+        own = own.select(Color.Y, number)
+    opponent = closed(Color.R)
+    roll = 46655  # all dice six
+    move = search.best_move([own, opponent], 0, 1, roll)
+    assert move.white == (Color.Y, 12)
+
+
+def test_root_parallel_search():
+    """Test root parallel search merges trees of all workers."""
+    with MCTS(iterations=30, workers=2, seed=0) as search:
+        states = [BoardState(), BoardState()]
+        move = search.best_move(states, 0, 0, 0)
+        assert move in legal_moves(states[0], 0, True)
+        assert search.stats.iterations == 60
+        executor = search._executor
+        search.best_move(states, 0, 0, 1)
+        assert search._executor is executor
+    assert search._executor is None
@@ -0,0 +1,82 @@
+"""Test multiplayer search."""
+from games_best_approach.games.qwixx.model.lane import Color
+from games_best_approach.games.qwixx.model.move_generator import legal_moves
+from games_best_approach.games.qwixx.model.state import BoardState
+from games_best_approach.games.qwixx.solver.multiplayer import (
+    MultiplayerSearch,
+    TranspositionTable,
+    board_value,
+    is_over,
+)
+
+
+def closed(*colors: Color) -> BoardState:
+    """Board with closed lanes."""
+    state = BoardState()
+    for color in colors:
+        for i in range(6):
+            state = state.select(color, 7 + i if color.asc else 7 - i)
+    return state
+
+
+def test_board_value_penalizes_gaps():
+    """Test gaps lower the value of a board."""
+    assert board_value(BoardState()) == 0
+    assert board_value(BoardState().select(Color.R, 2)) == 1
+    assert board_value(BoardState().select(Color.R, 4)) == 1 - 2 * 1.5
+    assert board_value(BoardState().skip()) == -5
+
+
+def test_is_over():
+    """Test game end over all boards."""
+    assert not is_over([BoardState(), closed(Color.R)])
+    assert is_over([closed(Color.Y), closed(Color.R)])
+    assert not is_over([closed(Color.R), closed(Color.R)])
+    assert is_over([BoardState(), BoardState().skip().skip().skip().skip()])
+
+
+def test_transposition_table_bounded():
+    """Test least recently used keys are evicted."""
+    table = TranspositionTable(size=2)
+    table.store((1,), 1.0)
+    table.store((2,), 2.0)
+    assert table.lookup((1,)) == 1.0
+    table.store((3,), 3.0)
+    assert list(table) == [(1,), (3,)]
+    assert table.lookup((2,)) is None
+
+
+def test_search_best_move_legal():
+    """Test search returns legal moves within the node budget."""
+    search = MultiplayerSearch(seed=0, budget=60.0, max_nodes=50)
+    states = [BoardState().select(Color.G, 11), BoardState(), closed(Color.B)]
+    for roll in range(0, 46656, 4999):
+        for player in range(3):
+            move = search.best_move(states, player, 1, roll)
+            assert search.nodes <= 50
+            assert move in legal_moves(states[player], roll, player == 1)
+    assert len(search.table) > 0
+
+
+def test_search_independent_of_earlier_decisions():
+    """Test values of earlier decisions and their rolls are not reused."""
+    states = [BoardState().select(Color.G, 11), BoardState()]
+    search = MultiplayerSearch(seed=0, budget=60.0, max_nodes=50)
+    search.best_move(states, 0, 0, 1234)
+    fresh = MultiplayerSearch(budget=60.0, max_nodes=50)
+    fresh._random.setstate(search._random.getstate())
+
+    assert search.best_move(states, 1, 0, 4321) == fresh.best_move(states, 1, 0, 4321)
+    assert search.table == fresh.table
+
+
+def test_search_ends_game_when_ahead():
+    """Test search closes the last lane when ahead."""
+    search = MultiplayerSearch(seed=0)
+    own = closed(Color.R)
+    for number in (7, 8, 9, 10, 11):
+        own = own.select(Color.Y, number)
+    opponent = closed(Color.R)
+    roll = 46655  # all dice six
+    move = search.best_move([own, opponent], 0, 1, roll)
+    assert move.white == (Color.Y, 12)
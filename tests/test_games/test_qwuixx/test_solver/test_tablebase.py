@@ -0,0 +1,108 @@
+"""Test endgame tablebase."""
+import pytest
+
+from games_best_approach.games.qwixx.model.lane import CLOSE_BIT
+from games_best_approach.games.qwixx.model.move_generator import successors
+from games_best_approach.games.qwixx.model.state import SKIPS_SHIFT, BoardState
+from games_best_approach.games.qwixx.model.symmetry import compact_lane
+from games_best_approach.games.qwixx.solver.expectimax import Expectimax
+from games_best_approach.games.qwixx.solver.tablebase import (
+    EndgameSolver,
+    Tablebase,
+    generate,
+    lane_index,
+    lane_keys,
+)
+
+DEAD = 0b10000000011
+"""Lane with the last number crossed but too few crosses to close."""
+
+ONE_LEFT = 0b01000010101
+"""Lane with four crosses and only the last number left."""
+
+CLOSED = 0b11111100000 | CLOSE_BIT
+
+
+def state(r: int, y: int, g: int, b: int, skips: int = 0) -> int:
+    """Packed state of lane masks."""
+    return r | y << 12 | g << 24 | b << 36 | skips << SKIPS_SHIFT
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    """Tablebase of boards without numbers left."""
+    path = tmp_path_factory.mktemp('tablebase') / 'endgame.qwt'
+    generate(path, positions=0)
+    with Tablebase(path) as tablebase:
+        yield tablebase
+
+
+def test_lane_keys():
+    """Test lane keys are canonical and indexed once."""
+    keys = lane_keys(1)
+    assert len(set(keys)) == len(keys)
+    assert all(compact_lane(key) == key for key in keys)
+    index = lane_index(1)
+    assert index[ONE_LEFT] >= 0 and index[DEAD] >= 0 and index[CLOSED] >= 0
+    assert index[0] == -1
+    assert lane_index(11)[0] >= 0
+
+
+@pytest.mark.parametrize('players', [2, 3])
+def test_endgame_solver_matches_expectimax(players: int):
+    """Test values to the end of the game equal expectimax with a long enough horizon."""
+    board = state(ONE_LEFT, DEAD, DEAD, ONE_LEFT, 2)
+    horizon = players * 5
+    expectimax = Expectimax(players, horizon)
+    solver = EndgameSolver(players)
+    for phase in range(players):
+        assert solver.value(board, phase=phase) == pytest.approx(expectimax.value(board, horizon, phase))
+
+
+def test_tablebase_values(tablebase):
+    """Test probed values equal solved values."""
+    solver = EndgameSolver()
+    boards = (
+        state(DEAD, DEAD, CLOSED, DEAD, 1), state(CLOSED, CLOSED, DEAD, DEAD), state(DEAD, DEAD, DEAD, DEAD, 3)
+    )
+    for board in boards:
+        assert board in tablebase
+        for phase in range(2):
+            assert tablebase.value(board, phase) == pytest.approx(solver.value(board, phase=phase))
+    assert tablebase.value(state(CLOSED, CLOSED, DEAD, DEAD)) == BoardState(state(CLOSED, CLOSED, DEAD, DEAD)).score
+    assert tablebase.value(state(DEAD, DEAD, DEAD, DEAD, 3), 0) == pytest.approx(
+        BoardState(state(DEAD, DEAD, DEAD, DEAD, 4)).score
+    )
+
+
+def test_tablebase_outside_endgame(tablebase):
+    """Test boards with numbers left are not covered."""
+    board = state(ONE_LEFT, DEAD, DEAD, DEAD)
+    assert board not in tablebase
+    assert tablebase.value(board) is None
+    assert tablebase.best_move(board, 0) is None
+
+
+def test_tablebase_best_move(tablebase):
+    """Test the only move of a finished board is a skip."""
+    board = state(DEAD, CLOSED, DEAD, DEAD, 1)
+    move = tablebase.best_move(board, 0, 0)
+    assert move.is_skip
+    assert [m for m, _ in successors(board, 0, True)] == [move]
+
+
+def test_tablebase_invalid_file(tmp_path):
+    """Test other files are rejected."""
+    path = tmp_path / 'invalid.qwt'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        Tablebase(path)
+
+
+def test_symmetric_boards_share_value():
+    """Test boards mirrored by direction are solved once."""
+    solver = EndgameSolver()
+    value = solver.value(state(ONE_LEFT, DEAD, DEAD, CLOSED, 1))
+    solved = len(solver.table)
+    assert solver.value(state(DEAD, CLOSED, ONE_LEFT, DEAD, 1)) == value
+    assert len(solver.table) == solved
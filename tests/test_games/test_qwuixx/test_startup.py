@@ -0,0 +1,29 @@
+"""Test modules loaded at startup."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+LAZY = ('games_best_approach.games.qwixx.solver', 'games_best_approach.games.qwixx.agents.', 'numpy')
+"""Prefixes of modules only imported on first use."""
+
+
+@pytest.mark.parametrize('module', ['game', 'tournament', 'server'])
+def test_import_is_lazy(module: str):
+    """Test importing a runner loads the core model only."""
+    code = (
+        'import sys\n'
+        f'import games_best_approach.games.qwixx.{module}\n'
+        'print("\\n".join(sys.modules))\n'
+    )
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    loaded = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True, env=env
+    ).stdout.split()
+    assert 'games_best_approach.games.qwixx.model.move_generator' in loaded
+    eager = [
+        name for name in loaded
+        if name.startswith(LAZY) and name != 'games_best_approach.games.qwixx.agents.player'
+    ]
+    assert eager == []
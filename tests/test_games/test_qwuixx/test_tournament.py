@@ -0,0 +1,116 @@
+"""Test tournament runner."""
+import statistics
+
+import pytest
+
+from games_best_approach.games.qwixx.records import RecordReader
+from games_best_approach.games.qwixx.tournament import (
+    AGENTS,
+    Stats,
+    TournamentResult,
+    _agent,
+    iter_tournament,
+    main,
+    play_shard,
+    run_tournament,
+)
+
+
+def test_stats_merge():
+    """Test merged stats equal stats of all values."""
+    values = [3, 7, -5, 12, 0, 8, 8]
+    left, right = Stats(), Stats()
+    for value in values[:3]:
+        left.add(value)
+    for value in values[3:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == len(values)
+    assert left.mean == pytest.approx(statistics.mean(values))
+    assert left.variance == pytest.approx(statistics.variance(values))
+    low, high = left.confidence
+    assert low < left.mean < high
+
+
+def test_result_ties_share_win():
+    """Test ties split the win."""
+    result = TournamentResult(['random', 'random', 'random'])
+    result.add_game([10, 10, 3])
+    assert result.wins == [0.5, 0.5, 0.0]
+
+
+@pytest.mark.parametrize('lineup', [['random'], ['random'] * 5])
+def test_tournament_player_count(lineup: list[str]):
+    """Test lineup size is validated."""
+    with pytest.raises(ValueError, match='lineup must have between 2 and 4 agents'):
+        run_tournament(lineup, 1)
+
+
+def test_optimal_agent_is_shared():
+    """Test tournament games of a process reuse one expectimax agent, factories do not."""
+    assert _agent('optimal', 1) is _agent('optimal', 2)
+    assert _agent('heuristic', 1) is not _agent('heuristic', 1)
+    assert AGENTS['optimal'](1) is not AGENTS['optimal'](1)
+
+
+def test_tournament_unknown_agent():
+    """Test unknown agents are rejected."""
+    with pytest.raises(ValueError, match=r"unknown agents: \['foo'\]"):
+        run_tournament(['random', 'foo'], 1)
+
+
+def test_tournament_deterministic():
+    """Test results do not depend on sharding or workers."""
+    single = run_tournament(['random', 'random', 'random'], 12, seed=3, workers=1, shard_size=12)
+    sharded = run_tournament(['random', 'random', 'random'], 12, seed=3, workers=2, shard_size=5)
+
+    assert single.games == sharded.games == 12
+    assert single.wins == pytest.approx(sharded.wins)
+    assert [s.mean for s in single.scores] == pytest.approx([s.mean for s in sharded.scores])
+    assert sum(single.wins) == pytest.approx(12)
+
+
+def test_tournament_streams_results():
+    """Test results are yielded per shard."""
+    games = [r.games for r in iter_tournament(['random', 'random'], 10, workers=1, shard_size=4)]
+    assert games == [4, 8, 10]
+
+
+def test_play_shard_rotates_start():
+    """Test equal agents win about equally often."""
+    result = play_shard(['random', 'random'], 1, 0, 40)
+    assert result.games == 40
+    assert 0.2 < result.win_rate(0) < 0.8
+
+
+def test_tournament_main(capsys):
+    """Test command line."""
+    main(['random', 'random', '-n', '4', '-w', '1'])
+    out = capsys.readouterr().out
+    assert out.startswith('4 games\n1. random: win rate')
+
+
+def test_tournament_records_shards(tmp_path):
+    """Test games are recorded to one file per shard."""
+    result = run_tournament(['random', 'random'], 5, workers=1, shard_size=2, record=tmp_path)
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) == 3
+    scores = []
+    for path in files:
+        with RecordReader(path) as reader:
+            scores += [record.scores for record in reader]
+    assert len(scores) == result.games == 5
+
+
+@pytest.mark.parametrize('common_rolls', [True, False])
+def test_tournament_common_rolls(tmp_path, common_rolls: bool):
+    """Test lineups with the same seed replay the same rolls unless rolls are independent."""
+    rolls = []
+    for lineup in (['random', 'random'], ['heuristic', 'random']):
+        record = tmp_path / '-'.join(lineup)
+        run_tournament(lineup, 4, seed=2, workers=1, record=record, common_rolls=common_rolls)
+        with RecordReader(next(record.iterdir())) as reader:
+            rolls.append([record.turns[0].roll for record in reader])
+    assert (rolls[0] == rolls[1]) == common_rolls
@@ -0,0 +1,59 @@
+"""Test tuning of heuristic weights."""
+import random
+
+import pytest
+
+from games_best_approach.games.qwixx.agents.heuristic import Weights
+from games_best_approach.games.qwixx.training import (
+    TrainingState,
+    evaluate,
+    main,
+    next_generation,
+    play_match,
+    train,
+)
+
+
+def test_common_random_numbers_cancel():
+    """Test equal weights have no margin on shared seeds in both seats."""
+    assert play_match(Weights(), Weights(), [1, 2, 3]) == 0
+
+
+def test_evaluate_prefers_sensible_weights():
+    """Test weights crossing everything lose against the default."""
+    careless = Weights(gap=0.0, skip=50.0)
+    fitness = evaluate([Weights(), careless], Weights(), list(range(6)))
+    assert fitness[0] == 0
+    assert fitness[1] < 0
+
+
+def test_next_generation_keeps_elite():
+    """Test the best candidates survive unchanged."""
+    population = [Weights(gap=float(i)) for i in range(6)]
+    fitness = [0, 5, 1, 4, 2, 3]
+    offspring = next_generation(population, fitness, random.Random(0), elite=2)
+    assert len(offspring) == 6
+    assert offspring[:2] == [Weights(gap=1.0), Weights(gap=3.0)]
+
+
+def test_train_resumes_from_checkpoint(tmp_path):
+    """Test a resumed run equals an uninterrupted run."""
+    checkpoint = tmp_path / 'training.json'
+    train(1, population=4, games=2, seed=3, workers=1, checkpoint=checkpoint)
+    assert TrainingState.load(checkpoint).generation == 1
+    resumed = train(2, population=4, games=2, seed=3, workers=1, checkpoint=checkpoint)
+    uninterrupted = train(2, population=4, games=2, seed=3, workers=1)
+
+    assert resumed.generation == uninterrupted.generation == 2
+    assert resumed.population == uninterrupted.population
+    assert resumed.history == pytest.approx(uninterrupted.history)
+    assert resumed.best == uninterrupted.best
+
+    with pytest.raises(ValueError, match='checkpoint was created with seed 3'):
+        train(3, population=4, games=2, seed=4, workers=1, checkpoint=checkpoint)
+
+
+def test_train_parallel(capsys):
+    """Test training in a process pool from the command line."""
+    main(['-g', '1', '-p', '3', '-n', '1', '-w', '2'])
+    assert capsys.readouterr().out.startswith('generation 1: best margin')